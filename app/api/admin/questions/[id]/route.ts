@@ -2,6 +2,7 @@ import { NextResponse } from "next/server";
 import { auth } from "@/lib/auth";
 import { sql } from "@vercel/postgres";
 import { z } from "zod";
+import { invalidateTierBundles } from "@/lib/questions-db";
 
 const updateQuestionSchema = z.object({
   category: z.string().optional(),
@@ -243,6 +244,8 @@ export async function PATCH(
       }
     }
 
+    await invalidateTierBundles();
+
     // Fetch complete updated question with relations
     const updatedQuestion = await sql`
       SELECT 
@@ -330,6 +333,8 @@ export async function DELETE(
       );
     }
 
+    await invalidateTierBundles();
+
     return NextResponse.json({
       message: "Question deactivated successfully",
     });
@@ -2,6 +2,7 @@ import { NextResponse } from "next/server";
 import { auth } from "@/lib/auth";
 import { sql } from "@vercel/postgres";
 import { z } from "zod";
+import { invalidateTierBundles } from "@/lib/questions-db";
 
 const createQuestionSchema = z.object({
   category: z.string().min(1, "Category is required"),
@@ -293,6 +294,8 @@ export async function POST(request: Request) {
       console.log('⚠️  No score examples provided');
     }
 
+    await invalidateTierBundles();
+
     console.log('🎉 Question created successfully!');
     console.log('🔵 POST /api/admin/questions - END\n');
 
@@ -5,6 +5,8 @@ import { sql } from '@vercel/postgres';
 import { generateCompletePDF } from '@/lib/pdf-client/generator';
 import { transformAuditToReportData, formatReportDate, sanitizeAddressForFilename } from '@/lib/pdf/formatters';
 import { calculateAuditScores } from '@/lib/scoring';
+import { getPrecomputedScores } from '@/lib/report-payloads';
+import { getAuditResponses } from '@/lib/audit-responses';
 
 /**
  * GET /api/audits/[token]/report
@@ -48,14 +50,7 @@ export async function GET(
     }
 
     // 3. Fetch form responses
-    const responsesResult = await sql`
-      SELECT id, audit_id, question_id, answer_value, comment, created_at
-      FROM form_responses
-      WHERE audit_id = ${audit.id}
-      ORDER BY question_id
-    `;
-
-    const responses = responsesResult.rows as any[];
+    const responses = await getAuditResponses(audit.id);
 
     if (responses.length === 0) {
       console.log(`[PDF-Public] No responses found for audit ${audit.id}`);
@@ -81,7 +76,7 @@ export async function GET(
     }
 
     // 5. Calculate scores
-    const scores = calculateAuditScores(responses, questions);
+    const scores = (await getPrecomputedScores(audit.id)) ?? calculateAuditScores(responses, questions);
     console.log(`[PDF-Public] Scores: Overall ${scores.overallScore.score}, Risk: ${scores.overallScore.riskLevel}`);
 
     // 6. Transform to report format
@@ -3,6 +3,7 @@ import { auth } from "@/lib/auth";
 import { sql } from "@vercel/postgres";
 import { calculateAuditScores } from "@/lib/scoring";
 import { getQuestionsByTier } from "@/lib/questions";
+import { getAuditNotes, getAuditResponses } from "@/lib/audit-responses";
 
 // Get audit details with responses and scores
 export async function GET(
@@ -37,14 +38,7 @@ export async function GET(
     const audit = auditResult.rows[0];
 
     // Get form responses (including comments)
-    const responsesResult = await sql`
-      SELECT id, audit_id, question_id, answer_value, comment, created_at
-      FROM form_responses
-      WHERE audit_id = ${auditId}
-      ORDER BY question_id
-    `;
-
-    const responses = responsesResult.rows as any[];
+    const responses = await getAuditResponses(auditId);
 
     // Fetch questions for this tier (direct import to avoid SSRF risk)
     let questionsForScoring: any[];
@@ -98,18 +92,14 @@ export async function GET(
     }
 
     // Get notes
-    const notesResult = await sql`
-      SELECT * FROM notes
-      WHERE audit_id = ${auditId}
-      ORDER BY created_at DESC
-    `;
+    const notes = await getAuditNotes(auditId);
 
     return NextResponse.json({
       audit,
       responses,
       questions: questionsForScoring, // Include questions for PDF generation
       scores,
-      notes: notesResult.rows,
+      notes,
     });
   } catch (error: any) {
     console.error("Get audit review error:", error);
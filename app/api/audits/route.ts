@@ -84,7 +84,12 @@ export async function POST(request: Request) {
   }
 }
 
-// Get all audits for logged-in auditor
+const DEFAULT_PAGE_SIZE = 20;
+const MAX_PAGE_SIZE = 100;
+
+// Get one page of audits for logged-in auditor, newest first.
+// ?limit=N (default 20, max 100) and ?before=<id of the last audit of the previous page>.
+// Dashboard counts come from /api/audits/stats (rollups) rather than from this list.
 export async function GET(request: Request) {
   try {
     const session = await auth();
@@ -93,10 +98,18 @@ export async function GET(request: Request) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
     }
 
+    const { searchParams } = new URL(request.url);
+    const limit = Math.min(
+      Math.max(parseInt(searchParams.get("limit") || "", 10) || DEFAULT_PAGE_SIZE, 1),
+      MAX_PAGE_SIZE
+    );
+    const before = parseInt(searchParams.get("before") || "", 10) || null;
+
     // Admin users see all audits (including self-service with NULL auditor_id)
     // Regular auditors see only their own
     const isAdmin = session.user.role === 'admin';
 
+    // Keyset on (created_at, id) so each page is an index range scan; one extra row tells if there is more
     const result = isAdmin
       ? await sql`
           SELECT 
@@ -104,7 +117,10 @@ export async function GET(request: Request) {
             property_address, risk_audit_tier, conducted_by,
             created_at, submitted_at
           FROM audits
-          ORDER BY created_at DESC
+          WHERE ${before}::int IS NULL
+             OR (created_at, id) < (SELECT created_at, id FROM audits WHERE id = ${before}::int)
+          ORDER BY created_at DESC, id DESC
+          LIMIT ${limit + 1}
         `
       : await sql`
           SELECT 
@@ -113,21 +129,17 @@ export async function GET(request: Request) {
             created_at, submitted_at
           FROM audits
           WHERE auditor_id = ${session.user.id}
-          ORDER BY created_at DESC
+            AND (${before}::int IS NULL
+                 OR (created_at, id) < (SELECT created_at, id FROM audits WHERE id = ${before}::int))
+          ORDER BY created_at DESC, id DESC
+          LIMIT ${limit + 1}
         `;
 
-    // Count pending submissions
-    const pendingCount = result.rows.filter(
-      (audit) => audit.status === "submitted"
-    ).length;
+    const audits = result.rows.slice(0, limit);
 
     return NextResponse.json({
-      audits: result.rows,
-      stats: {
-        total: result.rows.length,
-        pending: pendingCount,
-        completed: result.rows.filter((a) => a.status === "completed").length,
-      },
+      audits,
+      nextCursor: result.rows.length > limit ? audits[audits.length - 1].id : null,
     });
   } catch (error) {
     console.error("Get audits error:", error);
@@ -137,4 +149,3 @@ export async function GET(request: Request) {
     );
   }
 }
-
@@ -0,0 +1,29 @@
+import { NextResponse } from "next/server";
+import { auth } from "@/lib/auth";
+import { getDashboardRollups, getLiveDashboardStats } from "@/lib/dashboard-rollups";
+
+// Get dashboard summary (counts by status and tier, per-category averages and risk levels)
+export async function GET(request: Request) {
+  try {
+    const session = await auth();
+
+    if (!session?.user?.id) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+    }
+
+    // Admin users see all audits (including self-service with NULL auditor_id)
+    // Regular auditors see only their own
+    const auditorId = session.user.role === 'admin' ? null : String(session.user.id);
+
+    // Rollups maintained by db/rollup-dashboard.py; count live until they exist
+    const stats = (await getDashboardRollups(auditorId)) ?? (await getLiveDashboardStats(auditorId));
+
+    return NextResponse.json({ stats });
+  } catch (error) {
+    console.error("Get audit stats error:", error);
+    return NextResponse.json(
+      { error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
@@ -5,6 +5,8 @@ import { sql } from '@vercel/postgres';
 import { generateCompletePDF } from '@/lib/pdf-client/generator';
 import { transformAuditToReportData, formatReportDate, sanitizeAddressForFilename } from '@/lib/pdf/formatters';
 import { calculateAuditScores } from '@/lib/scoring';
+import { getPrecomputedScores } from '@/lib/report-payloads';
+import { getAuditResponses } from '@/lib/audit-responses';
 
 /**
  * GET /api/reports/[auditId]
@@ -60,14 +62,7 @@ export async function GET(
     console.log(`[PDF] Cache disabled for debugging - generating fresh PDF...`);
 
     // 4. Fetch form responses (including comments)
-    const responsesResult = await sql`
-      SELECT id, audit_id, question_id, answer_value, comment, created_at
-      FROM form_responses
-      WHERE audit_id = ${auditId}
-      ORDER BY question_id
-    `;
-
-    const responses = responsesResult.rows as any[];
+    const responses = await getAuditResponses(auditId);
 
     if (responses.length === 0) {
       console.log(`[PDF] No responses found for audit ${auditId}`);
@@ -104,7 +99,7 @@ export async function GET(
     // 6. Calculate scores
     console.log(`[PDF] Step 6: Calculating scores with ${responses.length} responses and ${questions.length} questions...`);
     try {
-      const scores = calculateAuditScores(responses, questions);
+      const scores = (await getPrecomputedScores(audit.id)) ?? calculateAuditScores(responses, questions);
       console.log(`[PDF] ✓ Calculated scores: Overall ${scores.overallScore.score}, Risk Level: ${scores.overallScore.riskLevel}`);
 
       // 7. Transform data to report format (comments are now in form_responses)
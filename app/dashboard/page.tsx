@@ -7,28 +7,35 @@ import { Badge } from "@/components/ui/badge";
 import { NewAuditForm } from "@/components/new-audit-form";
 import { AuditList } from "@/components/audit-list";
 import { Audit } from "@/types/database";
+import type { DashboardStats } from "@/lib/dashboard-rollups";
 import { useSession } from "next-auth/react";
 
 interface AuditsData {
   audits: Audit[];
-  stats: {
-    total: number;
-    pending: number;
-    completed: number;
-  };
+  nextCursor: number | null;
 }
 
 export default function DashboardPage() {
   const { data: session } = useSession();
   const [auditsData, setAuditsData] = useState<AuditsData | null>(null);
+  const [stats, setStats] = useState<DashboardStats | null>(null);
   const [showNewAuditForm, setShowNewAuditForm] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
+  // Summary cards read the dashboard rollups; the list is fetched a page at a time
   const fetchAudits = async () => {
     try {
-      const response = await fetch("/api/audits");
-      if (response.ok) {
-        const data = await response.json();
+      const [statsResponse, auditsResponse] = await Promise.all([
+        fetch("/api/audits/stats"),
+        fetch("/api/audits"),
+      ]);
+      if (statsResponse.ok) {
+        const data = await statsResponse.json();
+        setStats(data.stats);
+      }
+      if (auditsResponse.ok) {
+        const data = await auditsResponse.json();
         setAuditsData(data);
       }
     } catch (error) {
@@ -38,6 +45,25 @@ export default function DashboardPage() {
     }
   };
 
+  const fetchMoreAudits = async () => {
+    if (!auditsData?.nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(`/api/audits?before=${auditsData.nextCursor}`);
+      if (response.ok) {
+        const data = await response.json();
+        setAuditsData({
+          audits: [...auditsData.audits, ...data.audits],
+          nextCursor: data.nextCursor,
+        });
+      }
+    } catch (error) {
+      console.error("Failed to fetch more audits:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchAudits();
   }, []);
@@ -85,7 +111,7 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="text-3xl font-bold">
-              {auditsData?.stats.total || 0}
+              {stats?.total || 0}
             </div>
           </CardContent>
         </Card>
@@ -99,9 +125,9 @@ export default function DashboardPage() {
           <CardContent>
             <div className="flex items-center gap-2">
               <div className="text-3xl font-bold">
-                {auditsData?.stats.pending || 0}
+                {stats?.submitted || 0}
               </div>
-              {auditsData && auditsData.stats.pending > 0 && (
+              {stats && stats.submitted > 0 && (
                 <Badge className="bg-blue-500">New</Badge>
               )}
             </div>
@@ -116,15 +142,30 @@ export default function DashboardPage() {
           </CardHeader>
           <CardContent>
             <div className="text-3xl font-bold">
-              {auditsData?.stats.completed || 0}
+              {stats?.completed || 0}
             </div>
           </CardContent>
         </Card>
       </div>
 
+      {stats && (
+        <p className="text-xs text-gray-500 -mt-4">
+          {stats.upToDateAt
+            ? `Totals as of ${new Date(stats.upToDateAt).toLocaleString("en-GB")}`
+            : "Totals counted live"}
+        </p>
+      )}
+
       <div>
         <h3 className="text-xl font-semibold mb-4">Recent Audits</h3>
-        {auditsData && <AuditList audits={auditsData.audits} />}
+        {auditsData && (
+          <AuditList
+            audits={auditsData.audits}
+            hasMore={auditsData.nextCursor !== null}
+            loadingMore={loadingMore}
+            onLoadMore={fetchMoreAudits}
+          />
+        )}
       </div>
     </div>
   );
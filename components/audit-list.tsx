@@ -9,9 +9,12 @@ import { Audit } from "@/types/database";
 
 interface AuditListProps {
   audits: Audit[];
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
-export function AuditList({ audits }: AuditListProps) {
+export function AuditList({ audits, hasMore = false, loadingMore = false, onLoadMore }: AuditListProps) {
   const [copiedId, setCopiedId] = useState<number | null>(null);
 
   const copyToClipboard = async (token: string, id: number) => {
@@ -114,6 +117,14 @@ export function AuditList({ audits }: AuditListProps) {
           </CardContent>
         </Card>
       ))}
+
+      {hasMore && onLoadMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={onLoadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
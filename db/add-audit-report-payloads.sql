@@ -0,0 +1,14 @@
+-- Migration: Add audit_report_payloads table
+-- Stores the precomputed report payload (scores, risk, actions and resolved score examples)
+-- per audit, written by db/report-worker.py. catalog_version is the question_tier_bundles
+-- version_hash the payload was computed from; readers only use a payload whose
+-- catalog_version still matches the current bundle for its tier.
+
+CREATE TABLE IF NOT EXISTS audit_report_payloads (
+  audit_id INTEGER PRIMARY KEY REFERENCES audits(id) ON DELETE CASCADE,
+  tier VARCHAR(10) NOT NULL,
+  catalog_version VARCHAR(64) NOT NULL,
+  payload_version INTEGER NOT NULL,
+  payload JSONB NOT NULL,
+  computed_at TIMESTAMP DEFAULT NOW()
+);
@@ -0,0 +1,56 @@
+-- Migration: Add dashboard rollup tables
+-- db/rollup-dashboard.py keeps per-auditor summaries up to date incrementally, so the
+-- dashboard reads a handful of rollup rows instead of counting every audit:
+--   dashboard_audit_rollups  audit counts per auditor, tier and status
+--   dashboard_score_rollups  score count, sum and risk-level distribution per auditor, tier,
+--                            status and scores_category (average = score_sum / score_count)
+-- auditor_id 0 stands for self-service audits without an auditor (audits.auditor_id NULL).
+-- dashboard_rollup_ledger records what each audit currently contributes, so a status,
+-- auditor or score change is applied as "subtract the old row, add the new one";
+-- dashboard_rollup_state holds the job's high-water mark on created_at/submitted_at.
+
+CREATE INDEX IF NOT EXISTS idx_audits_auditor_id ON audits(auditor_id);
+CREATE INDEX IF NOT EXISTS idx_audits_submitted_at ON audits(submitted_at);
+CREATE INDEX IF NOT EXISTS idx_scores_created_at ON scores(created_at);
+
+CREATE TABLE IF NOT EXISTS dashboard_audit_rollups (
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  audit_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (auditor_id, risk_audit_tier, status)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_score_rollups (
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  scores_category VARCHAR(100) NOT NULL,
+  score_count INTEGER NOT NULL DEFAULT 0,
+  score_sum DECIMAL(12, 2) NOT NULL DEFAULT 0,
+  low_risk_count INTEGER NOT NULL DEFAULT 0,
+  medium_risk_count INTEGER NOT NULL DEFAULT 0,
+  high_risk_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (auditor_id, risk_audit_tier, status, scores_category)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_ledger (
+  audit_id INTEGER PRIMARY KEY,
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  scores JSONB NOT NULL DEFAULT '{}',
+  counted_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Audits that can still change state; re-checked on every run
+CREATE INDEX IF NOT EXISTS idx_dashboard_rollup_ledger_open ON dashboard_rollup_ledger(audit_id)
+  WHERE status <> 'completed';
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_state (
+  name VARCHAR(50) PRIMARY KEY,
+  high_water_mark TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP DEFAULT NOW()
+);
@@ -0,0 +1,12 @@
+-- Migration: Add question_tier_bundles table
+-- Stores one fully assembled question list (with options and score examples) per tier,
+-- so the questionnaire fetch is a primary-key lookup instead of a JSONB scan with
+-- correlated subqueries. Rebuilt by db/seed-neon.py; cleared by the admin question API.
+
+CREATE TABLE IF NOT EXISTS question_tier_bundles (
+  tier VARCHAR(10) PRIMARY KEY CHECK (tier IN ('tier_0', 'tier_1', 'tier_2', 'tier_3', 'tier_4')),
+  questions JSONB NOT NULL,
+  question_count INTEGER NOT NULL,
+  version_hash VARCHAR(64) NOT NULL,
+  built_at TIMESTAMP DEFAULT NOW()
+);
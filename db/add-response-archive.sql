@@ -0,0 +1,46 @@
+-- Migration: Add monthly-partitioned archive tables for form_responses and notes
+-- db/archive-audits.py moves the responses and notes of old completed audits here in
+-- bounded batches, so the live tables only hold the working set (pending, submitted and
+-- recently completed audits). Archive partitions are created per month on created_at by
+-- the job; rows without a created_at land in the default partition.
+-- The live tables stay unpartitioned: ON CONFLICT (audit_id, question_id) needs a unique
+-- constraint that cannot exist on a table partitioned by created_at.
+
+CREATE TABLE IF NOT EXISTS form_responses_archive (
+  id INTEGER NOT NULL,
+  audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+  question_id VARCHAR(50) NOT NULL,
+  answer_value INTEGER NOT NULL CHECK (answer_value IN (1, 5, 10)),
+  comment TEXT,
+  created_at TIMESTAMP
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS form_responses_archive_default PARTITION OF form_responses_archive DEFAULT;
+
+CREATE TABLE IF NOT EXISTS notes_archive (
+  id INTEGER NOT NULL,
+  audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+  auditor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  question_id VARCHAR(50) NOT NULL,
+  content TEXT NOT NULL,
+  created_at TIMESTAMP
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS notes_archive_default PARTITION OF notes_archive DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_form_responses_archive_audit ON form_responses_archive(audit_id);
+CREATE INDEX IF NOT EXISTS idx_notes_archive_audit ON notes_archive(audit_id);
+-- Keyset paging on id over the *_all views (db/export-analytics.py)
+CREATE INDEX IF NOT EXISTS idx_form_responses_archive_id ON form_responses_archive(id);
+CREATE INDEX IF NOT EXISTS idx_notes_archive_id ON notes_archive(id);
+
+-- Read paths for reports: live rows plus archived ones
+CREATE OR REPLACE VIEW form_responses_all AS
+  SELECT id, audit_id, question_id, answer_value, comment, created_at FROM form_responses
+  UNION ALL
+  SELECT id, audit_id, question_id, answer_value, comment, created_at FROM form_responses_archive;
+
+CREATE OR REPLACE VIEW notes_all AS
+  SELECT id, audit_id, auditor_id, question_id, content, created_at FROM notes
+  UNION ALL
+  SELECT id, audit_id, auditor_id, question_id, content, created_at FROM notes_archive;
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Move form_responses and notes of old completed audits into monthly archive partitions.
+
+Requires db/add-response-archive.sql. Candidate audits are completed audits
+submitted (or, failing that, created) more than --older-than days ago that
+still have rows in the live tables. They are processed in audit id order, a
+bounded batch at a time: the archive partitions for the months the batch
+touches are created first, then the batch's responses and notes are moved
+with DELETE ... RETURNING into INSERT, both in one transaction. Every batch
+commits on its own, so an interrupted run simply resumes on the next start.
+
+Reports keep working on archived audits through the form_responses_all and
+notes_all views.
+"""
+import argparse
+import json
+import time
+
+from neon_client import CONN_STR, run_sql, run_sql_batch
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+ARCHIVES = {
+    "form_responses": ["id", "audit_id", "question_id", "answer_value", "comment", "created_at"],
+    "notes": ["id", "audit_id", "auditor_id", "question_id", "content", "created_at"],
+}
+
+CANDIDATES_SQL = """
+    SELECT a.id
+    FROM audits a
+    WHERE a.id > $1
+      AND a.status = 'completed'
+      AND COALESCE(a.submitted_at, a.created_at) < NOW() - make_interval(days => $2)
+      AND (EXISTS (SELECT 1 FROM form_responses fr WHERE fr.audit_id = a.id)
+           OR EXISTS (SELECT 1 FROM notes n WHERE n.audit_id = a.id))
+    ORDER BY a.id
+    LIMIT $3
+"""
+
+MONTHS_SQL = """
+    SELECT DISTINCT to_char(date_trunc('month', created_at), 'YYYY-MM-DD') AS month
+    FROM (
+      SELECT created_at FROM form_responses
+      WHERE audit_id IN (SELECT jsonb_array_elements_text($1::jsonb)::int)
+      UNION ALL
+      SELECT created_at FROM notes
+      WHERE audit_id IN (SELECT jsonb_array_elements_text($1::jsonb)::int)
+    ) t
+    WHERE created_at IS NOT NULL
+    ORDER BY 1
+"""
+
+EXISTING_PARTITIONS_SQL = """
+    SELECT c.relname AS name
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_class p ON p.oid = i.inhparent
+    WHERE p.relname IN ('form_responses_archive', 'notes_archive')
+"""
+
+
+def partition_name(table, month):
+    return f"{table}_archive_{month[:4]}_{month[5:7]}"
+
+
+def month_after(month):
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}-01"
+
+
+def ensure_partitions(months, existing):
+    """Create the archive partitions for `months` (YYYY-MM-01) that do not exist yet."""
+    statements = []
+    for month in months:
+        for table in ARCHIVES:
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            statements.append((
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table}_archive "
+                f"FOR VALUES FROM ('{month}') TO ('{month_after(month)}')",
+                None,
+            ))
+            existing.add(name)
+    if statements:
+        run_sql_batch(statements)
+    return len(statements)
+
+
+def move_statement(table):
+    columns = ", ".join(ARCHIVES[table])
+    return f"""
+        WITH moved AS (
+          DELETE FROM {table}
+          WHERE audit_id IN (SELECT jsonb_array_elements_text($1::jsonb)::int)
+          RETURNING {columns}
+        )
+        INSERT INTO {table}_archive ({columns})
+        SELECT {columns} FROM moved
+    """
+
+
+def archive_batch(audit_ids):
+    """Move one batch of audits' rows; returns {table: rows moved}."""
+    payload = json.dumps(audit_ids)
+    # Safe to repeat: a second run finds nothing left to move
+    results = run_sql_batch([(move_statement(table), [payload]) for table in ARCHIVES], idempotent=True)
+    return {table: int(res.get("rowCount") or 0) for table, res in zip(ARCHIVES, results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive responses and notes of old completed audits.")
+    parser.add_argument("--older-than", type=int, default=365,
+                        help="archive completed audits submitted more than this many days ago (default: 365)")
+    parser.add_argument("--batch-size", type=int, default=200, help="audits moved per transaction (default: 200)")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches (default: until done)")
+    parser.add_argument("--dry-run", action="store_true", help="list what would be archived without moving rows")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    try:
+        existing = {r["name"] for r in run_sql(EXISTING_PARTITIONS_SQL)["rows"]}
+    except Exception as e:
+        print(f"ERROR: could not read archive partitions ({e}). Apply db/add-response-archive.sql first.")
+        exit(1)
+    if "form_responses_archive_default" not in existing or "notes_archive_default" not in existing:
+        print("ERROR: archive tables not found. Apply db/add-response-archive.sql first.")
+        exit(1)
+
+    print(f"=== Archiving completed audits older than {args.older_than} days "
+          f"(batches of {args.batch_size}) ===")
+    started = time.time()
+    after_id = 0
+    batches = 0
+    audits = 0
+    moved = {table: 0 for table in ARCHIVES}
+    created = 0
+    while args.max_batches is None or batches < args.max_batches:
+        audit_ids = [int(r["id"]) for r in run_sql(CANDIDATES_SQL, [after_id, args.older_than, args.batch_size])["rows"]]
+        if not audit_ids:
+            break
+        after_id = audit_ids[-1]
+        batches += 1
+        audits += len(audit_ids)
+        months = [r["month"] for r in run_sql(MONTHS_SQL, [json.dumps(audit_ids)])["rows"]]
+        if args.dry_run:
+            print(f"  Batch {batches}: would archive {len(audit_ids)} audits "
+                  f"(ids {audit_ids[0]}-{audit_ids[-1]}, {len(months)} months)")
+            continue
+
+        created += ensure_partitions(months, existing)
+        counts = archive_batch(audit_ids)
+        for table, n in counts.items():
+            moved[table] += n
+        print(f"  OK batch {batches}: {len(audit_ids)} audits through id {after_id}, "
+              f"{counts['form_responses']} responses, {counts['notes']} notes")
+
+    elapsed = time.time() - started
+    print(f"\n=== Results: {audits} audits, {moved['form_responses']} responses and {moved['notes']} notes "
+          f"archived, {created} partitions created in {elapsed:.1f}s ===")
+    if args.dry_run:
+        print("Dry run: no changes written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark seed-neon.py and verify-questions.py against a local Neon stand-in.
+
+Starts neon_standin.py in-process on top of a local Postgres, runs each
+seeding mode and the verification with synthetic catalogs of the requested
+sizes, and reports round-trips, per-request and per-statement latency
+percentiles and total wall time. The database is reset before every mode, so
+each one seeds the full catalog into empty tables; incremental is also run a
+second time against its own result and reported as "incremental no-op".
+
+    python db/benchmark.py --dsn postgresql://postgres@localhost/bench --latency-ms 80
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_MODES = ["per-question", "batched", "incremental"]
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(DB_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_catalog(questions, size):
+    """Repeat the real catalog under fresh question numbers until it has `size` entries."""
+    catalog = []
+    for i in range(size):
+        q = dict(questions[i % len(questions)])
+        q["id"] = f"{i // 10 + 1}.{i % 10 + 1}"
+        catalog.append(q)
+    return catalog
+
+
+def reset_schema(backend):
+    backend.simple("""
+        DROP TABLE IF EXISTS dashboard_audit_rollups, dashboard_score_rollups, dashboard_rollup_ledger, dashboard_rollup_state,
+            form_responses_archive, notes_archive, audit_report_payloads, question_tier_bundles, question_score_examples, question_answer_options, question_templates,
+            notes, scores, form_responses, audits, users CASCADE
+    """)
+    for filename in ("schema.sql", "schema-questions.sql"):
+        with open(os.path.join(DB_DIR, filename), encoding="utf-8") as f:
+            backend.simple(f.read())
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(server, label, fn):
+    server.reset_stats()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    wall = time.perf_counter() - started
+    stats = server.reset_stats()
+    requests = [request_time for request_time, _ in stats]
+    statements = [t for _, times in stats for t in times]
+    return {
+        "label": label,
+        "requests": len(requests),
+        "statements": len(statements),
+        "req_p50": percentile(requests, 50) * 1000,
+        "req_p99": percentile(requests, 99) * 1000,
+        "stmt_p50": percentile(statements, 50) * 1000,
+        "stmt_p99": percentile(statements, 99) * 1000,
+        "wall": wall,
+    }
+
+
+def print_report(results):
+    print(f"{'run':32s} {'reqs':>6s} {'stmts':>7s} {'req p50':>9s} {'req p99':>9s} "
+          f"{'stmt p50':>9s} {'stmt p99':>9s} {'wall s':>8s}")
+    for r in results:
+        print(f"{r['label']:32s} {r['requests']:6d} {r['statements']:7d} {r['req_p50']:8.1f}ms {r['req_p99']:8.1f}ms "
+              f"{r['stmt_p50']:8.2f}ms {r['stmt_p99']:8.2f}ms {r['wall']:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DB tooling against a local Neon stand-in.")
+    parser.add_argument("--dsn", required=True,
+                        help="libpq connection string of a scratch local Postgres (its tables are dropped)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[26, 500, 5000], help="catalog sizes to run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency injected per request")
+    parser.add_argument("--modes", nargs="+", choices=SEED_MODES, default=SEED_MODES)
+    parser.add_argument("--concurrency", type=int, default=1, help="--concurrency passed to the seeder")
+    args = parser.parse_args()
+
+    import neon_standin
+    if neon_standin.pq is None:
+        print("ERROR: benchmark.py requires psycopg (pip install psycopg[binary]).")
+        exit(1)
+
+    server = neon_standin.start_server(args.dsn, latency=args.latency_ms / 1000)
+    os.environ["NEON_URL"] = server.url
+    os.environ.setdefault("POSTGRES_URL", args.dsn)
+    # neon_standin has already imported neon_client, which read the environment
+    import neon_client
+    neon_client.NEON_URL = server.url
+    neon_client.CONN_STR = os.environ["POSTGRES_URL"]
+    neon_client.TRANSPORT = "http"
+    sys.path.insert(0, DB_DIR)
+    seed = load_script("seed_neon", "seed-neon.py")
+    verify = load_script("verify_questions", "verify-questions.py")
+    questions = seed.QUESTIONS
+
+    admin = neon_standin.Backend(args.dsn)
+    results = []
+    for size in args.sizes:
+        seed.QUESTIONS = synthetic_catalog(questions, size)
+        print(f"=== Catalog size {size} (latency {args.latency_ms:.0f} ms) ===", file=sys.stderr)
+        for mode in args.modes:
+            reset_schema(admin)
+            if mode == "per-question":
+                fn = lambda: seed.seed_per_question(concurrency=args.concurrency)
+            elif mode == "batched":
+                fn = seed.seed_batched
+            else:
+                fn = lambda: seed.seed_incremental(concurrency=args.concurrency)
+            results.append(measure(server, f"seed {mode} n={size}", fn))
+            if mode == "incremental":
+                # Same catalog again: only the diff against the database it just wrote
+                results.append(measure(server, f"seed incremental no-op n={size}", fn))
+
+        def run_verify():
+            sys.argv = ["verify-questions.py", "--no-cache"]
+            verify.main()
+        results.append(measure(server, f"verify n={size}", run_verify))
+
+    admin.close()
+    server.shutdown()
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Compile the question catalog into one idempotent SQL file.
+
+Turns the QUESTIONS catalog into db/question_catalog.sql: a single
+transaction with two set-based statements. The first upserts templates,
+answer options and score examples from one JSONB literal (one question per
+line, so catalog changes diff cleanly) and deactivates templates that left
+the catalog; the second rebuilds question_tier_bundles. Rows already equal to
+the catalog are not written, so applying the file twice changes nothing the
+second time.
+
+The output depends only on the catalog: an unchanged catalog compiles to a
+byte-identical file, and its header carries the catalog hash that
+`seed-neon.py --targets` reads back from a seeded database.
+
+    python db/compile-catalog.py              # (re)write db/question_catalog.sql
+    python db/compile-catalog.py --check      # exit 1 if the file is out of date
+    python db/compile-catalog.py --apply      # send it as one batch request
+    psql -1 -f db/question_catalog.sql        # or apply it directly
+"""
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(DB_DIR, "question_catalog.sql")
+
+UPSERT_CATALOG_SQL = """
+WITH payload AS (
+  SELECT q FROM jsonb_array_elements({payload}::jsonb) AS q
+), deactivated AS (
+  UPDATE question_templates SET is_active = FALSE, updated_at = NOW()
+  WHERE is_active = TRUE
+    AND (category, question_number) NOT IN (SELECT q->>'cat', q->>'id' FROM payload)
+  RETURNING id
+), upserted AS (
+  INSERT INTO question_templates (
+    category, sub_category, question_number, question_text, question_type,
+    applicable_tiers, weight, is_critical, comment, motivation_learning_point, is_active
+  )
+  SELECT q->>'cat', q->>'sec', q->>'id', q->>'text', 'multiple_choice',
+         q->'tiers', (q->>'weight')::numeric, (q->>'critical')::boolean,
+         q->>'comment', q->>'motivation', TRUE
+  FROM payload
+  ON CONFLICT (category, question_number) DO UPDATE SET
+    sub_category = EXCLUDED.sub_category,
+    question_text = EXCLUDED.question_text,
+    applicable_tiers = EXCLUDED.applicable_tiers,
+    weight = EXCLUDED.weight,
+    is_critical = EXCLUDED.is_critical,
+    comment = EXCLUDED.comment,
+    motivation_learning_point = EXCLUDED.motivation_learning_point,
+    is_active = TRUE,
+    updated_at = NOW()
+  WHERE (question_templates.sub_category, question_templates.question_text, question_templates.applicable_tiers,
+         question_templates.weight, question_templates.is_critical, question_templates.comment,
+         question_templates.motivation_learning_point, question_templates.is_active)
+    IS DISTINCT FROM
+        (EXCLUDED.sub_category, EXCLUDED.question_text, EXCLUDED.applicable_tiers,
+         EXCLUDED.weight, EXCLUDED.is_critical, EXCLUDED.comment,
+         EXCLUDED.motivation_learning_point, TRUE)
+  RETURNING id, category, question_number
+), templates AS (
+  -- Ids of every catalog template: inserted or updated above, or already up to date
+  SELECT id, category, question_number FROM upserted
+  UNION
+  SELECT qt.id, qt.category, qt.question_number
+  FROM question_templates qt
+  JOIN payload ON qt.category = payload.q->>'cat' AND qt.question_number = payload.q->>'id'
+), wanted_options AS (
+  SELECT t.id AS tid, o->>'label' AS label, (o->>'value')::int AS value, (o->>'ord')::int AS ord
+  FROM payload
+  JOIN templates t ON t.category = payload.q->>'cat' AND t.question_number = payload.q->>'id'
+  CROSS JOIN jsonb_array_elements(payload.q->'options') AS o
+), removed_options AS (
+  DELETE FROM question_answer_options qao
+  USING templates t
+  WHERE qao.question_template_id = t.id
+    AND NOT EXISTS (
+      SELECT 1 FROM wanted_options w
+      WHERE w.tid = qao.question_template_id AND w.label = qao.option_text
+        AND w.value = qao.score_value AND w.ord = qao.option_order AND qao.is_example = FALSE
+    )
+  RETURNING qao.id
+), added_options AS (
+  INSERT INTO question_answer_options (question_template_id, option_text, score_value, option_order, is_example)
+  SELECT w.tid, w.label, w.value, w.ord, FALSE
+  FROM wanted_options w
+  WHERE NOT EXISTS (
+    SELECT 1 FROM question_answer_options qao
+    WHERE qao.question_template_id = w.tid AND qao.option_text = w.label
+      AND qao.score_value = w.value AND qao.option_order = w.ord AND qao.is_example = FALSE
+  )
+  RETURNING id
+), scores AS (
+  INSERT INTO question_score_examples (question_template_id, score_level, reason_text, report_action)
+  SELECT t.id, s->>'level', s->>'reason', s->>'action'
+  FROM payload
+  JOIN templates t ON t.category = payload.q->>'cat' AND t.question_number = payload.q->>'id'
+  CROSS JOIN jsonb_array_elements(payload.q->'scores') AS s
+  ON CONFLICT (question_template_id, score_level) DO UPDATE SET
+    reason_text = EXCLUDED.reason_text,
+    report_action = EXCLUDED.report_action
+  WHERE (question_score_examples.reason_text, question_score_examples.report_action)
+    IS DISTINCT FROM (EXCLUDED.reason_text, EXCLUDED.report_action)
+  RETURNING id
+)
+SELECT (SELECT COUNT(*) FROM payload) AS questions,
+       (SELECT COUNT(*) FROM upserted) AS templates_written,
+       (SELECT COUNT(*) FROM deactivated) AS templates_deactivated,
+       (SELECT COUNT(*) FROM removed_options) AS options_removed,
+       (SELECT COUNT(*) FROM added_options) AS options_added,
+       (SELECT COUNT(*) FROM scores) AS score_examples_written"""
+
+STATEMENT_END = re.compile(r";[ \t]*$", re.MULTILINE)
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(DB_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sql_literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def payload_literal(questions):
+    """The catalog as a JSONB array literal, one question per line, keys sorted."""
+    lines = []
+    for q in questions:
+        lines.append(json.dumps({
+            "cat": q["cat"], "sec": q["sec"], "id": q["id"], "text": q["text"],
+            "critical": bool(q["critical"]), "weight": float(q["weight"]),
+            "comment": q["comment"], "motivation": q["motivation"], "tiers": q["tiers"],
+            "options": [{"label": o["label"], "value": o["value"], "ord": i + 1} for i, o in enumerate(q["options"])],
+            "scores": [{"level": s["level"], "reason": s["reason"], "action": s["action"]} for s in q["scores"]],
+        }, sort_keys=True, ensure_ascii=False))
+    return sql_literal("[\n" + ",\n".join(lines) + "\n]")
+
+
+def compile_catalog(seed):
+    """Render the SQL file for the catalog seed-neon.py would seed."""
+    questions = sorted(seed.QUESTIONS, key=lambda q: (q["cat"], q["id"]))
+    digest = seed.catalog_hash(seed.canonical_question(q) for q in questions)
+    tiers = list(seed.ALL_TIERS)
+    bundles = seed.TIER_BUNDLES_SQL.replace("$1::jsonb", sql_literal(json.dumps(tiers)) + "::jsonb")
+    return "\n".join([
+        "-- Generated by db/compile-catalog.py from the question catalog. Do not edit by hand.",
+        f"-- catalog-hash: {digest}",
+        f"-- questions: {len(questions)}, tiers: {', '.join(tiers)}",
+        "",
+        "BEGIN;",
+        "",
+        "-- Templates, answer options and score examples; rows already matching are left alone",
+        UPSERT_CATALOG_SQL.strip("\n").format(payload=payload_literal(questions)) + ";",
+        "",
+        "-- Per-tier question bundles (unchanged bundles are left alone)",
+        "\n".join(line[4:] if line.startswith("    ") else line for line in bundles.strip("\n").splitlines()) + ";",
+        "",
+        "COMMIT;",
+        "",
+    ])
+
+
+def split_statements(sql):
+    """Statements of a compiled file, without comments and the BEGIN/COMMIT wrapper."""
+    statements = []
+    for chunk in STATEMENT_END.split(sql):
+        body = "\n".join(line for line in chunk.splitlines() if not line.startswith("--")).strip()
+        if body and body.upper() not in ("BEGIN", "COMMIT"):
+            statements.append(body)
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the question catalog into one idempotent SQL file.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="SQL file to write (default: db/question_catalog.sql)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the output file is out of date")
+    parser.add_argument("--apply", action="store_true",
+                        help="also run the compiled file against POSTGRES_URL in one batch request")
+    args = parser.parse_args()
+
+    sys.path.insert(0, DB_DIR)
+    seed = load_script("seed_neon", "seed-neon.py")
+    sql = compile_catalog(seed)
+    digest = sql.splitlines()[1].split(": ", 1)[1]
+
+    try:
+        with open(args.output, encoding="utf-8") as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+
+    if args.check:
+        if current != sql:
+            print(f"FAIL {args.output} is out of date; run db/compile-catalog.py")
+            exit(1)
+        print(f"OK {args.output} is up to date (catalog {digest[:12]})")
+        return
+
+    if current == sql:
+        print(f"OK {args.output} unchanged (catalog {digest[:12]})")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(sql)
+        print(f"OK wrote {args.output} ({len(sql.encode('utf-8'))} bytes, catalog {digest[:12]})")
+
+    if args.apply:
+        from neon_client import CONN_STR, run_sql_batch
+        if not CONN_STR:
+            print("ERROR: POSTGRES_URL environment variable is not set.")
+            exit(1)
+        results = run_sql_batch([(statement, None) for statement in split_statements(sql)], idempotent=True)
+        counts = results[0]["rows"][0]
+        print(f"=== Applied: {counts['templates_written']} templates written, "
+              f"{counts['templates_deactivated']} deactivated, {counts['options_removed']} options removed, "
+              f"{counts['options_added']} added, {counts['score_examples_written']} score examples written, "
+              f"{len(results[1]['rows'])} tier bundles rebuilt ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Profile the application's hot queries and suggest indexes.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) on each query in HOT_QUERIES with parameters
+sampled from the database, and flags sequential scans that filter out rows,
+plans touching many buffers, and indexes made redundant by another index on
+the same table. With --measure, each suggested index is built inside a
+transaction, the query is explained again, and the index is dropped before
+the transaction ends, so the before/after numbers come from the real data.
+
+--measure takes a SHARE lock on the table while the index builds; run it
+against a Neon branch rather than production.
+"""
+import argparse
+import json
+
+from neon_client import CONN_STR, NeonError, run_sql, run_sql_batch, with_archive
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+# Tables the app reads through the *_all archive views; {form_responses} and {notes}
+# in SAMPLES and HOT_QUERIES resolve to the view, or to the live table before the
+# archive migration
+ARCHIVED_TABLES = ("form_responses", "notes")
+
+# Representative parameter values, picked to be the worst realistic case
+SAMPLES = {
+    "tier": "SELECT 'tier_4' AS value",
+    "token": "SELECT token AS value FROM audits ORDER BY id DESC LIMIT 1",
+    "busy_audit_id": """
+        SELECT audit_id AS value FROM {form_responses}
+        GROUP BY audit_id ORDER BY COUNT(*) DESC, audit_id LIMIT 1
+    """,
+    "noted_audit_id": """
+        SELECT audit_id AS value FROM {notes}
+        GROUP BY audit_id ORDER BY COUNT(*) DESC, audit_id LIMIT 1
+    """,
+    "busy_auditor_id": """
+        SELECT auditor_id AS value FROM audits WHERE auditor_id IS NOT NULL
+        GROUP BY auditor_id ORDER BY COUNT(*) DESC, auditor_id LIMIT 1
+    """,
+    "payment_intent_id": """
+        SELECT payment_intent_id AS value FROM audits
+        WHERE payment_intent_id IS NOT NULL ORDER BY id DESC LIMIT 1
+    """,
+}
+
+# Queries as the app sends them, with the sample each $n is bound to and the
+# indexes worth trying when the plan falls back to a sequential scan
+HOT_QUERIES = [
+    {
+        "name": "questions_for_tier",
+        "source": "lib/questions-db.ts getQuestionsForTier()",
+        "params": [("tier", lambda v: json.dumps([v]))],
+        "sql": """
+            SELECT qt.id, qt.category, qt.sub_category, qt.question_number, qt.question_text,
+                   qt.question_type, qt.weight, qt.is_critical, qt.motivation_learning_point, qt.comment,
+                   (SELECT json_agg(jsonb_build_object('value', qao2.score_value, 'label', qao2.option_text)
+                                    ORDER BY qao2.option_order)
+                    FROM question_answer_options qao2
+                    WHERE qao2.question_template_id = qt.id AND qao2.is_example = FALSE) as options,
+                   (SELECT json_agg(jsonb_build_object('score_level', qse2.score_level,
+                                                       'reason_text', qse2.reason_text,
+                                                       'report_action', qse2.report_action)
+                                    ORDER BY qse2.score_level)
+                    FROM question_score_examples qse2
+                    WHERE qse2.question_template_id = qt.id) as score_examples
+            FROM question_templates qt
+            WHERE qt.is_active = TRUE AND qt.applicable_tiers @> $1::jsonb
+            ORDER BY qt.category, qt.question_number
+        """,
+        "suggest": [],
+    },
+    {
+        "name": "tier_bundle",
+        "source": "lib/questions-db.ts getTierBundle()",
+        "params": [("tier", None)],
+        "sql": "SELECT questions, version_hash FROM question_tier_bundles WHERE tier = $1",
+        "suggest": [],
+    },
+    {
+        "name": "audit_by_token",
+        "source": "app/api/audits/[token]/route.ts",
+        "params": [("token", None)],
+        "sql": """
+            SELECT id, token, status, client_name, landlord_email, property_address, risk_audit_tier,
+                   conducted_by, created_at, payment_status, service_type
+            FROM audits WHERE token = $1
+        """,
+        "suggest": [],
+    },
+    {
+        "name": "responses_by_audit",
+        "source": "lib/audit-responses.ts getAuditResponses()",
+        "params": [("busy_audit_id", None)],
+        "sql": """
+            SELECT id, audit_id, question_id, answer_value, comment, created_at
+            FROM {form_responses} WHERE audit_id = $1 ORDER BY question_id
+        """,
+        "suggest": [],
+    },
+    {
+        "name": "notes_by_audit",
+        "source": "lib/audit-responses.ts getAuditNotes()",
+        "params": [("noted_audit_id", None)],
+        "sql": "SELECT * FROM {notes} WHERE audit_id = $1 ORDER BY created_at DESC",
+        "suggest": [],
+    },
+    {
+        "name": "dashboard_auditor",
+        "source": "app/api/audits/route.ts GET (auditor, first page)",
+        "params": [("busy_auditor_id", None)],
+        "sql": """
+            SELECT id, token, status, client_name, landlord_email, property_address, risk_audit_tier,
+                   conducted_by, created_at, submitted_at
+            FROM audits WHERE auditor_id = $1 ORDER BY created_at DESC, id DESC LIMIT 21
+        """,
+        "suggest": [("idx_audits_auditor_created", "audits", "auditor_id, created_at DESC, id DESC")],
+    },
+    {
+        "name": "dashboard_admin",
+        "source": "app/api/audits/route.ts GET (admin, first page)",
+        "params": [],
+        "sql": """
+            SELECT id, token, status, client_name, landlord_email, property_address, risk_audit_tier,
+                   conducted_by, created_at, submitted_at
+            FROM audits ORDER BY created_at DESC, id DESC LIMIT 21
+        """,
+        "suggest": [],
+    },
+    {
+        "name": "dashboard_rollups",
+        "source": "lib/dashboard-rollups.ts getDashboardRollups() (auditor)",
+        "params": [("busy_auditor_id", None)],
+        "sql": """
+            SELECT
+              (SELECT COALESCE(json_agg(r), '[]') FROM (
+                SELECT risk_audit_tier AS tier, status, SUM(audit_count) AS count
+                FROM dashboard_audit_rollups WHERE auditor_id = $1
+                GROUP BY risk_audit_tier, status
+              ) r) AS audits,
+              (SELECT COALESCE(json_agg(r), '[]') FROM (
+                SELECT scores_category AS category, SUM(score_count) AS count, SUM(score_sum) AS score_sum
+                FROM dashboard_score_rollups WHERE auditor_id = $1
+                GROUP BY scores_category
+              ) r) AS scores
+            FROM dashboard_rollup_state st WHERE st.name = 'audits'
+        """,
+        "suggest": [],
+    },
+    {
+        "name": "audit_by_payment_intent",
+        "source": "app/api/stripe/webhook/route.ts",
+        "params": [("payment_intent_id", None)],
+        "sql": "SELECT id, token, status FROM audits WHERE payment_intent_id = $1",
+        "suggest": [("idx_audits_payment_intent", "audits", "payment_intent_id")],
+    },
+]
+
+INDEX_DEFINITIONS_SQL = """
+    SELECT t.relname AS table_name, i.relname AS index_name, ix.indisunique AS is_unique,
+           am.amname AS method, ix.indpred IS NOT NULL AS is_partial, ix.indexprs IS NOT NULL AS has_exprs,
+           (SELECT json_agg(a.attname ORDER BY k.ord)
+            FROM unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum) AS columns,
+           pg_relation_size(i.oid) AS size_bytes,
+           COALESCE(s.idx_scan, 0) AS scans
+    FROM pg_index ix
+    JOIN pg_class t ON t.oid = ix.indrelid
+    JOIN pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_am am ON am.oid = i.relam
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+    WHERE n.nspname = 'public'
+    ORDER BY t.relname, i.relname
+"""
+
+
+def sample_params(names, sources):
+    """Resolve sample names to values; a sample with no rows (or missing columns) resolves to None."""
+    values = {}
+    for name in names:
+        try:
+            rows = run_sql(SAMPLES[name].format(**sources))["rows"]
+        except NeonError:
+            rows = []
+        values[name] = rows[0]["value"] if rows else None
+    return values
+
+
+def bind(query, samples):
+    params = []
+    for name, transform in query["params"]:
+        value = samples.get(name)
+        if value is None:
+            return None
+        params.append(transform(value) if transform else value)
+    return params
+
+
+def explain_statement(query):
+    return "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query["sql"]
+
+
+def plan_of(result):
+    plan = result["rows"][0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def summarize(plan):
+    """Reduce an EXPLAIN JSON plan to the numbers the report needs."""
+    root = plan["Plan"]
+    seq_scans = [
+        {
+            "table": n.get("Relation Name"),
+            "rows": n.get("Actual Rows", 0) * n.get("Actual Loops", 1),
+            "removed": n.get("Rows Removed by Filter", 0) * n.get("Actual Loops", 1),
+            "filter": n.get("Filter"),
+        }
+        for n in walk(root) if n.get("Node Type") == "Seq Scan"
+    ]
+    return {
+        "time_ms": plan.get("Execution Time", 0.0),
+        "planning_ms": plan.get("Planning Time", 0.0),
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "read_blocks": root.get("Shared Read Blocks", 0),
+        "rows": root.get("Actual Rows", 0),
+        "seq_scans": seq_scans,
+    }
+
+
+def measure_index(query, params, table, columns):
+    """Explain the query with a probe index on `table(columns)`, built and dropped in one transaction."""
+    results = run_sql_batch([
+        (f"CREATE INDEX advisor_probe ON {table}({columns})", None),
+        (explain_statement(query), params),
+        ("DROP INDEX advisor_probe", None),
+    ])
+    return summarize(plan_of(results[1]))
+
+
+def redundant_indexes(indexes):
+    """Find btree indexes whose columns are a leading prefix of another btree index on the same table.
+
+    Also reports never-scanned indexes that share a column with another
+    index on the table, as candidates to review rather than drop.
+    """
+    plain = [ix for ix in indexes if ix["method"] == "btree" and not ix["is_partial"] and not ix["has_exprs"]]
+    redundant = []
+    overlapping = []
+    for ix in plain:
+        if ix["is_unique"]:
+            continue
+        others = [o for o in plain if o["table_name"] == ix["table_name"] and o["index_name"] != ix["index_name"]]
+        covering = next(
+            (o for o in others
+             if o["columns"][:len(ix["columns"])] == ix["columns"]
+             and (len(o["columns"]) > len(ix["columns"]) or o["index_name"] < ix["index_name"])),
+            None,
+        )
+        if covering:
+            redundant.append((ix, covering))
+            continue
+        shared = next((o for o in others if set(o["columns"]) & set(ix["columns"])), None)
+        if shared and int(ix["scans"]) == 0:
+            overlapping.append((ix, shared))
+    return redundant, overlapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the app's hot queries and suggest indexes.")
+    parser.add_argument("--queries", nargs="+", choices=[q["name"] for q in HOT_QUERIES],
+                        help="only profile these queries (default: all)")
+    parser.add_argument("--seq-scan-rows", type=int, default=1000,
+                        help="flag sequential scans that filter out at least this many rows (default: 1000)")
+    parser.add_argument("--buffer-threshold", type=int, default=1000,
+                        help="flag plans touching at least this many 8 KB buffers (default: 1000)")
+    parser.add_argument("--measure", action="store_true",
+                        help="build each suggested index, re-explain and drop it again, in one transaction")
+    parser.add_argument("--json", metavar="PATH", help="also write the findings to PATH as JSON")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    sources = {table: with_archive(table) for table in ARCHIVED_TABLES}
+    queries = [dict(q, sql=q["sql"].format(**sources))
+               for q in HOT_QUERIES if not args.queries or q["name"] in args.queries]
+    samples = sample_params({name for q in queries for name, _ in q["params"]}, sources)
+
+    indexes = run_sql(INDEX_DEFINITIONS_SQL)["rows"]
+    existing = {ix["index_name"] for ix in indexes}
+
+    report = {"queries": [], "redundant_indexes": [], "suggestions": []}
+    print(f"=== Profiling {len(queries)} hot queries ===")
+    for query in queries:
+        params = bind(query, samples)
+        if params is None:
+            print(f"  SKIP {query['name']}: no sample data")
+            continue
+        try:
+            results = run_sql_batch([(explain_statement(query), params)], read_only=True)
+        except Exception as e:
+            print(f"  FAIL {query['name']}: {e}")
+            continue
+        stats = summarize(plan_of(results[0]))
+        print(f"  OK {query['name']}: {stats['time_ms']:.2f} ms, {stats['buffers']} buffers, "
+              f"{stats['rows']} rows  ({query['source']})")
+
+        flags = []
+        scanned = set()
+        for scan in stats["seq_scans"]:
+            if scan["removed"] >= args.seq_scan_rows:
+                scanned.add(scan["table"])
+                flags.append(f"seq scan on {scan['table']} discards {scan['removed']} rows"
+                             f" (filter: {scan['filter']})")
+        if stats["buffers"] >= args.buffer_threshold:
+            flags.append(f"{stats['buffers']} buffers touched ({stats['read_blocks']} read from disk)")
+        for flag in flags:
+            print(f"    FLAG {flag}")
+
+        for index_name, table, columns in query["suggest"]:
+            if table not in scanned or index_name in existing:
+                continue
+            suggestion = {"query": query["name"], "sql": f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({columns})",
+                          "before_ms": stats["time_ms"], "before_buffers": stats["buffers"]}
+            if args.measure:
+                try:
+                    after = measure_index(query, params, table, columns)
+                    suggestion.update(after_ms=after["time_ms"], after_buffers=after["buffers"])
+                except Exception as e:
+                    suggestion["error"] = str(e)
+            report["suggestions"].append(suggestion)
+        report["queries"].append({"name": query["name"], "source": query["source"], "flags": flags, **stats})
+
+    print("\n=== Index review ===")
+    redundant, overlapping = redundant_indexes(indexes)
+    for ix, covering in redundant:
+        print(f"  REDUNDANT {ix['index_name']} ({', '.join(ix['columns'])}) is covered by "
+              f"{covering['index_name']} ({', '.join(covering['columns'])}); "
+              f"DROP INDEX {ix['index_name']} frees {int(ix['size_bytes']) // 1024} KB")
+        report["redundant_indexes"].append({"index": ix["index_name"], "covered_by": covering["index_name"]})
+    for ix, other in overlapping:
+        print(f"  UNUSED {ix['index_name']} ({', '.join(ix['columns'])}) has no scans and overlaps "
+              f"{other['index_name']} ({', '.join(other['columns'])})")
+        report["redundant_indexes"].append({"index": ix["index_name"], "overlaps": other["index_name"], "scans": 0})
+    if not redundant and not overlapping:
+        print("  No redundant indexes found")
+
+    print("\n=== Suggested indexes ===")
+    if not report["suggestions"]:
+        print("  None: no hot query falls back to a sequential scan with a known fix")
+    for s in report["suggestions"]:
+        print(f"  {s['sql']};")
+        if "error" in s:
+            print(f"    FAIL measuring: {s['error']}")
+        elif "after_ms" in s:
+            print(f"    {s['query']}: {s['before_ms']:.2f} ms -> {s['after_ms']:.2f} ms, "
+                  f"{s['before_buffers']} -> {s['after_buffers']} buffers")
+        else:
+            print(f"    {s['query']}: {s['before_ms']:.2f} ms, {s['before_buffers']} buffers now "
+                  f"(run with --measure for the after numbers)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nFindings written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Stream audits, form_responses, scores and notes to compressed CSV or Parquet files.
+
+Each table is paged with keyset pagination on id, so memory stays bounded by
+one page regardless of table size. form_responses and notes are read through
+their *_all views when the archive exists, so archived audits are included.
+
+Progress (the last exported id per table) is checkpointed after every page.
+CSV parts are written as one gzip member per page, so an interrupted export
+truncates the unfinished part back to its last checkpoint and continues from
+that id; if the part file is gone or shorter than the checkpoint, the part is
+exported again from its first id. Parquet files cannot be appended to (an unfinished one has no
+footer), so a Parquet export resumes from the start of its unfinished file.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime
+
+from neon_client import CONN_STR, run_sql, with_archive
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+TABLES = ["audits", "form_responses", "scores", "notes"]
+ARCHIVED_TABLES = {"form_responses", "notes"}
+
+# Postgres type OIDs reported in the "fields" of a SQL-over-HTTP result
+BOOL_OIDS = {16}
+INT_OIDS = {20, 21, 23}
+FLOAT_OIDS = {700, 701, 1700}
+TIMESTAMP_OIDS = {1114, 1184}
+
+
+def to_bool(v):
+    return v if isinstance(v, bool) else v in ("t", "true")
+
+
+def to_timestamp(v):
+    return v if isinstance(v, datetime) else datetime.fromisoformat(v)
+
+
+def column_types(fields):
+    """Map result fields to (name, kind) pairs, kind being one of bool/int/float/timestamp/str."""
+    columns = []
+    for f in fields:
+        oid = f.get("dataTypeID")
+        if oid in BOOL_OIDS:
+            kind = "bool"
+        elif oid in INT_OIDS:
+            kind = "int"
+        elif oid in FLOAT_OIDS:
+            kind = "float"
+        elif oid in TIMESTAMP_OIDS:
+            kind = "timestamp"
+        else:
+            kind = "str"
+        columns.append((f["name"], kind))
+    return columns
+
+
+CONVERTERS = {"bool": to_bool, "int": int, "float": float, "timestamp": to_timestamp, "str": str}
+
+
+def convert_rows(rows, columns):
+    """Yield tuples of typed values in column order."""
+    for r in rows:
+        yield tuple(None if r[name] is None else CONVERTERS[kind](r[name]) for name, kind in columns)
+
+
+def fetch_pages(table, after_id, page_size):
+    """Yield (fields, rows) pages of `table` with id > after_id, in id order."""
+    source = with_archive(table) if table in ARCHIVED_TABLES else table
+    while True:
+        res = run_sql(f"SELECT * FROM {source} WHERE id > $1 ORDER BY id LIMIT $2", [after_id, page_size])
+        rows = res["rows"]
+        if not rows:
+            return
+        yield res["fields"], rows
+        after_id = int(rows[-1]["id"])
+        if len(rows) < page_size:
+            return
+
+
+class CsvPartWriter:
+    """Writes each page as its own gzip member; concatenated members read back as one .csv.gz."""
+
+    resumable = True
+
+    def __init__(self, path, columns, offset=0):
+        if offset:
+            # Drop anything written after the last checkpoint and append from there
+            self.file = open(path, "r+b")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+        else:
+            self.file = open(path, "wb")
+            self.write([[name for name, _ in columns]])
+
+    def write(self, rows):
+        buf = io.StringIO(newline="")
+        csv.writer(buf).writerows(rows)
+        self.file.write(gzip.compress(buf.getvalue().encode("utf-8")))
+
+    def checkpoint(self):
+        """Make the members written so far durable; returns the offset to resume from."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetPartWriter:
+    ARROW_TYPES = {"bool": "bool_", "int": "int64", "float": "float64", "str": "string"}
+
+    resumable = False
+
+    def __init__(self, path, columns, offset=0):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            (name, pa.timestamp("us") if kind == "timestamp" else getattr(pa, self.ARROW_TYPES[kind])())
+            for name, kind in columns
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows):
+        rows = list(rows)
+        arrays = [
+            self.pa.array([r[i] for r in rows], type=field.type)
+            for i, field in enumerate(self.schema)
+        ]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": (CsvPartWriter, "csv.gz"), "parquet": (ParquetPartWriter, "parquet")}
+
+
+def load_state(path):
+    """Checkpoint of one table: last exported id, the part being written and the id it
+    starts after, rows exported (part_rows of them in that part) and, for a resumable part,
+    its byte offset (0 = not started)."""
+    state = {"last_id": 0, "next_part": 1, "part_start_id": 0, "rows": 0, "part_rows": 0, "offset": 0}
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return state
+    state.update(saved)
+    if "part_start_id" not in saved:
+        # Written before part starts were recorded
+        state["part_start_id"] = None
+    return state
+
+
+def save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def export_table(table, out_dir, fmt, page_size, rows_per_file):
+    """Export one table, resuming from its checkpoint file if present."""
+    writer_cls, ext = WRITERS[fmt]
+    state_path = os.path.join(out_dir, f"{table}.state.json")
+    state = load_state(state_path)
+    if state["offset"]:
+        path = os.path.join(out_dir, f"{table}-{state['next_part']:06d}.{ext}")
+        try:
+            intact = os.path.getsize(path) >= state["offset"]
+        except FileNotFoundError:
+            intact = False
+        if not intact:
+            if state["part_start_id"] is None:
+                print(f"ERROR: {path} is missing or shorter than its checkpoint; "
+                      f"run again with --restart to export {table} from the start.")
+                exit(1)
+            print(f"  {path} is missing or shorter than its checkpoint; "
+                  f"exporting part {state['next_part']} again after id {state['part_start_id']}")
+            state.update(last_id=state["part_start_id"], rows=state["rows"] - state["part_rows"],
+                         part_rows=0, offset=0)
+            save_state(state_path, state)
+    if state["last_id"]:
+        print(f"  Resuming {table} after id {state['last_id']} (part {state['next_part']})")
+
+    def finish_part():
+        state.update(next_part=state["next_part"] + 1, part_start_id=state["last_id"], part_rows=0, offset=0)
+        save_state(state_path, state)
+        print(f"  {table}: {state['rows']} rows exported (through id {state['last_id']})")
+
+    writer = None
+    for fields, rows in fetch_pages(table, state["last_id"], page_size):
+        if writer is None:
+            columns = column_types(fields)
+            path = os.path.join(out_dir, f"{table}-{state['next_part']:06d}.{ext}")
+            writer = writer_cls(path, columns, state["offset"])
+        writer.write(convert_rows(rows, columns))
+        state["last_id"] = int(rows[-1]["id"])
+        state["rows"] += len(rows)
+        state["part_rows"] += len(rows)
+
+        if state["part_rows"] >= rows_per_file:
+            writer.close()
+            writer = None
+            finish_part()
+        elif writer.resumable:
+            state["offset"] = writer.checkpoint()
+            save_state(state_path, state)
+
+    if writer is not None:
+        writer.close()
+        finish_part()
+    elif state["offset"]:
+        # Resumed a part that had already received every remaining row
+        finish_part()
+    print(f"  OK {table}: {state['rows']} rows total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export analytics tables to compressed CSV or Parquet.")
+    parser.add_argument("--out", default="exports", help="output directory (default: exports)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv",
+                        help="csv writes .csv.gz; parquet requires pyarrow (default: csv)")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=TABLES)
+    parser.add_argument("--page-size", type=int, default=5000, help="rows fetched per request")
+    parser.add_argument("--rows-per-file", type=int, default=1_000_000,
+                        help="rows per output file (default: 1000000)")
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoints and export from the start")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("ERROR: --format parquet requires pyarrow (pip install pyarrow).")
+            exit(1)
+
+    os.makedirs(args.out, exist_ok=True)
+    print(f"=== Exporting {', '.join(args.tables)} to {args.out} ({args.format}) ===")
+    for table in args.tables:
+        state_path = os.path.join(args.out, f"{table}.state.json")
+        if args.restart and os.path.exists(state_path):
+            os.remove(state_path)
+        export_table(table, args.out, args.format, args.page_size, args.rows_per_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Generate realistic synthetic users, audits, form_responses, scores and notes.
+
+Rows follow db/schema.sql and the question catalog: audits are spread across
+tier_0-tier_4 and all statuses, submitted and completed audits answer every
+question of their tier with 1, 5 or 10, completed audits get category and
+Overall scores over those questions computed with the lib/scoring.ts rules,
+and some of them get auditor notes.
+Everything is streamed in with COPY, one chunk of audits per transaction,
+so memory stays bounded by the chunk size. The same --seed against the same
+starting ids produces the same rows.
+
+COPY is not available over SQL-over-HTTP, so this connects to the database
+directly (POSTGRES_URL, or --dsn for a local Postgres).
+Requires psycopg (pip install psycopg[binary]).
+
+    python db/generate-synthetic-data.py --dsn postgresql://postgres@localhost/dev --audits 40000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from neon_client import CONN_STR
+from question_catalog import QUESTIONS
+from scoring import to_fixed
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+STATUSES = [("pending", 0.2), ("submitted", 0.3), ("completed", 0.5)]
+TIERS = ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"]
+ANSWER_VALUES = (1, 5, 10)
+OVERALL_CATEGORY = "Overall"
+NULL = "\\N"  # COPY text format
+
+FIRST_NAMES = ["Amelia", "Oliver", "Isla", "George", "Ava", "Harry", "Mia", "Noah", "Grace", "Jack",
+               "Sophie", "Leo", "Emily", "Oscar", "Lily", "Arthur", "Freya", "Charlie", "Ella", "Henry"]
+LAST_NAMES = ["Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Patel",
+              "Wright", "Robinson", "Thompson", "Evans", "Walker", "White", "Roberts", "Green", "Hall"]
+STREETS = ["High Street", "Station Road", "Church Lane", "Victoria Road", "Green Lane", "Manor Road",
+           "Park Avenue", "Queens Road", "Mill Lane", "The Crescent", "Kings Road", "New Street"]
+TOWNS = ["Leeds", "Bristol", "Manchester", "Norwich", "Reading", "Sheffield", "Exeter", "York",
+         "Nottingham", "Brighton", "Cardiff", "Leicester"]
+NOTE_TEXTS = [
+    "Landlord to send updated certificate by end of month.",
+    "Evidence reviewed on site, copies retained.",
+    "Follow up with letting agent regarding missing records.",
+    "Tenant confirmed receipt verbally; no written proof.",
+    "Recommend moving to a documented tracking system.",
+    "Discussed with landlord, action plan agreed.",
+]
+# Bcrypt-shaped placeholder; synthetic users cannot log in
+PASSWORD_HASH = "$2a$10$" + "s" * 53
+
+
+class CatalogScorer:
+    """Category and Overall scores for a full set of answers, as lib/scoring.ts computes them."""
+
+    def __init__(self, questions):
+        self.question_ids = [q["id"] for q in questions]
+        self.weights = [q["weight"] for q in questions]
+        self.categories = list(dict.fromkeys(q["cat"] for q in questions))
+        self.members = [[i for i, q in enumerate(questions) if q["cat"] == cat] for cat in self.categories]
+        self.category_weights = [sum(self.weights[i] for i in m) for m in self.members]
+
+    def score(self, answers):
+        """`answers` is a list of values in question order; returns [(category, score)] incl. Overall."""
+        scores = []
+        for cat, members, total in zip(self.categories, self.members, self.category_weights):
+            weighted = sum(answers[i] * self.weights[i] for i in members)
+            scores.append((cat, to_fixed(weighted / total) if total else 0.0))
+        overall = to_fixed(sum(s for _, s in scores) / len(scores))
+        return scores + [(OVERALL_CATEGORY, overall)]
+
+
+def fmt_ts(ts):
+    return ts.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def next_id(conn, table):
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+
+def copy_lines(conn, copy_sql, lines):
+    """COPY pre-formatted text-format lines, in blocks so no single write gets huge."""
+    with conn.cursor().copy(copy_sql) as copy:
+        for start in range(0, len(lines), 20000):
+            copy.write("".join(lines[start:start + 20000]))
+
+
+def generate_users(rng, first_id, count, now):
+    users = []
+    lines = []
+    for i in range(count):
+        user_id = first_id + i
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        created = now - timedelta(days=rng.randint(700, 1500))
+        users.append((user_id, name))
+        lines.append(f"{user_id}\t{name}\tsynthetic-{user_id}@example.com\t{PASSWORD_HASH}\t{fmt_ts(created)}\n")
+    return users, lines
+
+
+def generate_chunk(rng, scorers, users, auditor_weights, first_audit_id, count, now, days, notes_rate):
+    """Build the COPY lines for one chunk of audits and everything hanging off them.
+
+    `scorers` maps each tier to the CatalogScorer over its questions.
+    """
+    audits, responses, scores, notes = [], [], [], []
+    statuses = [s for s, _ in STATUSES]
+    status_weights = [w for _, w in STATUSES]
+    for i in range(count):
+        audit_id = first_audit_id + i
+        auditor_id, auditor_name = rng.choices(users, weights=auditor_weights)[0]
+        status = rng.choices(statuses, weights=status_weights)[0]
+        created = now - timedelta(seconds=rng.randint(0, days * 86400))
+        submitted = created + timedelta(seconds=rng.randint(3600, 21 * 86400)) if status != "pending" else None
+        if submitted and submitted > now:
+            submitted = now
+        client = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        address = f"{rng.randint(1, 250)} {rng.choice(STREETS)}, {rng.choice(TOWNS)}"
+        token = f"{rng.getrandbits(64):016x}{audit_id:x}"
+        tier = rng.choice(TIERS)
+        submitted_at = fmt_ts(submitted) if submitted else NULL
+        audits.append(
+            f"{audit_id}\t{auditor_id}\t{token}\t{status}\t{client}\t"
+            f"{client.split()[0].lower()}.{audit_id}@example.com\t{address}\t{tier}\t"
+            f"{auditor_name}\t{fmt_ts(created)}\t{submitted_at}\n"
+        )
+        scorer = scorers.get(tier)
+        if status == "pending" or scorer is None:
+            continue
+        question_ids = scorer.question_ids
+
+        # A per-audit compliance level keeps answers correlated, like real landlords
+        quality = rng.random()
+        answer_weights = (1.0 - quality, 1.0, 0.3 + 2 * quality)
+        answers = rng.choices(ANSWER_VALUES, weights=answer_weights, k=len(question_ids))
+        submitted_ts = fmt_ts(submitted)
+        responses.extend(
+            f"{audit_id}\t{qid}\t{value}\t{submitted_ts}\n" for qid, value in zip(question_ids, answers)
+        )
+        if status != "completed":
+            continue
+
+        reviewed_ts = fmt_ts(min(now, submitted + timedelta(days=rng.randint(1, 14))))
+        scores.extend(
+            f"{audit_id}\t{cat}\t{score:.2f}\t{reviewed_ts}\n" for cat, score in scorer.score(answers) if score >= 1.0
+        )
+        if rng.random() < notes_rate:
+            for qid in rng.sample(question_ids, rng.randint(1, 3)):
+                notes.append(f"{audit_id}\t{auditor_id}\t{qid}\t{rng.choice(NOTE_TEXTS)}\t{reviewed_ts}\n")
+    return audits, responses, scores, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic audit data with COPY.")
+    parser.add_argument("--dsn", default=CONN_STR, help="libpq connection string (default: POSTGRES_URL)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed, same rows (default: 42)")
+    parser.add_argument("--users", type=int, default=50, help="auditors to create (default: 50)")
+    parser.add_argument("--audits", type=int, default=40000,
+                        help="audits to create; about 80%% get one response per question (default: 40000)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="audits per COPY transaction (default: 5000)")
+    parser.add_argument("--days", type=int, default=730, help="spread audit creation over this many days")
+    parser.add_argument("--notes-rate", type=float, default=0.3, help="share of completed audits with notes")
+    parser.add_argument("--truncate", action="store_true",
+                        help="TRUNCATE users, audits, form_responses, scores and notes first (destructive)")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        print("ERROR: POSTGRES_URL environment variable is not set (or pass --dsn).")
+        exit(1)
+    if psycopg is None:
+        print("ERROR: generate-synthetic-data.py requires psycopg (pip install psycopg[binary]).")
+        exit(1)
+
+    rng = random.Random(args.seed)
+    # Audits answer and are scored on their own tier's questions, as in the app
+    scorers = {}
+    for tier in TIERS:
+        questions = [q for q in QUESTIONS if tier in q["tiers"]]
+        if questions:
+            scorers[tier] = CatalogScorer(questions)
+    # Fixed clock so the seed alone determines every timestamp
+    now = datetime(2026, 1, 1) + timedelta(days=args.seed % 365)
+
+    started = time.time()
+    totals = {"users": 0, "audits": 0, "form_responses": 0, "scores": 0, "notes": 0}
+    with psycopg.connect(args.dsn) as conn:
+        if args.truncate:
+            conn.execute("TRUNCATE users, audits, form_responses, scores, notes RESTART IDENTITY CASCADE")
+
+        print(f"=== Generating {args.users} users and {args.audits} audits (seed {args.seed}) ===")
+        users, lines = generate_users(rng, next_id(conn, "users"), args.users, now)
+        copy_lines(conn, "COPY users (id, name, email, password_hash, created_at) FROM STDIN", lines)
+        conn.execute("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))")
+        conn.commit()
+        totals["users"] = len(users)
+        # A few auditors carry most of the work, as on the real dashboard
+        auditor_weights = [1.0 / (rank + 1) for rank in range(len(users))]
+
+        first_audit_id = next_id(conn, "audits")
+        for offset in range(0, args.audits, args.chunk_size):
+            count = min(args.chunk_size, args.audits - offset)
+            audits, responses, scores, notes = generate_chunk(
+                rng, scorers, users, auditor_weights, first_audit_id + offset, count, now, args.days, args.notes_rate,
+            )
+            copy_lines(conn, "COPY audits (id, auditor_id, token, status, client_name, landlord_email, "
+                             "property_address, risk_audit_tier, conducted_by, created_at, submitted_at) FROM STDIN",
+                       audits)
+            copy_lines(conn, "COPY form_responses (audit_id, question_id, answer_value, created_at) FROM STDIN",
+                       responses)
+            copy_lines(conn, "COPY scores (audit_id, scores_category, score, created_at) FROM STDIN", scores)
+            copy_lines(conn, "COPY notes (audit_id, auditor_id, question_id, content, created_at) FROM STDIN", notes)
+            conn.execute("SELECT setval(pg_get_serial_sequence('audits', 'id'), (SELECT MAX(id) FROM audits))")
+            conn.commit()
+
+            totals["audits"] += len(audits)
+            totals["form_responses"] += len(responses)
+            totals["scores"] += len(scores)
+            totals["notes"] += len(notes)
+            elapsed = time.time() - started
+            print(f"  {totals['audits']} audits, {totals['form_responses']} responses "
+                  f"({totals['form_responses'] / elapsed * 60 / 1e6:.2f}M responses/min)")
+
+        conn.execute("ANALYZE users, audits, form_responses, scores, notes")
+        conn.commit()
+
+    elapsed = time.time() - started
+    print(f"\n=== Results: {', '.join(f'{n} {t}' for t, n in totals.items())} in {elapsed:.1f}s ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Bulk-import historical audits and their responses from CSV or JSONL.
+
+Input is read incrementally through a generator pipeline (parse -> flatten ->
+validate), so memory does not grow with file size beyond the per-audit
+bookkeeping used for validation. Valid rows are streamed into a temporary
+staging table with COPY and merged into audits and form_responses with one
+set-based INSERT ... ON CONFLICT each, in a single transaction. Rows that fail
+validation are written to a side file with the reason instead of aborting.
+Duplicate responses are caught while reading when an audit's rows are
+contiguous, and in the staging table otherwise (so not in --dry-run).
+
+Each input record is one response. CSV columns (JSONL keys) are:
+    token, client_name, property_address, risk_audit_tier, conducted_by,
+    status, landlord_email, auditor_email, created_at, submitted_at,
+    question_id, answer_value, comment
+A JSONL line may instead hold one audit with a "responses" list of
+{question_id, answer_value, comment} objects.
+
+Existing audits (same token) keep their own details; their responses are
+updated from the file and their precomputed report payloads dropped, so
+report-worker.py rebuilds them. Responses for existing completed audits are
+rejected, since their scores would no longer match.
+Requires psycopg (pip install psycopg[binary]).
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from neon_client import CONN_STR
+from question_catalog import load_catalog
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+STATUSES = {"pending", "submitted", "completed"}
+ANSWER_VALUES = {1, 5, 10}
+AUDIT_FIELDS = ["token", "client_name", "property_address", "risk_audit_tier", "conducted_by",
+                "status", "landlord_email", "auditor_email", "created_at", "submitted_at"]
+RESPONSE_FIELDS = ["question_id", "answer_value", "comment"]
+REQUIRED_FIELDS = ["token", "client_name", "property_address", "risk_audit_tier", "conducted_by", "question_id"]
+
+STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE import_staging (
+      seq INTEGER NOT NULL,
+      line_no INTEGER NOT NULL,
+      token VARCHAR(255) NOT NULL,
+      client_name VARCHAR(255) NOT NULL,
+      property_address TEXT NOT NULL,
+      risk_audit_tier VARCHAR(10) NOT NULL,
+      conducted_by VARCHAR(255) NOT NULL,
+      status VARCHAR(50) NOT NULL,
+      landlord_email VARCHAR(255),
+      auditor_id INTEGER,
+      created_at TIMESTAMP,
+      submitted_at TIMESTAMP,
+      question_id VARCHAR(50) NOT NULL,
+      answer_value INTEGER NOT NULL,
+      comment TEXT
+    ) ON COMMIT DROP
+"""
+
+STAGING_COLUMNS = ["seq", "line_no", "token", "client_name", "property_address", "risk_audit_tier",
+                   "conducted_by", "status", "landlord_email", "auditor_id", "created_at", "submitted_at",
+                   "question_id", "answer_value", "comment"]
+
+# Later rows for a response already staged, wherever they are in the file
+DUPLICATE_RESPONSES_SQL = """
+    DELETE FROM import_staging
+    WHERE seq IN (
+      SELECT seq FROM (
+        SELECT seq, row_number() OVER (PARTITION BY token, question_id ORDER BY seq) AS n
+        FROM import_staging
+      ) ranked
+      WHERE n > 1
+    )
+    RETURNING line_no, token, question_id
+"""
+
+# Completed audits are scored; changing their responses would leave the scores stale
+COMPLETED_RESPONSES_SQL = """
+    DELETE FROM import_staging s
+    USING audits a
+    WHERE a.token = s.token AND a.status = 'completed'
+    RETURNING s.line_no, s.token, s.question_id
+"""
+
+INVALIDATE_PAYLOADS_SQL = """
+    DELETE FROM audit_report_payloads p
+    USING audits a
+    WHERE p.audit_id = a.id
+      AND a.token IN (SELECT token FROM import_staging)
+"""
+
+MERGE_AUDITS_SQL = """
+    INSERT INTO audits (auditor_id, token, status, client_name, landlord_email, property_address,
+                        risk_audit_tier, conducted_by, created_at, submitted_at)
+    SELECT DISTINCT ON (token)
+           auditor_id, token, status, client_name, landlord_email, property_address,
+           risk_audit_tier, conducted_by, COALESCE(created_at, NOW()), submitted_at
+    FROM import_staging
+    ORDER BY token, line_no
+    ON CONFLICT (token) DO NOTHING
+"""
+
+MERGE_RESPONSES_SQL = """
+    INSERT INTO form_responses (audit_id, question_id, answer_value, comment, created_at)
+    SELECT a.id, s.question_id, s.answer_value, s.comment, COALESCE(s.submitted_at, s.created_at, NOW())
+    FROM import_staging s
+    JOIN audits a ON a.token = s.token
+    ON CONFLICT (audit_id, question_id)
+    DO UPDATE SET answer_value = EXCLUDED.answer_value, comment = EXCLUDED.comment
+"""
+
+
+class Rejected(Exception):
+    pass
+
+
+def read_csv(path):
+    """Yield (line_no, record) from a CSV file with a header row."""
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num, record
+
+
+def read_jsonl(path):
+    """Yield (line_no, record) from a JSONL file; unparsable lines come through as Rejected."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, Rejected(f"invalid JSON: {e}")
+                continue
+            yield line_no, record
+
+
+def flatten(records):
+    """Expand audit records with a "responses" list into one record per response."""
+    for line_no, record in records:
+        if isinstance(record, dict) and isinstance(record.get("responses"), list):
+            audit = {k: v for k, v in record.items() if k != "responses"}
+            for response in record["responses"]:
+                if isinstance(response, dict):
+                    yield line_no, {**audit, **response}
+                else:
+                    yield line_no, Rejected("response is not an object")
+        else:
+            yield line_no, record
+
+
+def parse_timestamp(value, field):
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        raise Rejected(f"{field} is not an ISO timestamp: {value!r}")
+
+
+class Validator:
+    """Checks records against the catalog, the schema constraints and each other."""
+
+    def __init__(self, catalog, auditors, default_status):
+        self.catalog = catalog
+        self.auditors = auditors
+        self.default_status = default_status
+        self.audits = {}  # token -> audit-level values seen first
+        self.token = None  # audit of the current run of rows
+        self.seen = set()  # question ids answered in that run
+        self.rejected = 0
+
+    def check(self, record):
+        """Return the staging row for a record, or raise Rejected."""
+        if isinstance(record, Rejected):
+            raise record
+        if not isinstance(record, dict):
+            raise Rejected("record is not an object")
+        values = {k: ("" if record.get(k) is None else str(record.get(k)).strip())
+                  for k in AUDIT_FIELDS + RESPONSE_FIELDS}
+        missing = [f for f in REQUIRED_FIELDS if not values[f]]
+        if missing:
+            raise Rejected(f"missing {', '.join(missing)}")
+
+        question = self.catalog.get(values["question_id"])
+        if question is None:
+            raise Rejected(f"unknown question_id {values['question_id']!r}")
+        try:
+            answer = int(values["answer_value"])
+        except ValueError:
+            answer = None
+        if answer not in ANSWER_VALUES:
+            raise Rejected(f"answer_value must be 1, 5 or 10, got {values['answer_value']!r}")
+        if values["risk_audit_tier"] not in self.catalog.by_tier:
+            raise Rejected(f"unknown risk_audit_tier {values['risk_audit_tier']!r}")
+        if values["risk_audit_tier"] not in question.tiers:
+            raise Rejected(f"question {question.id} is not part of {values['risk_audit_tier']}")
+        status = values["status"] or self.default_status
+        if status not in STATUSES:
+            raise Rejected(f"unknown status {status!r}")
+        auditor_id = None
+        if values["auditor_email"]:
+            auditor_id = self.auditors.get(values["auditor_email"].lower())
+            if auditor_id is None:
+                raise Rejected(f"no user with email {values['auditor_email']!r}")
+        created_at = parse_timestamp(values["created_at"], "created_at")
+        submitted_at = parse_timestamp(values["submitted_at"], "submitted_at")
+
+        token = values["token"]
+        audit = (values["client_name"], values["property_address"], values["risk_audit_tier"],
+                 values["conducted_by"], status, values["landlord_email"] or None, auditor_id,
+                 created_at, submitted_at)
+        first = self.audits.setdefault(token, audit)
+        if first != audit:
+            raise Rejected(f"audit fields differ from earlier rows for token {token!r}")
+        if token != self.token:
+            self.token = token
+            self.seen = set()
+        if values["question_id"] in self.seen:
+            raise Rejected(f"duplicate response for question {values['question_id']} in audit {token!r}")
+        self.seen.add(values["question_id"])
+
+        return (token, *audit[:6], auditor_id, created_at, submitted_at,
+                values["question_id"], answer, values["comment"] or None)
+
+
+def reject_staged(validator, rejects, rows, reason):
+    """Write rows removed from the staging table to `rejects`; returns how many there were."""
+    for line_no, token, question_id in rows:
+        rejects.write(json.dumps({
+            "line": line_no, "reason": reason.format(token=token, question_id=question_id),
+            "record": {"token": token, "question_id": question_id},
+        }) + "\n")
+    validator.rejected += len(rows)
+    return len(rows)
+
+
+def validated(records, validator, rejects):
+    """Yield (line_no, staging row) for valid records; write the others to `rejects`."""
+    for line_no, record in records:
+        try:
+            row = validator.check(record)
+        except Rejected as e:
+            validator.rejected += 1
+            rejects.write(json.dumps({
+                "line": line_no, "reason": str(e),
+                "record": record if isinstance(record, dict) else None,
+            }) + "\n")
+            continue
+        yield line_no, row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import historical audits from CSV or JSONL.")
+    parser.add_argument("path", help="input file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from the extension)")
+    parser.add_argument("--dsn", default=CONN_STR, help="libpq connection string (default: POSTGRES_URL)")
+    parser.add_argument("--rejects", help="where to write rejected rows (default: <path>.rejected.jsonl)")
+    parser.add_argument("--default-status", choices=sorted(STATUSES), default="completed",
+                        help="status for rows without one (default: completed)")
+    parser.add_argument("--dry-run", action="store_true", help="validate only; nothing is written to the database")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        print("ERROR: POSTGRES_URL environment variable is not set (or pass --dsn).")
+        exit(1)
+    if psycopg is None:
+        print("ERROR: import-audits.py requires psycopg (pip install psycopg[binary]).")
+        exit(1)
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    rejects_path = args.rejects or f"{os.path.splitext(args.path)[0]}.rejected.jsonl"
+    reader = read_jsonl if fmt == "jsonl" else read_csv
+
+    started = time.time()
+    print(f"=== Importing {args.path} ({fmt}) ===")
+    with psycopg.connect(args.dsn) as conn, open(rejects_path, "w", encoding="utf-8") as rejects:
+        auditors = {email.lower(): user_id for user_id, email in conn.execute("SELECT id, email FROM users")}
+        validator = Validator(load_catalog(), auditors, args.default_status)
+        rows = validated(flatten(reader(args.path)), validator, rejects)
+
+        staged = 0
+        invalidated = 0
+        if args.dry_run:
+            staged = sum(1 for _ in rows)
+        else:
+            conn.execute(STAGING_TABLE_SQL)
+            with conn.cursor().copy(f"COPY import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN") as copy:
+                for line_no, row in rows:
+                    staged += 1
+                    copy.write_row((staged, line_no, *row))
+            staged -= reject_staged(validator, rejects, conn.execute(DUPLICATE_RESPONSES_SQL).fetchall(),
+                                    "duplicate response for question {question_id} in audit {token!r}")
+            staged -= reject_staged(validator, rejects, conn.execute(COMPLETED_RESPONSES_SQL).fetchall(),
+                                    "audit {token!r} is already completed; its responses are not changed")
+            if conn.execute("SELECT to_regclass('audit_report_payloads')").fetchone()[0]:
+                invalidated = conn.execute(INVALIDATE_PAYLOADS_SQL).rowcount
+            audits = conn.execute(MERGE_AUDITS_SQL).rowcount
+            responses = conn.execute(MERGE_RESPONSES_SQL).rowcount
+            conn.commit()
+
+    rejected = validator.rejected
+    elapsed = time.time() - started
+    print(f"  Staged {staged} responses for {len(validator.audits)} audits")
+    if not args.dry_run:
+        print(f"  OK audits: {audits} inserted (existing tokens kept)")
+        print(f"  OK form_responses: {responses} inserted or updated")
+        print(f"  OK audit_report_payloads: {invalidated} dropped for recompute")
+    if rejected:
+        print(f"  FAIL {rejected} rows rejected, see {rejects_path}")
+    else:
+        os.remove(rejects_path)
+    print(f"\n=== Results: {staged} rows imported, {rejected} rejected in {elapsed:.1f}s ===")
+    if args.dry_run:
+        print("Dry run: no changes written.")
+
+
+if __name__ == "__main__":
+    main()
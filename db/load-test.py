@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""Load-test the questionnaire fetch and submit paths of a running app.
+
+Provisions --audits pending audit tokens in the database the app uses, then
+simulates concurrent landlords filling in their audit. Each respondent takes
+an unused token and does what the questionnaire page does:
+
+    GET  /api/audits/<token>
+    GET  /api/questions/for-tier/<tier>
+    POST /api/audits/<token>/submit    (one answer per question, 1/5/10)
+
+The number of active respondents follows --stages, a k6-style ramp profile
+of USERS:SECONDS steps interpolated linearly (e.g. "20:30,100:60,100:120,0:10"
+ramps to 20 users over 30s, to 100 over the next 60s, holds for 120s and
+ramps down). The run ends when the profile does or the tokens run out, and
+prints throughput and p50/p95/p99 latency per endpoint with errors broken
+down by status, 429s (lib/rate-limiter.ts) included.
+
+Provisioned audits belong to a loadtest@example.invalid auditor, have no
+landlord email (so submit sends no mail) and are deleted with --cleanup.
+Point it at a local app and database, never at production:
+
+    npm run dev &
+    python db/load-test.py --base-url http://localhost:3000 --audits 500 --stages 50:30,50:60 --cleanup
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import urllib.parse
+import uuid
+
+from neon_client import CONN_STR, run_sql
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+TIERS = ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"]
+ANSWER_VALUES = (1, 5, 10)
+ENDPOINTS = ("audit", "for-tier", "submit")
+LOADTEST_EMAIL = "loadtest@example.invalid"
+# Bcrypt-shaped placeholder; the load-test auditor cannot log in
+PASSWORD_HASH = "$2a$10$" + "l" * 53
+
+AUDITOR_SQL = """
+    INSERT INTO users (name, email, password_hash) VALUES ('Load Test', $1, $2)
+    ON CONFLICT (email) DO UPDATE SET name = EXCLUDED.name
+    RETURNING id
+"""
+
+PROVISION_SQL = """
+    INSERT INTO audits (auditor_id, token, status, client_name, property_address, risk_audit_tier, conducted_by)
+    SELECT $1, a->>'token', 'pending', 'Load Test', a->>'address', a->>'tier', 'Load Test'
+    FROM jsonb_array_elements($2::jsonb) AS a
+"""
+
+CLEANUP_SQL = "DELETE FROM audits WHERE token LIKE $1"
+
+
+def parse_stages(spec):
+    """"20:30,100:60" -> [(20, 30.0), (100, 60.0)]."""
+    stages = []
+    for part in spec.split(","):
+        users, _, seconds = part.strip().partition(":")
+        try:
+            stages.append((int(users), float(seconds)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid stage {part!r}, expected USERS:SECONDS")
+        if stages[-1][0] < 0 or stages[-1][1] <= 0:
+            raise argparse.ArgumentTypeError(f"invalid stage {part!r}")
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Respondents that should be active `elapsed` seconds in; None once the profile is over."""
+    start_users = 0
+    start = 0.0
+    for users, seconds in stages:
+        if elapsed < start + seconds:
+            return int(round(start_users + (users - start_users) * (elapsed - start) / seconds))
+        start_users = users
+        start += seconds
+    return None
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpConnection:
+    """Minimal HTTP/1.1 keep-alive client on asyncio streams (JSON in, JSON out)."""
+
+    def __init__(self, base_url, timeout):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.secure = parsed.scheme == "https"
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if self.secure else 80)
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Return (status, parsed JSON or None); reconnects once if a kept-alive connection was dropped."""
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                return await asyncio.wait_for(self._request(method, path, body, headers), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                if not reused or attempt:
+                    raise HttpError(f"connection failed: {e}")
+            except asyncio.TimeoutError:
+                await self.close()
+                raise HttpError("timeout")
+
+    async def _request(self, method, path, body, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.secure or None)
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                 "Accept: application/json", f"Content-Length: {len(data)}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+        await self.writer.drain()
+
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        elif "content-length" in response_headers:
+            payload = await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            payload = await self.reader.read()
+            response_headers["connection"] = "close"
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+
+class Stats:
+    """Latencies and outcomes per endpoint."""
+
+    def __init__(self):
+        self.latencies = {name: [] for name in ENDPOINTS}
+        self.errors = {name: {} for name in ENDPOINTS}
+        self.completed = 0
+        self.abandoned = 0
+
+    def record(self, endpoint, started, outcome):
+        """outcome is an HTTP status or an error label; only 2xx counts as success."""
+        elapsed = time.perf_counter() - started
+        if isinstance(outcome, int) and 200 <= outcome < 300:
+            self.latencies[endpoint].append(elapsed)
+        else:
+            self.errors[endpoint][outcome] = self.errors[endpoint].get(outcome, 0) + 1
+
+
+async def call(conn, stats, endpoint, method, path, body=None, headers=None):
+    started = time.perf_counter()
+    try:
+        status, data = await conn.request(method, path, body, headers)
+    except HttpError as e:
+        stats.record(endpoint, started, str(e).split(":")[0])
+        return None
+    stats.record(endpoint, started, status)
+    return data if 200 <= status < 300 else None
+
+
+async def respond(conn, stats, token, rng, headers):
+    """One landlord filling in one audit; returns True if the submit succeeded."""
+    data = await call(conn, stats, "audit", "GET", f"/api/audits/{token}", headers=headers)
+    if not data or "audit" not in data:
+        return False
+    tier = data["audit"]["risk_audit_tier"]
+    data = await call(conn, stats, "for-tier", "GET", f"/api/questions/for-tier/{tier}", headers=headers)
+    if not data or not data.get("questions"):
+        return False
+    responses = []
+    for q in data["questions"]:
+        values = [o["value"] for o in q.get("options") or [] if o.get("value") in ANSWER_VALUES]
+        responses.append({"question_id": q["id"], "answer_value": rng.choice(values or ANSWER_VALUES)})
+    data = await call(conn, stats, "submit", "POST", f"/api/audits/{token}/submit",
+                      {"responses": responses}, headers)
+    return data is not None
+
+
+async def respondent(index, args, stages, tokens, stats, started):
+    rng = random.Random(args.seed * 100003 + index)
+    # Distinct client addresses, so per-IP limits apply per respondent rather than to the whole run
+    headers = {"X-Forwarded-For": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"} \
+        if args.distinct_ips else None
+    conn = HttpConnection(args.base_url, args.timeout)
+    try:
+        while True:
+            target = target_users(stages, time.perf_counter() - started)
+            if target is None:
+                return
+            if index >= target:
+                await asyncio.sleep(0.1)
+                continue
+            if not tokens:
+                return
+            if await respond(conn, stats, tokens.pop(), rng, headers):
+                stats.completed += 1
+            else:
+                stats.abandoned += 1
+            if args.think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+    finally:
+        await conn.close()
+
+
+async def reporter(stats, stages, started, interval):
+    while True:
+        await asyncio.sleep(interval)
+        elapsed = time.perf_counter() - started
+        errors = sum(sum(e.values()) for e in stats.errors.values())
+        print(f"  {elapsed:6.1f}s  {target_users(stages, elapsed) or 0:>4} users  "
+              f"{stats.completed:>6} submitted  {errors:>5} errors")
+
+
+async def run(args, stages, tokens):
+    stats = Stats()
+    started = time.perf_counter()
+    max_users = max(users for users, _ in stages)
+    progress = asyncio.create_task(reporter(stats, stages, started, args.report_interval))
+    try:
+        await asyncio.gather(*(respondent(i, args, stages, tokens, stats, started) for i in range(max_users)))
+    finally:
+        progress.cancel()
+    return stats, time.perf_counter() - started
+
+
+def provision(count, tiers, batch_size):
+    """Create `count` pending audits; returns (token prefix, tokens)."""
+    auditor_id = run_sql(AUDITOR_SQL, [LOADTEST_EMAIL, PASSWORD_HASH])["rows"][0]["id"]
+    prefix = f"loadtest-{uuid.uuid4().hex[:8]}-"
+    tokens = [f"{prefix}{i:06d}" for i in range(count)]
+    for start in range(0, count, batch_size):
+        batch = [{"token": t, "tier": tiers[i % len(tiers)], "address": f"{i + 1} Load Test Road"}
+                 for i, t in enumerate(tokens[start:start + batch_size], start)]
+        run_sql(PROVISION_SQL, [auditor_id, json.dumps(batch)])
+    return prefix, tokens
+
+
+def print_report(stats, elapsed):
+    print(f"\n=== Results: {stats.completed} audits submitted, {stats.abandoned} abandoned "
+          f"in {elapsed:.1f}s ({stats.completed / elapsed:.1f} audits/s) ===")
+    print(f"{'endpoint':<10} {'ok':>7} {'req/s':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  errors")
+    for name in ENDPOINTS:
+        latencies = stats.latencies[name]
+        errors = stats.errors[name]
+        ms = [f"{percentile(latencies, p) * 1000:7.1f}ms" for p in (50, 95, 99, 100)]
+        detail = ", ".join(f"{k}: {v}" for k, v in sorted(errors.items(), key=lambda kv: str(kv[0]))) or "-"
+        print(f"{name:<10} {len(latencies):>7} {len(latencies) / elapsed:>7.1f} {' '.join(ms)}  {detail}")
+    throttled = sum(e.get(429, 0) for e in stats.errors.values())
+    if throttled:
+        print(f"  FAIL {throttled} requests rate limited (429)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the questionnaire fetch and submit endpoints.")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="app URL (default: http://localhost:3000)")
+    parser.add_argument("--audits", type=int, default=200, help="audit tokens to provision (default: 200)")
+    parser.add_argument("--tier", choices=TIERS, help="provision every audit with this tier (default: spread)")
+    parser.add_argument("--stages", type=parse_stages, default=parse_stages("10:10,50:30,50:60"),
+                        help="ramp profile as USERS:SECONDS,... (default: 10:10,50:30,50:60)")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause in seconds between a respondent's audits (default: 0)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds (default: 30)")
+    parser.add_argument("--distinct-ips", action="store_true",
+                        help="send a distinct X-Forwarded-For per respondent")
+    parser.add_argument("--report-interval", type=float, default=5.0,
+                        help="seconds between progress lines (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for answers (default: 1)")
+    parser.add_argument("--cleanup", action="store_true", help="delete the provisioned audits afterwards")
+    args = parser.parse_args()
+    if args.audits < 1:
+        parser.error("--audits must be at least 1")
+
+    tiers = [args.tier] if args.tier else TIERS
+    print(f"=== Provisioning {args.audits} audits ===")
+    prefix, tokens = provision(args.audits, tiers, 1000)
+    print(f"  OK tokens {prefix}*")
+    tokens.reverse()  # respondents pop from the end; use them in order
+
+    total = sum(seconds for _, seconds in args.stages)
+    print(f"\n=== Load test against {args.base_url}: up to {max(u for u, _ in args.stages)} users "
+          f"over {total:.0f}s ===")
+    try:
+        stats, elapsed = asyncio.run(run(args, args.stages, tokens))
+        print_report(stats, elapsed)
+    finally:
+        if args.cleanup:
+            res = run_sql(CLEANUP_SQL, [prefix + "%"])
+            print(f"\nCleanup: {res.get('rowCount', 0)} audits deleted")
+
+
+if __name__ == "__main__":
+    main()
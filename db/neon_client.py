@@ -0,0 +1,515 @@
+"""Shared Neon SQL-over-HTTP client for the Python DB tooling.
+
+Keeps a small pool of persistent HTTP/1.1 keep-alive connections to the Neon
+pooler, so statements after the first one skip the TCP + TLS handshake.
+
+Set DB_TRANSPORT=postgres to connect to POSTGRES_URL over the Postgres wire
+protocol instead, with prepared statements and pipelined batches
+(see pg_transport.py).
+
+Statements go to the database configured by the environment unless a
+Target is active (see use_target()), which lets one process work against
+several databases at once, each with its own transport and pool.
+
+Requests to each target pass through an AdaptiveLimiter, which caps the
+requests in flight and tunes the cap AIMD-style: it grows while latency
+stays near the best observed and is cut when the database throttles,
+refuses connections or slows down. Requests the database rejected without
+running them (429/503, connection limits, serialization failures) are
+retried with jittered exponential backoff, honouring Retry-After; requests
+that may have run (timeouts, 502/504, dropped connections) are only
+retried when idempotent: read-only batches, plain SELECTs, or calls made
+with idempotent=True. get_metrics() reports the current limit and the
+retry counts.
+"""
+import contextlib
+import contextvars
+import email.utils
+import http.client
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+
+# Overridable so the tools can target a local stand-in (see neon_standin.py)
+NEON_URL = os.environ.get("NEON_URL", "https://ep-icy-violet-abk4m75a-pooler.eu-west-2.aws.neon.tech/sql")
+CONN_STR = os.environ.get("POSTGRES_URL")
+TRANSPORT = os.environ.get("DB_TRANSPORT", "http")
+TRANSPORTS = ("http", "postgres")
+
+# Errors raised when the server has dropped an idle keep-alive connection
+RETRYABLE_ERRORS = (
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+    http.client.RemoteDisconnected,
+)
+MAX_RETRIES = 2
+TIMEOUT = 30
+
+# Adaptive concurrency (per target); DB_MAX_CONCURRENCY caps the limit
+INITIAL_LIMIT = 8
+MAX_LIMIT = int(os.environ.get("DB_MAX_CONCURRENCY", "64"))
+THROTTLE_DECREASE = 0.5  # limit multiplier when the database pushes back
+LATENCY_DECREASE = 0.9  # limit multiplier when recent latency climbs past LATENCY_TOLERANCE x baseline
+LATENCY_TOLERANCE = 2.0
+RECENT_WEIGHT = 0.3  # EWMA weight of the recent latency
+BASELINE_WEIGHT = 0.02  # the baseline follows faster requests at RECENT_WEIGHT, slower ones at this
+MIN_SLOW_LATENCY = 0.05  # seconds; faster requests never count as slow
+
+# Retries of failed requests
+RETRY_ATTEMPTS = int(os.environ.get("DB_RETRY_ATTEMPTS", "4"))
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 10.0
+RETRY_AFTER_CAP = 60.0
+
+# Failures where the database did not run the request (or rolled it back)
+THROTTLE_STATUSES = {429, 503}
+AMBIGUOUS_STATUSES = {502, 504}
+THROTTLE_MESSAGES = re.compile(
+    r"too many (connections|clients)|remaining connection slots|connection limit|rate limit"
+    r"|couldn't connect to compute node|the database system is (starting up|shutting down)",
+    re.IGNORECASE,
+)
+CONFLICT_MESSAGES = re.compile(r"could not serialize access|deadlock detected", re.IGNORECASE)
+READ_ONLY_STATEMENT = re.compile(r"^\s*(SELECT|SHOW)\b", re.IGNORECASE)
+
+ISOLATION_LEVELS = ("Serializable", "RepeatableRead", "ReadCommitted", "ReadUncommitted")
+
+
+# Timings are in seconds; server_time comes from a `Server-Timing: db;dur=<ms>`
+# response header when the endpoint sends one, else None; retry_after is the
+# Retry-After header in seconds, if any
+HttpResult = namedtuple("HttpResult", "status payload wait read server_time retry_after", defaults=(None,))
+
+# A database to send statements to; url is only used by the http transport
+Target = namedtuple("Target", "name conn_str url transport")
+
+
+def parse_server_timing(header):
+    """Extract the `db` duration (in seconds) from a Server-Timing header."""
+    for metric in (header or "").split(","):
+        name, _, params = metric.strip().partition(";")
+        if name.strip() != "db":
+            continue
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                try:
+                    return float(value) / 1000
+                except ValueError:
+                    return None
+    return None
+
+
+def parse_retry_after(header):
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None."""
+    if not header:
+        return None
+    try:
+        return max(0.0, float(header))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(header).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class NeonError(Exception):
+    """Raised when the database rejects a query; status is None on the Postgres transport."""
+
+    def __init__(self, status, message):
+        super().__init__(f"HTTP {status}: {message}" if status is not None else message)
+        self.status = status
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTPS connections to one host."""
+
+    def __init__(self, url, max_idle=8, timeout=TIMEOUT):
+        parsed = urllib.parse.urlsplit(url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.path = parsed.path or "/"
+        self.secure = parsed.scheme == "https"
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context() if self.secure else None
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.secure:
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def post(self, body, headers):
+        """POST a JSON body and return an HttpResult.
+
+        A connection reset on a pooled connection is retried on a fresh one;
+        the request never reached the server's SQL layer in that case.
+        """
+        data = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json", **headers}
+        for attempt in range(MAX_RETRIES + 1):
+            conn = self.acquire()
+            try:
+                started = time.perf_counter()
+                conn.request("POST", self.path, body=data, headers=headers)
+                resp = conn.getresponse()
+                received = time.perf_counter()
+                payload = resp.read()
+                finished = time.perf_counter()
+            except RETRYABLE_ERRORS:
+                conn.close()
+                if attempt == MAX_RETRIES:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self.release(conn)
+            return HttpResult(
+                resp.status, payload, received - started, finished - received,
+                parse_server_timing(resp.getheader("Server-Timing")),
+                parse_retry_after(resp.getheader("Retry-After")),
+            )
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the requests in flight to one target, with request and retry counters."""
+
+    def __init__(self, initial=INITIAL_LIMIT, maximum=MAX_LIMIT):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(initial, self.maximum))
+        self.in_flight = 0
+        self.recent = None  # latency EWMA over the last few requests
+        self.baseline = None  # lower envelope of latency: what a request costs without queueing
+        self.last_decrease = 0.0
+        self.counters = {"requests": 0, "errors": 0, "retries": 0, "gave_up": 0, "decreases": 0}
+        self.retry_reasons = {}
+        self.peak_limit = self.limit
+        self._cond = threading.Condition()
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify()
+
+    def observe(self, latency, signal):
+        """Adjust the limit after a request; signal is None on success, else classify()'s result."""
+        with self._cond:
+            self.counters["requests"] += 1
+            if signal is not None:
+                self.counters["errors"] += 1
+            if signal in ("throttled", "ambiguous"):
+                self._decrease(THROTTLE_DECREASE)
+            elif signal is None:
+                if self.baseline is None:
+                    self.recent = self.baseline = latency
+                else:
+                    self.recent += (latency - self.recent) * RECENT_WEIGHT
+                    weight = RECENT_WEIGHT if latency < self.baseline else BASELINE_WEIGHT
+                    self.baseline += (latency - self.baseline) * weight
+                if self.recent > max(MIN_SLOW_LATENCY, self.baseline * LATENCY_TOLERANCE):
+                    self._decrease(LATENCY_DECREASE)
+                elif self.in_flight + 1 >= self.limit / 2:
+                    # +1 per `limit` successful requests, i.e. about one step per round trip;
+                    # only while the limit is actually in use, so idle headroom does not pile up
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                    self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def _decrease(self, ratio):
+        # One cut per congestion event, not one per request that was in flight during it
+        now = time.monotonic()
+        if now - self.last_decrease < max(0.05, 2 * (self.baseline or 0.0)):
+            return
+        self.last_decrease = now
+        self.limit = max(1.0, self.limit * ratio)
+        self.counters["decreases"] += 1
+
+    def record_retry(self, reason):
+        with self._cond:
+            self.counters["retries"] += 1
+            self.retry_reasons[reason] = self.retry_reasons.get(reason, 0) + 1
+
+    def record_gave_up(self):
+        with self._cond:
+            self.counters["gave_up"] += 1
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "peak_limit": int(self.peak_limit),
+                "in_flight": self.in_flight,
+                "baseline_ms": round(self.baseline * 1000, 3) if self.baseline is not None else None,
+                **self.counters,
+                "retry_reasons": dict(self.retry_reasons),
+            }
+
+
+def classify(resp, error):
+    """Why a request failed, for retries and the limiter.
+
+    Returns None (success or not retryable), "throttled" (pushed back before
+    running: retry and slow down), "conflict" (rolled back by a serialization
+    failure or deadlock: retry) or "ambiguous" (may have run: retry only if
+    idempotent, and slow down).
+    """
+    if error is None:
+        return None
+    message = str(error)
+    status = resp.status if resp is not None else None
+    if status in THROTTLE_STATUSES or THROTTLE_MESSAGES.search(message):
+        return "throttled"
+    if CONFLICT_MESSAGES.search(message):
+        return "conflict"
+    if isinstance(error, NeonError):
+        return "ambiguous" if status in AMBIGUOUS_STATUSES else None
+    if isinstance(error, ConnectionRefusedError):
+        return "throttled"
+    if isinstance(error, (TimeoutError, ConnectionError, http.client.HTTPException)):
+        return "ambiguous"
+    return None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RETRY_AFTER_CAP))
+    return delay
+
+
+class HttpTransport:
+    """Sends statements to the Neon SQL-over-HTTP endpoint."""
+
+    name = "http"
+
+    def __init__(self, url, conn_str):
+        self.pool = ConnectionPool(url)
+        self.conn_str = conn_str
+
+    def send(self, statements, transaction=None):
+        """Run statements; returns (HttpResult, results, error).
+
+        With `transaction` None, `statements` holds a single statement sent as
+        a plain query. Otherwise it is a dict of batch options and all
+        statements run in one transaction.
+        """
+        headers = {"Neon-Connection-String": self.conn_str}
+        queries = []
+        for query, params in statements:
+            item = {"query": query}
+            if params:
+                item["params"] = params
+            queries.append(item)
+
+        if transaction is None:
+            body = queries[0]
+        else:
+            body = {"queries": queries}
+            if transaction.get("isolation_level"):
+                headers["Neon-Batch-Isolation-Level"] = transaction["isolation_level"]
+            if transaction.get("read_only"):
+                headers["Neon-Batch-Read-Only"] = "true"
+            if transaction.get("deferrable"):
+                headers["Neon-Batch-Deferrable"] = "true"
+
+        resp = self.pool.post(body, headers)
+        try:
+            result = _decode(resp.status, resp.payload)
+        except NeonError as e:
+            return resp, None, e
+        return resp, [result] if transaction is None else result["results"], None
+
+
+_transports = {}
+_transport_lock = threading.Lock()
+_tracer = None
+_target = contextvars.ContextVar("neon_target", default=None)
+
+
+def set_tracer(tracer):
+    """Install an object whose record(statements, http_result, results, error, elapsed) sees every attempt.
+
+    http_result is None when the attempt failed before a response arrived.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def default_target():
+    """The database configured by POSTGRES_URL, NEON_URL and DB_TRANSPORT."""
+    return Target("default", CONN_STR, NEON_URL, TRANSPORT)
+
+
+def current_target():
+    return _target.get() or default_target()
+
+
+@contextlib.contextmanager
+def use_target(target):
+    """Send statements made in this context (thread or task) to `target`.
+
+    Threads started inside the block do not inherit it; submit their work
+    through contextvars.copy_context().run.
+    """
+    token = _target.set(target)
+    try:
+        yield target
+    finally:
+        _target.reset(token)
+
+
+def check_transport(name):
+    """Raise ValueError unless `name` is a transport that can be used here."""
+    if name not in TRANSPORTS:
+        raise ValueError(f"unknown transport '{name}' (expected {' or '.join(TRANSPORTS)})")
+    if name == "postgres":
+        import pg_transport
+        if pg_transport.pq is None:
+            raise ValueError("the postgres transport requires psycopg (pip install psycopg[binary])")
+
+
+def get_transport():
+    """Return the transport of the current target (http or postgres), created on first use.
+
+    Raises ValueError if the target's transport is unknown or unavailable.
+    """
+    target = current_target()
+    with _transport_lock:
+        transport = _transports.get(target)
+        if transport is None:
+            check_transport(target.transport)
+            if target.transport == "http":
+                transport = HttpTransport(target.url, target.conn_str)
+            else:
+                import pg_transport
+                transport = pg_transport.PostgresTransport(target.conn_str)
+            transport.limiter = AdaptiveLimiter()
+            _transports[target] = transport
+        return transport
+
+
+def get_pool():
+    """Connection pool of the active transport; its max_idle bounds kept-open connections."""
+    return get_transport().pool
+
+
+def get_metrics():
+    """Adaptive limit and request/retry counters of the current target."""
+    return get_transport().limiter.metrics()
+
+
+def is_idempotent(statements, transaction):
+    if transaction is not None and transaction.get("read_only"):
+        return True
+    return all(READ_ONLY_STATEMENT.match(query) for query, _ in statements)
+
+
+def _send(statements, transaction=None, idempotent=False):
+    """Send one request on the active transport, retrying transient failures.
+
+    Every attempt is reported to the tracer if one is installed.
+    """
+    transport = get_transport()
+    limiter = transport.limiter
+    idempotent = idempotent or is_idempotent(statements, transaction)
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        with limiter.slot():
+            started = time.perf_counter()
+            try:
+                resp, results, error = transport.send(statements, transaction)
+            except (OSError, http.client.HTTPException) as e:
+                resp, results, error = None, None, e
+            elapsed = time.perf_counter() - started
+        if _tracer:
+            _tracer.record(statements, resp, results, error, elapsed)
+        signal = classify(resp, error)
+        limiter.observe(elapsed, signal)
+        if error is None:
+            return results
+        retryable = signal in ("throttled", "conflict") or (signal == "ambiguous" and idempotent)
+        if not retryable or attempt == RETRY_ATTEMPTS:
+            if retryable:
+                limiter.record_gave_up()
+            raise error
+        limiter.record_retry(signal)
+        time.sleep(backoff_delay(attempt, resp.retry_after if resp is not None else None))
+
+
+def _decode(status, payload):
+    try:
+        result = json.loads(payload)
+    except ValueError:
+        result = None
+    if status >= 400:
+        message = result.get("message") if isinstance(result, dict) else payload.decode("utf-8", "replace")
+        raise NeonError(status, message)
+    return result
+
+
+def run_sql(query, params=None, idempotent=False):
+    """Run one statement; pass idempotent=True if running it twice is harmless."""
+    return _send([(query, params)], idempotent=idempotent)[0]
+
+
+def run_sql_batch(statements, isolation_level=None, read_only=False, deferrable=False, idempotent=False):
+    """Run several statements in one request, inside a single transaction.
+
+    `statements` is a list of `(query, params)` tuples; params may be None.
+    Returns one result per statement, in order. If any statement fails the
+    whole transaction is rolled back and NeonError is raised. Pass
+    idempotent=True if running the whole batch twice is harmless, so it can
+    be retried after a timeout.
+    """
+    if isolation_level and isolation_level not in ISOLATION_LEVELS:
+        raise ValueError(f"Unknown isolation level: {isolation_level}")
+    transaction = {"isolation_level": isolation_level, "read_only": read_only, "deferrable": deferrable}
+    return _send(list(statements), transaction, idempotent)
+
+
+def with_archive(table):
+    """`table`_all, the view over live and archived rows (db/add-response-archive.sql), if it exists; else `table`."""
+    view = f"{table}_all"
+    present = run_sql("SELECT to_regclass($1) IS NOT NULL AS present", [view])["rows"][0]["present"]
+    return view if present else table
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Neon SQL-over-HTTP endpoint, backed by a local Postgres.
+
+Speaks the same /sql protocol as the Neon pooler (single {"query", "params"}
+requests and {"queries": [...]} transactions, JSON-typed rows out), with an
+optional injected latency per request and a Server-Timing header carrying
+the database execution time, so the DB tooling can be benchmarked
+and run in CI without touching Neon. Point the tools at it with
+NEON_URL=http://127.0.0.1:<port>/sql. Requires psycopg (pip install psycopg[binary]).
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pg_transport import ISOLATION_SQL, encode_param, error_message, neon_result, pq
+
+
+class QueryError(Exception):
+    pass
+
+
+class Backend:
+    """One libpq connection, used by a single HTTP keep-alive connection."""
+
+    def __init__(self, dsn):
+        self.conn = pq.PGconn.connect(dsn.encode("utf-8"))
+        if self.conn.status != pq.ConnStatus.OK:
+            raise RuntimeError(self.conn.error_message.decode("utf-8", "replace"))
+
+    def execute(self, query, params=None):
+        """Run one statement and return it in Neon's result shape, plus server time."""
+        started = time.perf_counter()
+        res = self.conn.exec_params(query.encode("utf-8"), [encode_param(p) for p in params or []])
+        elapsed = time.perf_counter() - started
+        if res.status not in (pq.ExecStatus.TUPLES_OK, pq.ExecStatus.COMMAND_OK):
+            raise QueryError(error_message(res))
+        return neon_result(res), elapsed
+
+    def simple(self, sql):
+        res = self.conn.exec_(sql.encode("utf-8"))
+        if res.status not in (pq.ExecStatus.TUPLES_OK, pq.ExecStatus.COMMAND_OK):
+            raise QueryError(error_message(res))
+
+    def close(self):
+        self.conn.finish()
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, dsn, latency=0.0):
+        super().__init__(address, StandinHandler)
+        self.dsn = dsn
+        self.latency = latency
+        self.stats = []
+        self._stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/sql"
+
+    def record(self, request_time, statement_times):
+        with self._stats_lock:
+            self.stats.append((request_time, statement_times))
+
+    def reset_stats(self):
+        with self._stats_lock:
+            stats, self.stats = self.stats, []
+        return stats
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.backend = None
+
+    def finish(self):
+        if self.backend is not None:
+            self.backend.close()
+        super().finish()
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, server_time=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if server_time is not None:
+            self.send_header("Server-Timing", f"db;dur={server_time * 1000:.3f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        if self.backend is None:
+            self.backend = Backend(self.server.dsn)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        statement_times = []
+        try:
+            if "queries" in body:
+                result = {"results": self.run_batch(body["queries"], statement_times)}
+            else:
+                result, elapsed = self.backend.execute(body["query"], body.get("params"))
+                statement_times.append(elapsed)
+        except QueryError as e:
+            self.send_json(400, {"message": str(e)}, sum(statement_times))
+            return
+        finally:
+            self.server.record(time.perf_counter() - started, statement_times)
+        self.send_json(200, result, sum(statement_times))
+
+    def run_batch(self, queries, statement_times):
+        begin = "BEGIN"
+        level = self.headers.get("Neon-Batch-Isolation-Level")
+        if level:
+            begin += f" ISOLATION LEVEL {ISOLATION_SQL[level]}"
+        if self.headers.get("Neon-Batch-Read-Only") == "true":
+            begin += " READ ONLY"
+        if self.headers.get("Neon-Batch-Deferrable") == "true":
+            begin += " DEFERRABLE"
+
+        self.backend.simple(begin)
+        results = []
+        try:
+            for q in queries:
+                result, elapsed = self.backend.execute(q["query"], q.get("params"))
+                statement_times.append(elapsed)
+                results.append(result)
+        except QueryError:
+            self.backend.simple("ROLLBACK")
+            raise
+        self.backend.simple("COMMIT")
+        return results
+
+
+def start_server(dsn, host="127.0.0.1", port=0, latency=0.0):
+    """Start a stand-in server in a background thread and return it."""
+    if pq is None:
+        raise RuntimeError("the Neon stand-in requires psycopg (pip install psycopg[binary])")
+    server = StandinServer((host, port), dsn, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Neon /sql protocol on top of a local Postgres.")
+    parser.add_argument("--dsn", required=True, help="libpq connection string of the local Postgres")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every request")
+    args = parser.parse_args()
+
+    if pq is None:
+        print("ERROR: neon_standin.py requires psycopg (pip install psycopg[binary]).")
+        exit(1)
+
+    server = StandinServer((args.host, args.port), args.dsn, args.latency_ms / 1000)
+    print(f"Neon stand-in listening on {server.url} (latency {args.latency_ms:.0f} ms)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
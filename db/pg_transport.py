@@ -0,0 +1,230 @@
+"""Direct PostgreSQL transport for neon_client, used when DB_TRANSPORT=postgres.
+
+Connects with libpq to POSTGRES_URL instead of going through the SQL-over-HTTP
+endpoint. Every statement runs as a server-side prepared statement (parsed once
+per connection, then only bound and executed), and each run_sql/run_sql_batch
+call is sent as a single libpq pipeline, so a batch costs one round trip no
+matter how many statements it has. Results come back in the same JSON-typed
+shape as the Neon endpoint, so callers cannot tell the transports apart.
+
+Works against Neon's direct or pooled endpoint (PgBouncer supports protocol
+level prepared statements) and against a plain local Postgres in CI.
+Requires psycopg (pip install psycopg[binary]).
+"""
+import hashlib
+import json
+import threading
+import time
+
+from neon_client import HttpResult, NeonError
+
+try:
+    from psycopg import pq
+except ImportError:
+    pq = None
+
+# Postgres type OIDs that Neon returns as JSON values rather than strings
+BOOL_OID = 16
+INT_OIDS = {21, 23}
+FLOAT_OIDS = {700, 701}
+JSON_OIDS = {114, 3802}
+
+ISOLATION_SQL = {
+    "Serializable": "SERIALIZABLE",
+    "RepeatableRead": "REPEATABLE READ",
+    "ReadCommitted": "READ COMMITTED",
+    "ReadUncommitted": "READ UNCOMMITTED",
+}
+
+
+def error_message(res):
+    """Primary error message, as Neon reports it in {"message": ...}."""
+    primary = res.error_field(pq.DiagnosticField.MESSAGE_PRIMARY)
+    return (primary or res.error_message).decode("utf-8", "replace").strip()
+
+
+def encode_param(value):
+    """Encode a JSON param as Postgres text input, the way Neon does."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).encode("utf-8")
+    return str(value).encode("utf-8")
+
+
+def decode_value(raw, oid):
+    if raw is None:
+        return None
+    text = raw.decode("utf-8")
+    if oid == BOOL_OID:
+        return text == "t"
+    if oid in INT_OIDS:
+        return int(text)
+    if oid in FLOAT_OIDS:
+        return float(text)
+    if oid in JSON_OIDS:
+        return json.loads(text)
+    return text
+
+
+def neon_result(res):
+    """Convert a successful libpq result to Neon's {command, rowCount, rows, fields} shape."""
+    fields = [{"name": res.fname(i).decode("utf-8"), "dataTypeID": res.ftype(i)} for i in range(res.nfields)]
+    rows = [
+        {f["name"]: decode_value(res.get_value(r, i), f["dataTypeID"]) for i, f in enumerate(fields)}
+        for r in range(res.ntuples)
+    ]
+    command = res.command_status.decode("utf-8").split(" ")[0] if res.command_status else ""
+    return {
+        "command": command,
+        "rowCount": res.command_tuples if res.command_tuples is not None else len(rows),
+        "rows": rows,
+        "fields": fields,
+    }
+
+
+def begin_statement(transaction):
+    begin = "BEGIN"
+    if transaction.get("isolation_level"):
+        begin += f" ISOLATION LEVEL {ISOLATION_SQL[transaction['isolation_level']]}"
+    if transaction.get("read_only"):
+        begin += " READ ONLY"
+    if transaction.get("deferrable"):
+        begin += " DEFERRABLE"
+    return begin
+
+
+def statement_name(query):
+    return b"nc_" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:20].encode("ascii")
+
+
+class PipelineConnection:
+    """One libpq connection kept in pipeline mode, with its prepared statements."""
+
+    def __init__(self, dsn):
+        self.conn = pq.PGconn.connect(dsn.encode("utf-8"))
+        if self.conn.status != pq.ConnStatus.OK:
+            message = self.conn.error_message.decode("utf-8", "replace").strip()
+            self.conn.finish()
+            raise ConnectionError(message)
+        self.conn.enter_pipeline_mode()
+        self.prepared = set()
+
+    @property
+    def broken(self):
+        return self.conn.status != pq.ConnStatus.OK
+
+    def _next_result(self):
+        """Return the next command result and consume the NULL that ends it."""
+        res = self.conn.get_result()
+        if res is None:
+            raise ConnectionError(self.conn.error_message.decode("utf-8", "replace").strip() or "connection lost")
+        if res.status != pq.ExecStatus.PIPELINE_SYNC:
+            self.conn.get_result()
+        return res
+
+    def run(self, statements, begin=None):
+        """Send statements as one pipeline and return (results, error message or None).
+
+        Statements not yet prepared on this connection are parsed in the same
+        pipeline, ahead of their first execution. With `begin`, the pipeline is
+        wrapped in BEGIN ... COMMIT and rolled back if any statement fails.
+        """
+        conn = self.conn
+        queued = []  # (kind, name) per command sent, in order
+        if begin:
+            conn.send_query_params(begin.encode("utf-8"), None)
+            queued.append(("control", None))
+        for query, params in statements:
+            name = statement_name(query)
+            if name not in self.prepared and not any(q == ("prepare", name) for q in queued):
+                conn.send_prepare(name, query.encode("utf-8"))
+                queued.append(("prepare", name))
+            conn.send_query_prepared(name, [encode_param(p) for p in params or []])
+            queued.append(("statement", name))
+        if begin:
+            conn.send_query_params(b"COMMIT", None)
+            queued.append(("control", None))
+        conn.pipeline_sync()
+
+        results = []
+        error = None
+        for kind, name in queued:
+            res = self._next_result()
+            if res.status in (pq.ExecStatus.TUPLES_OK, pq.ExecStatus.COMMAND_OK):
+                if kind == "prepare":
+                    self.prepared.add(name)
+                elif kind == "statement":
+                    results.append(neon_result(res))
+            elif res.status != pq.ExecStatus.PIPELINE_ABORTED and error is None:
+                error = error_message(res)
+        self._next_result()  # PIPELINE_SYNC
+
+        if conn.transaction_status == pq.TransactionStatus.INERROR:
+            conn.send_query_params(b"ROLLBACK", None)
+            conn.pipeline_sync()
+            self._next_result()
+            self._next_result()
+        return results, error
+
+    def close(self):
+        self.conn.finish()
+
+
+class PipelinePool:
+    """Thread-safe pool of pipeline connections to one database."""
+
+    def __init__(self, dsn, max_idle=8):
+        self.dsn = dsn
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return PipelineConnection(self.dsn)
+
+    def release(self, conn):
+        with self._lock:
+            if not conn.broken and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class PostgresTransport:
+    """neon_client transport that talks the Postgres wire protocol directly."""
+
+    name = "postgres"
+
+    def __init__(self, dsn):
+        self.pool = PipelinePool(dsn)
+
+    def send(self, statements, transaction=None):
+        """Run statements; returns (HttpResult, results, error) like HttpTransport.send().
+
+        The HttpResult carries the round-trip time as `wait`; there is no
+        payload or Server-Timing split on this transport.
+        """
+        conn = self.pool.acquire()
+        started = time.perf_counter()
+        try:
+            results, message = conn.run(statements, begin_statement(transaction) if transaction is not None else None)
+        except Exception:
+            conn.close()
+            raise
+        elapsed = time.perf_counter() - started
+        self.pool.release(conn)
+        if message is not None:
+            return HttpResult(400, b"", elapsed, 0.0, None), None, NeonError(None, message)
+        return HttpResult(200, b"", elapsed, 0.0, None), results, None
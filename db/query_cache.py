@@ -0,0 +1,77 @@
+"""On-disk cache for read-only catalog queries.
+
+Entries are keyed by query text plus parameters and are only served while
+they are younger than the TTL and were stored under the same catalog
+fingerprint, so any write to the question tables invalidates them.
+"""
+import hashlib
+import json
+import os
+import time
+
+from neon_client import run_sql
+
+CACHE_DIR = os.environ.get("QUERY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+DEFAULT_TTL = 24 * 60 * 60
+
+# Row counts plus max(id) / max(timestamp) change on every insert, delete and
+# seeder upsert (which always bumps question_templates.updated_at)
+CATALOG_FINGERPRINT_SQL = """
+    SELECT json_build_array(
+        (SELECT json_build_array(COUNT(*), MAX(id), MAX(updated_at)) FROM question_templates),
+        (SELECT json_build_array(COUNT(*), MAX(id), MAX(created_at)) FROM question_answer_options),
+        (SELECT json_build_array(COUNT(*), MAX(id), MAX(created_at)) FROM question_score_examples)
+    ) as fingerprint
+"""
+
+
+def catalog_fingerprint():
+    """Fetch a cheap fingerprint of the three question catalog tables."""
+    res = run_sql(CATALOG_FINGERPRINT_SQL)
+    return json.dumps(res["rows"][0]["fingerprint"], sort_keys=True)
+
+
+class QueryCache:
+    """Cache of run_sql() results valid for one fingerprint and a TTL in seconds."""
+
+    def __init__(self, fingerprint, ttl=DEFAULT_TTL, directory=CACHE_DIR):
+        self.fingerprint = fingerprint
+        self.ttl = ttl
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, query, params):
+        key = json.dumps([query, params or []], sort_keys=True, default=str)
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, query, params=None):
+        try:
+            with open(self._path(query, params), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("fingerprint") != self.fingerprint:
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            return None
+        return entry["result"]
+
+    def put(self, query, result, params=None):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(query, params)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "stored_at": time.time(), "result": result}, f)
+        os.replace(tmp, path)
+
+    def run_sql(self, query, params=None):
+        """Serve a query from the cache, falling back to the database on a miss."""
+        result = self.get(query, params)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = run_sql(query, params)
+        self.put(query, result, params)
+        return result
@@ -0,0 +1,154 @@
+"""Question catalog seeded into question_templates and its option/score tables.
+
+The catalog lives in question_catalog.json (override with QUESTION_CATALOG)
+and is only read on first use. load_catalog() returns a Catalog of compact
+__slots__ records with O(1) lookups by id, category, tier and critical flag;
+category, section and tier strings are interned so they are shared across
+questions and across catalog versions loaded side by side.
+
+QUESTIONS and ALL_TIERS are still importable for code that works on plain
+dicts; they are built from the default catalog when first accessed.
+"""
+import json
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+CATALOG_PATH = os.environ.get(
+    "QUESTION_CATALOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_catalog.json")
+)
+
+Option = namedtuple("Option", "value label")
+ScoreExample = namedtuple("ScoreExample", "level reason action")
+
+
+class Question:
+    """One catalog question; options and score examples are tuples of namedtuples."""
+
+    __slots__ = ("id", "cat", "sec", "text", "critical", "weight", "comment", "motivation",
+                 "options", "scores", "tiers")
+
+    def __init__(self, record, default_tiers):
+        self.id = record["id"]
+        self.cat = sys.intern(record["cat"])
+        self.sec = sys.intern(record["sec"])
+        self.text = record["text"]
+        self.critical = bool(record["critical"])
+        self.weight = float(record["weight"])
+        self.comment = record.get("comment")
+        self.motivation = record.get("motivation")
+        self.options = tuple(Option(o["value"], o["label"]) for o in record["options"])
+        self.scores = tuple(
+            ScoreExample(sys.intern(s["level"]), s["reason"], s.get("action")) for s in record["scores"]
+        )
+        tiers = record.get("tiers")
+        self.tiers = tuple(sys.intern(t) for t in tiers) if tiers else default_tiers
+
+    def option_for(self, value):
+        for option in self.options:
+            if option.value == value:
+                return option
+        return None
+
+    def as_dict(self):
+        """The plain-dict form used by QUESTIONS (and stored in question_catalog.json).
+
+        `tiers` is always present; records without their own list get the catalog's tiers.
+        """
+        return {
+            "id": self.id, "cat": self.cat, "sec": self.sec, "text": self.text,
+            "critical": self.critical, "weight": self.weight,
+            "comment": self.comment, "motivation": self.motivation,
+            "options": [{"value": o.value, "label": o.label} for o in self.options],
+            "scores": [{"level": s.level, "reason": s.reason, "action": s.action} for s in self.scores],
+            "tiers": list(self.tiers),
+        }
+
+    def __repr__(self):
+        return f"Question({self.id!r}, {self.cat!r})"
+
+
+class Catalog:
+    """Ordered, indexed collection of Questions."""
+
+    __slots__ = ("questions", "tiers", "by_id", "by_category", "by_tier", "critical")
+
+    def __init__(self, records, tiers):
+        self.tiers = tuple(sys.intern(t) for t in tiers)
+        self.questions = tuple(Question(r, self.tiers) for r in records)
+        self.by_id = {}
+        self.by_category = {}
+        self.by_tier = {tier: [] for tier in self.tiers}
+        self.critical = {True: [], False: []}
+        for q in self.questions:
+            if q.id in self.by_id:
+                raise ValueError(f"Duplicate question id {q.id!r} in catalog")
+            unknown = [t for t in q.tiers if t not in self.by_tier]
+            if unknown:
+                raise ValueError(f"Question {q.id!r} lists unknown tiers {unknown}")
+            self.by_id[q.id] = q
+            self.by_category.setdefault(q.cat, []).append(q)
+            for tier in q.tiers:
+                self.by_tier[tier].append(q)
+            self.critical[q.critical].append(q)
+        # Freeze the index lists so callers cannot mutate shared state
+        self.by_category = {k: tuple(v) for k, v in self.by_category.items()}
+        self.by_tier = {k: tuple(v) for k, v in self.by_tier.items()}
+        self.critical = {k: tuple(v) for k, v in self.critical.items()}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["questions"], data["tiers"])
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def __contains__(self, question_id):
+        return question_id in self.by_id
+
+    def __getitem__(self, question_id):
+        return self.by_id[question_id]
+
+    def get(self, question_id, default=None):
+        return self.by_id.get(question_id, default)
+
+    @property
+    def categories(self):
+        """Categories in first-appearance order."""
+        return tuple(self.by_category)
+
+    def in_category(self, category):
+        return self.by_category.get(category, ())
+
+    def for_tier(self, tier):
+        return self.by_tier.get(tier, ())
+
+    def critical_questions(self, critical=True):
+        return self.critical[bool(critical)]
+
+    def as_dicts(self):
+        return [q.as_dict() for q in self.questions]
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path=CATALOG_PATH):
+    """Load (once per path) and index a serialized catalog."""
+    return Catalog.load(path)
+
+
+def __getattr__(name):
+    # Lazy module attributes (PEP 562): nothing is read until first use
+    if name == "QUESTIONS":
+        value = load_catalog().as_dicts()
+    elif name == "ALL_TIERS":
+        value = list(load_catalog().tiers)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
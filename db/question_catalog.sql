@@ -0,0 +1,169 @@
+-- Generated by db/compile-catalog.py from the question catalog. Do not edit by hand.
+-- catalog-hash: 71dd8785edd4f8c830b0e83941442895d9cd6febc7291866d87c13a7f2db9f17
+-- questions: 26, tiers: tier_0, tier_1, tier_2, tier_3, tier_4
+
+BEGIN;
+
+-- Templates, answer options and score examples; rows already matching are left alone
+WITH payload AS (
+  SELECT q FROM jsonb_array_elements('[
+{"cat": "Documentation", "comment": "This covers all mandatory safety and compliance certificates including Gas Safety Certificate (annually), Electrical Installation Condition Report (EICR - every 5 years), Portable Appliance Testing (PAT) for landlord-supplied appliances, and Energy Performance Certificate (EPC) with minimum E rating.", "critical": true, "id": "1.1", "motivation": "These certificates are not administrative formalities — they are legal preconditions to lawful letting and, in some cases, to regaining possession.", "options": [{"label": "I hold current copies of all required certificates (Gas Safety, EICR, EPC) and have clear evidence they were properly served to the tenant.", "ord": 1, "value": 10}, {"label": "I hold some certificates, but one or more may be expired, missing, or I do not have clear proof they were properly served.", "ord": 2, "value": 5}, {"label": "I do not hold all required certificates or I am unsure of their status.", "ord": 3, "value": 1}], "scores": [{"action": "Immediately obtain valid and in-date Gas Safety, Electrical Safety (EICR), and EPC certificates.", "level": "low", "reason": "I do not hold all required certificates or I am unsure of their status."}, {"action": "Conduct an immediate compliance review to confirm all certificates are current and properly evidenced as served.", "level": "medium", "reason": "I hold some certificates, but one or more may be expired, missing, or I do not have clear proof they were properly served."}, {"action": "Maintain strict renewal monitoring and retain clear evidence that all certificates have been properly served.", "level": "high", "reason": "I hold current copies of all required certificates."}], "sec": "Certificates", "text": "Do you have current copies of ALL of the following for this property: Landlord''s Gas Safety Certificate, Landlord''s Electrical Safety Certificate (EICR), and Energy Performance Certificate (EPC)?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Covers statutory safety and energy certification requirements necessary for lawful letting and possession protection.", "critical": true, "id": "1.2", "motivation": "Compliance is continuous, not a one-time event. Allowing certificates to expire, even briefly, can create legal exposure.", "options": [{"label": "I actively track renewal dates using a structured system with reminders set in advance of expiry.", "ord": 1, "value": 10}, {"label": "I am aware of renewal dates but rely on memory, ad-hoc reminders, or reactive action.", "ord": 2, "value": 5}, {"label": "I do not formally track renewal dates and risk certificates expiring without notice.", "ord": 3, "value": 1}], "scores": [{"action": "Implement a formal compliance tracking system immediately.", "level": "low", "reason": "I do not formally track renewal dates."}, {"action": "Move from informal tracking to a documented, systemised renewal process.", "level": "medium", "reason": "I am aware of renewal dates but rely on memory."}, {"action": "Continue maintaining structured renewal monitoring.", "level": "high", "reason": "I actively track renewal dates using a structured system."}], "sec": "Certificates", "text": "Do you track renewal dates for these certificates?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Evaluates procedural strength, evidential protection, and legal defensibility.", "critical": true, "id": "1.3", "motivation": "Failure to provide the correct How To Rent guide can invalidate Section 21 proceedings. Proof of service is critical.", "options": [{"label": "Provided latest version with proof of service.", "ord": 1, "value": 10}, {"label": "Provided but no proof retained.", "ord": 2, "value": 5}, {"label": "Not provided or unsure.", "ord": 3, "value": 1}], "scores": [{"action": "Serve the latest How To Rent guide immediately and retain proof.", "level": "low", "reason": "Not provided or unsure."}, {"action": "Audit version control and service records.", "level": "medium", "reason": "Provided but no proof retained."}, {"action": "Maintain version monitoring and service evidence.", "level": "high", "reason": "Provided latest version with proof of service."}], "sec": "Certificates", "text": "Do you give all your new tenants a copy of the latest ''How To Rent'' leaflet?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Evaluates clarity and comprehensiveness of information provided to tenants at tenancy start.", "critical": false, "id": "2.1", "motivation": "Clear written guidance reduces disputes and liability claims.", "options": [{"label": "Comprehensive written property manual issued.", "ord": 1, "value": 10}, {"label": "Basic or informal guidance.", "ord": 2, "value": 5}, {"label": "No manual.", "ord": 3, "value": 1}], "scores": [{"action": "Issue a structured property manual immediately.", "level": "low", "reason": "No manual."}, {"action": "Formalise informal guidance into written format.", "level": "medium", "reason": "Basic or informal guidance."}, {"action": "Maintain and update the manual regularly.", "level": "high", "reason": "Comprehensive written property manual issued."}], "sec": "Tenant Manuals & Documents", "text": "Do you provide tenants with a property manual that includes emergency numbers and troubleshooting guide?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Documentation", "comment": "Evaluates procedural strength, evidential protection, and legal defensibility.", "critical": false, "id": "2.3", "motivation": "In deposit disputes and damage claims, the burden of proof sits with the landlord.", "options": [{"label": "Detailed signed photographic inventory.", "ord": 1, "value": 10}, {"label": "Inventory lacks detail or signature.", "ord": 2, "value": 5}, {"label": "No signed inventory.", "ord": 3, "value": 1}], "scores": [{"action": "Immediately implement a detailed, room-by-room photographic inventory process.", "level": "low", "reason": "No signed inventory."}, {"action": "Upgrade your inventory documentation.", "level": "medium", "reason": "Inventory lacks detail or signature."}, {"action": "Continue maintaining high-standard photographic inventories.", "level": "high", "reason": "Detailed signed photographic inventory."}], "sec": "Tenant Manuals & Documents", "text": "Do you get all your new tenants to sign a Property Inventory and Condition Report?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Documentation", "comment": "Assesses whether the property has the correct HMO licence for its size and location.", "critical": true, "id": "3.1", "motivation": "HMO non-compliance can result in fines, rent repayment orders, or prosecution.", "options": [{"label": "Fully checked and compliant with local HMO rules.", "ord": 1, "value": 10}, {"label": "Aware but not fully verified.", "ord": 2, "value": 5}, {"label": "Not checked.", "ord": 3, "value": 1}], "scores": [{"action": "Confirm licensing requirements immediately.", "level": "low", "reason": "Not checked."}, {"action": "Conduct structured local authority compliance review.", "level": "medium", "reason": "Aware but not fully verified."}, {"action": "Monitor regulatory updates regularly.", "level": "high", "reason": "Fully checked and compliant."}], "sec": "Council Required Documents", "text": "Have you formally reviewed and confirmed that this property complies with all applicable local HMO licensing and management regulations?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Covers documentation and communication of tenant responsibilities for shared areas.", "critical": false, "id": "4.1", "motivation": "Shared space disputes escalate quickly and often trigger complaints to the local authority.", "options": [{"label": "Formal written cleaning rota clearly allocating responsibilities, acknowledged by tenants.", "ord": 1, "value": 10}, {"label": "Informal or partially written rota without clear acknowledgment.", "ord": 2, "value": 5}, {"label": "No structured or documented cleaning rota.", "ord": 3, "value": 1}], "scores": [{"action": "Establish a written, enforceable cleaning rota immediately.", "level": "low", "reason": "No structured cleaning rota."}, {"action": "Formalise into a documented rota.", "level": "medium", "reason": "Informal rota without acknowledgment."}, {"action": "Maintain structured cleaning rotas.", "level": "high", "reason": "Formal written cleaning rota acknowledged by tenants."}], "sec": "Tenant Responsibilities", "text": "Do you have documented cleaning rotas and tenant responsibilities for shared areas?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Documentation", "comment": "Assesses provision and accessibility of critical safety information to tenants.", "critical": true, "id": "5.1", "motivation": "Inadequate fire signage increases liability exposure and can result in enforcement action.", "options": [{"label": "Clearly marked fire escape routes with prominently displayed emergency contact details.", "ord": 1, "value": 10}, {"label": "Basic signage but inconsistent visibility or placement.", "ord": 2, "value": 5}, {"label": "No clear signage or emergency contact display.", "ord": 3, "value": 1}], "scores": [{"action": "Install compliant signage and display emergency contacts immediately.", "level": "low", "reason": "No clear signage or emergency contact display."}, {"action": "Review positioning and clarity of existing signage.", "level": "medium", "reason": "Basic signage but inconsistent."}, {"action": "Continue periodic checks of signage visibility.", "level": "high", "reason": "Clearly marked fire escape routes."}], "sec": "Tenant Critical Information", "text": "Are fire escape routes clearly marked and emergency contact numbers prominently displayed?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Covers comprehensive fire safety documentation including current FRA and alarm testing records.", "critical": true, "id": "6.1", "motivation": "A missing or outdated Fire Risk Assessment can lead to prosecution, unlimited fines, or prohibition notices.", "options": [{"label": "Current Fire Risk Assessment with documented alarm testing records.", "ord": 1, "value": 10}, {"label": "FRA exists but outdated or testing logs inconsistent.", "ord": 2, "value": 5}, {"label": "No current FRA or documented alarm testing.", "ord": 3, "value": 1}], "scores": [{"action": "Commission an updated Fire Risk Assessment immediately.", "level": "low", "reason": "No current FRA."}, {"action": "Review FRA validity and formalise alarm testing documentation.", "level": "medium", "reason": "FRA outdated or testing logs inconsistent."}, {"action": "Maintain scheduled reviews and documented safety testing.", "level": "high", "reason": "Current FRA with documented testing."}], "sec": "Fire Safety Documentation", "text": "Do you have a current Fire Risk Assessment and records of regular alarm testing?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Documentation", "comment": "Evaluates the robustness of the system used to track compliance deadlines.", "critical": false, "id": "7.1", "motivation": "Missed compliance deadlines can invalidate certificates and undermine possession rights.", "options": [{"label": "Formal compliance tracking system with advance reminders.", "ord": 1, "value": 10}, {"label": "Basic calendar reminders but no structured tracking.", "ord": 2, "value": 5}, {"label": "No formal deadline tracking system.", "ord": 3, "value": 1}], "scores": [{"action": "Adopt a formal compliance tracking system immediately.", "level": "low", "reason": "No formal tracking."}, {"action": "Upgrade to a documented tracking system.", "level": "medium", "reason": "Basic calendar reminders."}, {"action": "Maintain disciplined monitoring and review cycles.", "level": "high", "reason": "Formal compliance tracking."}], "sec": "Landlord Alert/Reminder System", "text": "What system do you use to track critical compliance deadlines and certificate renewals?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Documentation", "comment": "Assesses secure storage and management of tenant personal information.", "critical": false, "id": "8.1", "motivation": "Improper handling of tenant data can result in ICO penalties and fines.", "options": [{"label": "Secure, access-controlled storage with documented GDPR policy.", "ord": 1, "value": 10}, {"label": "Basic storage but no formal GDPR framework.", "ord": 2, "value": 5}, {"label": "Informal storage with no compliance controls.", "ord": 3, "value": 1}], "scores": [{"action": "Implement secure storage protocols immediately.", "level": "low", "reason": "Informal storage."}, {"action": "Formalise existing storage practices.", "level": "medium", "reason": "Basic storage."}, {"action": "Maintain ongoing GDPR compliance reviews.", "level": "high", "reason": "Secure storage with GDPR policy."}], "sec": "Tenant Information", "text": "How do you store tenant personal information and ensure GDPR compliance?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Evaluates the system for conducting and recording regular inspections.", "critical": false, "id": "14.1", "motivation": "Room inspections must be handled professionally and lawfully.", "options": [{"label": "Scheduled room inspections with detailed written and photographic records.", "ord": 1, "value": 10}, {"label": "Inspections occur but limited documentation.", "ord": 2, "value": 5}, {"label": "Rare or undocumented inspections.", "ord": 3, "value": 1}], "scores": [{"action": "Formalise a six-monthly room inspection process.", "level": "low", "reason": "Rare or undocumented."}, {"action": "Strengthen current inspection approach.", "level": "medium", "reason": "Limited documentation."}, {"action": "Continue scheduled inspections with proper notice.", "level": "high", "reason": "Scheduled inspections with records."}], "sec": "Room Inspections Log", "text": "How often do you inspect individual tenant rooms and what records do you keep?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Comprehensive documentation of room condition and contents.", "critical": false, "id": "15.1", "motivation": "Without strong inventory evidence, deposit deductions are difficult to defend.", "options": [{"label": "Detailed photographic inventories at check-in and check-out, signed and dated.", "ord": 1, "value": 10}, {"label": "Inventory exists but lacks sufficient detail or photos.", "ord": 2, "value": 5}, {"label": "No formal inventory procedure.", "ord": 3, "value": 1}], "scores": [{"action": "Adopt detailed photographic inventories immediately.", "level": "low", "reason": "No formal inventory."}, {"action": "Enhance detail and photographic coverage.", "level": "medium", "reason": "Inventory lacks detail."}, {"action": "Maintain high-standard inventory documentation.", "level": "high", "reason": "Detailed photographic inventories."}], "sec": "Room Inventory", "text": "Do you create detailed inventory reports at check-in and check-out with photographic evidence?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.5},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Evaluates the system for tenants to report maintenance issues.", "critical": false, "id": "16.1", "motivation": "Maintenance reporting must be structured, logged, and actively managed.", "options": [{"label": "Structured written reporting system with tracked maintenance log.", "ord": 1, "value": 10}, {"label": "Reports accepted but no consistent tracking.", "ord": 2, "value": 5}, {"label": "Informal verbal reporting only.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce a structured maintenance log.", "level": "low", "reason": "Informal verbal reporting."}, {"action": "Standardise repair logs.", "level": "medium", "reason": "No consistent tracking."}, {"action": "Continue maintaining detailed logs.", "level": "high", "reason": "Structured written system."}], "sec": "Tenant''s Property Repair Logging System", "text": "How do tenants report maintenance issues and how do you track them?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Detailed tracking of maintenance work from report through to completion.", "critical": false, "id": "16.2", "motivation": "Maintenance documentation must cover the full lifecycle of a repair.", "options": [{"label": "Full lifecycle documentation of maintenance from report to completion.", "ord": 1, "value": 10}, {"label": "Partial documentation.", "ord": 2, "value": 5}, {"label": "Minimal or no maintenance records.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce full repair lifecycle tracking.", "level": "low", "reason": "Minimal or no records."}, {"action": "Strengthen current documentation.", "level": "medium", "reason": "Partial documentation."}, {"action": "Continue detailed repair lifecycle documentation.", "level": "high", "reason": "Full lifecycle documentation."}], "sec": "Property Maintenance Log", "text": "Do you maintain detailed records of maintenance work from start to completion?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Regular inspection and documentation of shared spaces.", "critical": false, "id": "17.1", "motivation": "Shared spaces present a higher management risk in HMOs.", "options": [{"label": "Scheduled shared-area inspections with written and photographic records.", "ord": 1, "value": 10}, {"label": "Inspections occur but limited documentation.", "ord": 2, "value": 5}, {"label": "Rare or reactive inspections.", "ord": 3, "value": 1}], "scores": [{"action": "Implement a shared-space inspection schedule.", "level": "low", "reason": "Rare or reactive."}, {"action": "Define inspection intervals.", "level": "medium", "reason": "Limited documentation."}, {"action": "Maintain consistent inspections.", "level": "high", "reason": "Scheduled inspections with records."}], "sec": "Shared Spaces Inspection Log", "text": "How often do you inspect shared spaces like kitchens and bathrooms?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Regular inspection of property exterior.", "critical": false, "id": "18.1", "motivation": "Exterior maintenance is a preventative risk-control function.", "options": [{"label": "Regular documented exterior inspections.", "ord": 1, "value": 10}, {"label": "Occasional checks without formal records.", "ord": 2, "value": 5}, {"label": "Rare or no exterior inspections.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce a documented seasonal exterior inspection programme.", "level": "low", "reason": "Rare or no inspections."}, {"action": "Formalise exterior inspection timing.", "level": "medium", "reason": "Occasional checks."}, {"action": "Maintain preventative exterior inspection programme.", "level": "high", "reason": "Regular documented inspections."}], "sec": "External Property Inspection Log", "text": "How often do you inspect the exterior of the property and grounds?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Evaluates the system for recording and managing tenant behavior issues.", "critical": false, "id": "19.1", "motivation": "Managing tenant behaviour in HMOs is highly sensitive.", "options": [{"label": "Formal written behaviour and complaint log with documented actions.", "ord": 1, "value": 10}, {"label": "Informal notes without structured logging.", "ord": 2, "value": 5}, {"label": "No consistent documentation.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce a structured and confidential reporting channel.", "level": "low", "reason": "No consistent documentation."}, {"action": "Formalise logging procedures.", "level": "medium", "reason": "Informal notes."}, {"action": "Maintain disciplined complaint logging.", "level": "high", "reason": "Formal written log."}], "sec": "Tenant Behaviour Log", "text": "How do you record and manage tenant behavior issues and complaints?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Comprehensive logging of fire safety checks, accidents, and preventive actions.", "critical": true, "id": "20.1", "motivation": "Fire safety logging is not administrative paperwork — it is life-safety evidence.", "options": [{"label": "Comprehensive fire safety and accident log with dates and actions taken.", "ord": 1, "value": 10}, {"label": "Some records kept but inconsistent.", "ord": 2, "value": 5}, {"label": "No structured logging system.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce a formal fire safety and incident register.", "level": "low", "reason": "No structured logging."}, {"action": "Ensure every test and incident is logged.", "level": "medium", "reason": "Some records but inconsistent."}, {"action": "Maintain up-to-date fire safety logs.", "level": "high", "reason": "Comprehensive log with dates and actions."}], "sec": "Fire and Accident Log & Safety Action List", "text": "Do you maintain logs of fire safety checks and any accidents that occur?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 2.0},
+{"cat": "Evidence Gathering Systems and Procedures", "comment": "Proactive measures for managing condensation and damp.", "critical": false, "id": "21.1", "motivation": "Condensation and mould management is one of the most contentious areas in residential letting.", "options": [{"label": "Written condensation prevention guidance issued and acknowledged.", "ord": 1, "value": 10}, {"label": "Verbal or informal advice only.", "ord": 2, "value": 5}, {"label": "No structured guidance provided.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce a formal condensation management framework.", "level": "low", "reason": "No structured guidance."}, {"action": "Formalise inspection records.", "level": "medium", "reason": "Verbal or informal advice."}, {"action": "Continue maintaining detailed historical records.", "level": "high", "reason": "Written guidance issued and acknowledged."}], "sec": "Condensation Prevention Procedures", "text": "What guidance do you provide to tenants about preventing condensation and damp?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Assesses the sensitivity and appropriateness of dispute-handling procedures.", "critical": false, "id": "10.1", "motivation": "Poorly managed disputes can escalate into harassment claims or enforcement scrutiny.", "options": [{"label": "Structured written dispute-handling procedure with documentation.", "ord": 1, "value": 10}, {"label": "Informal mediation with limited documentation.", "ord": 2, "value": 5}, {"label": "Reactive and undocumented handling.", "ord": 3, "value": 1}], "scores": [{"action": "Formalise written dispute-handling procedures.", "level": "low", "reason": "Reactive and undocumented."}, {"action": "Document and standardise current practices.", "level": "medium", "reason": "Informal mediation."}, {"action": "Maintain structured dispute documentation.", "level": "high", "reason": "Structured written procedure."}], "sec": "Behaviour Reporting Procedure/System", "text": "How do you handle sensitive issues between tenants while respecting privacy?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Evaluates whether tenants are encouraged to report and record problems.", "critical": false, "id": "10.2", "motivation": "Early documented evidence prevents exaggerated retrospective claims.", "options": [{"label": "Tenants formally instructed to submit documented evidence.", "ord": 1, "value": 10}, {"label": "Encouraged informally.", "ord": 2, "value": 5}, {"label": "No structured evidence reporting process.", "ord": 3, "value": 1}], "scores": [{"action": "Introduce formal documented issue reporting.", "level": "low", "reason": "No structured reporting."}, {"action": "Standardise how tenants submit evidence.", "level": "medium", "reason": "Encouraged informally."}, {"action": "Maintain structured evidence retention.", "level": "high", "reason": "Formally instructed."}], "sec": "Behaviour Reporting Procedure/System", "text": "Do you encourage tenants to record problems when they happen with evidence?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Evaluates how effectively cleanliness expectations are communicated.", "critical": false, "id": "11.1", "motivation": "Without clear written standards, landlords struggle to enforce standards fairly.", "options": [{"label": "Written cleanliness standards issued at tenancy start and acknowledged.", "ord": 1, "value": 10}, {"label": "Verbal or informal written guidance only.", "ord": 2, "value": 5}, {"label": "No clearly communicated standards.", "ord": 3, "value": 1}], "scores": [{"action": "Formalise cleanliness standards immediately.", "level": "low", "reason": "No communicated standards."}, {"action": "Introduce inspection logs and documented follow-up.", "level": "medium", "reason": "Verbal or informal."}, {"action": "Maintain written standards with routine inspections.", "level": "high", "reason": "Written standards acknowledged."}], "sec": "Cleanliness", "text": "How do you communicate cleanliness expectations and standards to tenants?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Covers clear communication of policies regarding who purchases cleaning products.", "critical": false, "id": "12.1", "motivation": "Ambiguity around who buys supplies leads to deterioration and disputes.", "options": [{"label": "Cleaning supply responsibility clearly defined in tenancy documentation.", "ord": 1, "value": 10}, {"label": "Informally agreed but not documented.", "ord": 2, "value": 5}, {"label": "No defined responsibility.", "ord": 3, "value": 1}], "scores": [{"action": "Implement a written cleaning-supply system.", "level": "low", "reason": "No defined responsibility."}, {"action": "Formalise your arrangement in writing.", "level": "medium", "reason": "Informally agreed."}, {"action": "Maintain documented purchasing system.", "level": "high", "reason": "Clearly defined in documentation."}], "sec": "Cleaning Products", "text": "Who is responsible for purchasing cleaning products and household supplies?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Assesses the effectiveness of communication regarding various rotas.", "critical": false, "id": "13.1", "motivation": "Poorly managed rotas are a common trigger for neighbour complaints and authority scrutiny.", "options": [{"label": "Written rota and bin schedule acknowledged by tenants.", "ord": 1, "value": 10}, {"label": "Informal system without documentation.", "ord": 2, "value": 5}, {"label": "No structured management system.", "ord": 3, "value": 1}], "scores": [{"action": "Formalise cleaning rota and bin schedule.", "level": "low", "reason": "No structured system."}, {"action": "Add documentation and scheduled reminders.", "level": "medium", "reason": "Informal system."}, {"action": "Maintain structured rota.", "level": "high", "reason": "Written rota acknowledged."}], "sec": "Rotas", "text": "How do you manage cleaning rotas and bin collection schedules?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0},
+{"cat": "Landlord-Tenant Communication", "comment": "Assesses the primary method for routine communication with tenants.", "critical": false, "id": "9.1", "motivation": "In disputes, undocumented communication is effectively non-existent.", "options": [{"label": "Primary communication channel is written and fully retained.", "ord": 1, "value": 10}, {"label": "Mixed written and verbal communication.", "ord": 2, "value": 5}, {"label": "Primarily verbal with no records retained.", "ord": 3, "value": 1}], "scores": [{"action": "Standardise all key communication to written channels.", "level": "low", "reason": "Primarily verbal."}, {"action": "Reduce reliance on verbal communication.", "level": "medium", "reason": "Mixed written and verbal."}, {"action": "Maintain disciplined written communication practices.", "level": "high", "reason": "Written and fully retained."}], "sec": "Day-to-day Communication System", "text": "What is your primary method for routine communication with tenants?", "tiers": ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"], "weight": 1.0}
+]'::jsonb) AS q
+), deactivated AS (
+  UPDATE question_templates SET is_active = FALSE, updated_at = NOW()
+  WHERE is_active = TRUE
+    AND (category, question_number) NOT IN (SELECT q->>'cat', q->>'id' FROM payload)
+  RETURNING id
+), upserted AS (
+  INSERT INTO question_templates (
+    category, sub_category, question_number, question_text, question_type,
+    applicable_tiers, weight, is_critical, comment, motivation_learning_point, is_active
+  )
+  SELECT q->>'cat', q->>'sec', q->>'id', q->>'text', 'multiple_choice',
+         q->'tiers', (q->>'weight')::numeric, (q->>'critical')::boolean,
+         q->>'comment', q->>'motivation', TRUE
+  FROM payload
+  ON CONFLICT (category, question_number) DO UPDATE SET
+    sub_category = EXCLUDED.sub_category,
+    question_text = EXCLUDED.question_text,
+    applicable_tiers = EXCLUDED.applicable_tiers,
+    weight = EXCLUDED.weight,
+    is_critical = EXCLUDED.is_critical,
+    comment = EXCLUDED.comment,
+    motivation_learning_point = EXCLUDED.motivation_learning_point,
+    is_active = TRUE,
+    updated_at = NOW()
+  WHERE (question_templates.sub_category, question_templates.question_text, question_templates.applicable_tiers,
+         question_templates.weight, question_templates.is_critical, question_templates.comment,
+         question_templates.motivation_learning_point, question_templates.is_active)
+    IS DISTINCT FROM
+        (EXCLUDED.sub_category, EXCLUDED.question_text, EXCLUDED.applicable_tiers,
+         EXCLUDED.weight, EXCLUDED.is_critical, EXCLUDED.comment,
+         EXCLUDED.motivation_learning_point, TRUE)
+  RETURNING id, category, question_number
+), templates AS (
+  -- Ids of every catalog template: inserted or updated above, or already up to date
+  SELECT id, category, question_number FROM upserted
+  UNION
+  SELECT qt.id, qt.category, qt.question_number
+  FROM question_templates qt
+  JOIN payload ON qt.category = payload.q->>'cat' AND qt.question_number = payload.q->>'id'
+), wanted_options AS (
+  SELECT t.id AS tid, o->>'label' AS label, (o->>'value')::int AS value, (o->>'ord')::int AS ord
+  FROM payload
+  JOIN templates t ON t.category = payload.q->>'cat' AND t.question_number = payload.q->>'id'
+  CROSS JOIN jsonb_array_elements(payload.q->'options') AS o
+), removed_options AS (
+  DELETE FROM question_answer_options qao
+  USING templates t
+  WHERE qao.question_template_id = t.id
+    AND NOT EXISTS (
+      SELECT 1 FROM wanted_options w
+      WHERE w.tid = qao.question_template_id AND w.label = qao.option_text
+        AND w.value = qao.score_value AND w.ord = qao.option_order AND qao.is_example = FALSE
+    )
+  RETURNING qao.id
+), added_options AS (
+  INSERT INTO question_answer_options (question_template_id, option_text, score_value, option_order, is_example)
+  SELECT w.tid, w.label, w.value, w.ord, FALSE
+  FROM wanted_options w
+  WHERE NOT EXISTS (
+    SELECT 1 FROM question_answer_options qao
+    WHERE qao.question_template_id = w.tid AND qao.option_text = w.label
+      AND qao.score_value = w.value AND qao.option_order = w.ord AND qao.is_example = FALSE
+  )
+  RETURNING id
+), scores AS (
+  INSERT INTO question_score_examples (question_template_id, score_level, reason_text, report_action)
+  SELECT t.id, s->>'level', s->>'reason', s->>'action'
+  FROM payload
+  JOIN templates t ON t.category = payload.q->>'cat' AND t.question_number = payload.q->>'id'
+  CROSS JOIN jsonb_array_elements(payload.q->'scores') AS s
+  ON CONFLICT (question_template_id, score_level) DO UPDATE SET
+    reason_text = EXCLUDED.reason_text,
+    report_action = EXCLUDED.report_action
+  WHERE (question_score_examples.reason_text, question_score_examples.report_action)
+    IS DISTINCT FROM (EXCLUDED.reason_text, EXCLUDED.report_action)
+  RETURNING id
+)
+SELECT (SELECT COUNT(*) FROM payload) AS questions,
+       (SELECT COUNT(*) FROM upserted) AS templates_written,
+       (SELECT COUNT(*) FROM deactivated) AS templates_deactivated,
+       (SELECT COUNT(*) FROM removed_options) AS options_removed,
+       (SELECT COUNT(*) FROM added_options) AS options_added,
+       (SELECT COUNT(*) FROM scores) AS score_examples_written;
+
+-- Per-tier question bundles (unchanged bundles are left alone)
+WITH tiers AS (
+    SELECT jsonb_array_elements_text('["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"]'::jsonb) AS tier
+), bundles AS (
+    SELECT t.tier,
+           COALESCE(jsonb_agg(jsonb_build_object(
+               'id', qt.question_number,
+               'category', qt.category,
+               'section', qt.sub_category,
+               'text', qt.question_text,
+               'critical', qt.is_critical,
+               'tiers', jsonb_build_array(t.tier),
+               'weight', qt.weight::float8,
+               'options', COALESCE((
+                   SELECT jsonb_agg(jsonb_build_object(
+                       'value', qao.score_value, 'label', qao.option_text
+                   ) ORDER BY qao.option_order)
+                   FROM question_answer_options qao
+                   WHERE qao.question_template_id = qt.id AND qao.is_example = FALSE
+               ), '[]'),
+               'motivation_learning_point', qt.motivation_learning_point,
+               'comment', qt.comment,
+               'score_examples', COALESCE((
+                   SELECT jsonb_agg(jsonb_build_object(
+                       'score_level', qse.score_level,
+                       'reason_text', qse.reason_text,
+                       'report_action', qse.report_action
+                   ) ORDER BY qse.score_level)
+                   FROM question_score_examples qse
+                   WHERE qse.question_template_id = qt.id
+               ), '[]')
+           ) ORDER BY qt.category, qt.question_number) FILTER (WHERE qt.id IS NOT NULL), '[]') AS questions
+    FROM tiers t
+    LEFT JOIN question_templates qt
+      ON qt.is_active = TRUE AND qt.applicable_tiers @> jsonb_build_array(t.tier)
+    GROUP BY t.tier
+)
+INSERT INTO question_tier_bundles (tier, questions, question_count, version_hash, built_at)
+SELECT tier, questions, jsonb_array_length(questions), md5(questions::text), NOW()
+FROM bundles
+ON CONFLICT (tier) DO UPDATE SET
+    questions = EXCLUDED.questions,
+    question_count = EXCLUDED.question_count,
+    version_hash = EXCLUDED.version_hash,
+    built_at = NOW()
+WHERE question_tier_bundles.version_hash IS DISTINCT FROM EXCLUDED.version_hash
+RETURNING tier, question_count, version_hash;
+
+COMMIT;
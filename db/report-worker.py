@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Precompute report payloads for submitted and completed audits.
+
+Polls for audits whose payload is missing or out of date and computes, in
+batches, what the report routes otherwise derive from raw form_responses on
+every view: category scores, overall score and risk, recommended actions
+(the same rules as lib/scoring.ts) and, per answer, the reason and action
+resolved from the question's low/medium/high score example. Each result is
+stored in audit_report_payloads as a versioned JSON document.
+
+Questions come from question_tier_bundles, and each payload records the
+version_hash of the bundle it was computed from. A catalog change rebuilds
+(seed) or clears (admin edit) the bundles, so stale payloads stop matching
+and are recomputed on the next poll; readers join on the hash and never see
+them. Requires db/add-audit-report-payloads.sql.
+"""
+import argparse
+import json
+import time
+
+from neon_client import CONN_STR, run_sql, with_archive
+from scoring import to_fixed
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+# Bump when the payload shape or the rules change; older payloads are recomputed
+PAYLOAD_VERSION = 1
+
+PRIORITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+SCORE_LEVELS = {1: "low", 5: "medium"}  # anything else is "high", as in the PDF pages
+
+# {responses} is form_responses_all, or form_responses before the archive migration
+PENDING_SQL = """
+    SELECT a.id, a.risk_audit_tier AS tier, b.version_hash,
+           (SELECT json_agg(json_build_object('question_id', fr.question_id, 'answer_value', fr.answer_value)
+                            ORDER BY fr.question_id)
+            FROM {responses} fr WHERE fr.audit_id = a.id) AS responses
+    FROM audits a
+    JOIN question_tier_bundles b ON b.tier = a.risk_audit_tier
+    LEFT JOIN audit_report_payloads p ON p.audit_id = a.id
+    WHERE a.id > $1
+      AND a.status IN ('submitted', 'completed')
+      AND (p.audit_id IS NULL OR p.catalog_version <> b.version_hash OR p.payload_version < $2)
+    ORDER BY a.id
+    LIMIT $3
+"""
+
+UPSERT_SQL = """
+    INSERT INTO audit_report_payloads (audit_id, tier, catalog_version, payload_version, payload, computed_at)
+    SELECT (p->>'audit_id')::int, p->>'tier', p->>'catalog_version', (p->>'payload_version')::int, p, NOW()
+    FROM jsonb_array_elements($1::jsonb) AS p
+    ON CONFLICT (audit_id) DO UPDATE SET
+        tier = EXCLUDED.tier,
+        catalog_version = EXCLUDED.catalog_version,
+        payload_version = EXCLUDED.payload_version,
+        payload = EXCLUDED.payload,
+        computed_at = NOW()
+"""
+
+
+def risk_level(score):
+    if score >= 7.5:
+        return "low"
+    if score >= 4.0:
+        return "medium"
+    return "high"
+
+
+RISK_COLORS = {"low": "green", "medium": "yellow", "high": "red"}
+
+
+def traffic_light(score):
+    if score <= 3:
+        return "red"
+    if score <= 6:
+        return "orange"
+    return "green"
+
+
+def normalize_section_name(section):
+    return "Cleaning Products" if section == "Product Buying" else section
+
+
+def category_scores(answers, questions):
+    scores = []
+    for category in dict.fromkeys(q["category"] for q in questions):
+        members = [q for q in questions if q["category"] == category]
+        total_weight = sum(q["weight"] for q in members)
+        total = sum(answers[q["id"]] * q["weight"] for q in members if q["id"] in answers)
+        normalized = total / total_weight if total_weight > 0 else 0
+        level = risk_level(normalized)
+        scores.append({
+            "category": category,
+            "score": to_fixed(normalized, 2),
+            "maxScore": 10,
+            "percentage": to_fixed(normalized / 10 * 100, 1),
+            "riskLevel": level,
+            "color": RISK_COLORS[level],
+        })
+    return scores
+
+
+def overall_score(scores):
+    score = to_fixed(sum(s["score"] for s in scores) / len(scores), 2) if scores else 0.0
+    level = risk_level(score)
+    return {"score": score, "riskLevel": level, "color": RISK_COLORS[level]}
+
+
+def recommended_actions(responses, by_id):
+    actions = []
+    for r in responses:
+        q = by_id.get(r["question_id"])
+        if not q:
+            continue
+        value = r["answer_value"]
+        option = next((o for o in q["options"] if o["value"] == value), None)
+        if not option:
+            continue
+        label = option["label"]
+        if q["critical"] and value == 1:
+            action = ("critical", "Immediate action required (within 7 days)",
+                      f"This is a CRITICAL COMPLIANCE issue. {label}. You must address this immediately "
+                      f"to avoid legal issues and protect your tenancy.")
+        elif q["weight"] >= 2.0 and value < 5:
+            action = ("critical", "Immediate action required (within 7 days)",
+                      f"This high-importance area needs urgent attention. {label}. "
+                      f"Take action immediately to improve compliance.")
+        elif value == 1:
+            action = ("high", "Action required within 30 days",
+                      f"{label}. This area requires attention to ensure full compliance and reduce risk.")
+        elif value == 5 and q["weight"] >= 1.0:
+            action = ("medium", "Recommended within 90 days",
+                      f"{label}. Consider improving your systems in this area for better compliance.")
+        elif value == 5:
+            action = ("low", "Ongoing improvement",
+                      f"{label}. This area is functioning but could be optimized.")
+        else:
+            continue
+        priority, timeframe, recommendation = action
+        actions.append({
+            "priority": priority,
+            "questionId": q["id"],
+            "questionText": q["text"],
+            "currentAnswer": label,
+            "recommendation": recommendation,
+            "timeframe": timeframe,
+        })
+    actions.sort(key=lambda a: PRIORITY_ORDER[a["priority"]])
+    return actions
+
+
+def example_text(example, field):
+    text = ((example or {}).get(field) or "").strip()
+    return text or None
+
+
+def question_results(responses, by_id):
+    """Per answer: the chosen option and the reason/action of the matching score example."""
+    results = []
+    for r in responses:
+        q = by_id.get(r["question_id"])
+        if not q:
+            continue
+        value = r["answer_value"]
+        level = SCORE_LEVELS.get(value, "high")
+        example = next((e for e in q.get("score_examples") or [] if e["score_level"] == level), None)
+        option = next((o for o in q["options"] if o["value"] == value), None)
+        results.append({
+            "questionId": q["id"],
+            "category": q["category"],
+            "section": normalize_section_name(q["section"]),
+            "answerValue": value,
+            "answer": option["label"] if option else f"Score: {value}",
+            "color": traffic_light(value),
+            "scoreLevel": level,
+            "reasonText": example_text(example, "reason_text"),
+            "reportAction": example_text(example, "report_action"),
+        })
+    return results
+
+
+def build_payload(audit, questions):
+    responses = audit["responses"] or []
+    answers = {r["question_id"]: r["answer_value"] for r in responses}
+    by_id = {q["id"]: q for q in questions}
+    scores = category_scores(answers, questions)
+    return {
+        "audit_id": int(audit["id"]),
+        "tier": audit["tier"],
+        "catalog_version": audit["version_hash"],
+        "payload_version": PAYLOAD_VERSION,
+        "scores": {
+            "categoryScores": scores,
+            "overallScore": overall_score(scores),
+            "recommendedActions": recommended_actions(responses, by_id),
+        },
+        "questions": question_results(responses, by_id),
+    }
+
+
+class BundleCache:
+    """Tier bundles by version_hash, so each catalog version is fetched once."""
+
+    def __init__(self):
+        self.bundles = {}
+
+    def get(self, tier, version_hash):
+        key = (tier, version_hash)
+        if key not in self.bundles:
+            rows = run_sql(
+                "SELECT questions FROM question_tier_bundles WHERE tier = $1 AND version_hash = $2",
+                [tier, version_hash],
+            )["rows"]
+            self.bundles[key] = rows[0]["questions"] if rows else None
+        return self.bundles[key]
+
+
+def process_pending(bundles, batch_size):
+    """One pass over all audits needing a payload; returns (computed, skipped)."""
+    pending_sql = PENDING_SQL.format(responses=with_archive("form_responses"))
+    after_id = 0
+    computed = 0
+    skipped = 0
+    while True:
+        rows = run_sql(pending_sql, [after_id, PAYLOAD_VERSION, batch_size])["rows"]
+        if not rows:
+            return computed, skipped
+        payloads = []
+        for audit in rows:
+            questions = bundles.get(audit["tier"], audit["version_hash"])
+            if questions is None or not audit["responses"]:
+                skipped += 1
+                continue
+            payloads.append(build_payload(audit, questions))
+        if payloads:
+            run_sql(UPSERT_SQL, [json.dumps(payloads)], idempotent=True)
+            computed += len(payloads)
+            print(f"  OK {len(payloads)} payloads (through audit {payloads[-1]['audit_id']})")
+        after_id = int(rows[-1]["id"])
+        if len(rows) < batch_size:
+            return computed, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute report payloads for submitted audits.")
+    parser.add_argument("--batch-size", type=int, default=200, help="audits per batch (default: 200)")
+    parser.add_argument("--interval", type=float, default=30.0, help="seconds between polls (default: 30)")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    print(f"=== Report worker (payload v{PAYLOAD_VERSION}, batches of {args.batch_size}) ===")
+    bundles = BundleCache()
+    while True:
+        started = time.time()
+        computed, skipped = process_pending(bundles, args.batch_size)
+        if computed:
+            print(f"=== Pass: {computed} payloads computed, {skipped} skipped "
+                  f"in {time.time() - started:.1f}s ===")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Recompute the scores table for historical audits from the question catalog.
+
+Applies the same rules as lib/scoring.ts over the questions of each audit's
+risk_audit_tier (as getQuestionsForTier() returns them): a category score is
+the weighted sum of answer values over the category's total weight, the
+overall score is the mean of the category scores, both rounded half up to 2
+decimals as toFixed(2) does. Responses are loaded in chunks of audits into an
+(audits x questions) matrix and scored in one vectorized pass per tier per
+chunk. Responses moved to the archive by archive-audits.py are read through
+form_responses_all, so archived audits are re-scored too.
+"""
+import argparse
+import json
+import time
+
+from neon_client import CONN_STR, run_sql, with_archive
+from question_catalog import ALL_TIERS, QUESTIONS
+from scoring import to_fixed
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: rescore-audits.py requires numpy (pip install numpy).")
+    exit(1)
+
+OVERALL_CATEGORY = "Overall"
+MIN_SCORE = 1.0  # scores.score CHECK constraint
+
+# toFixed(2) rounding; np.round() rounds half to even and would disagree with the app
+round_half_up = np.vectorize(to_fixed, otypes=[np.float64])
+
+
+class ScoringModel:
+    """Weight vector and category masks derived from the catalog."""
+
+    def __init__(self, questions):
+        self.question_ids = [q["id"] for q in questions]
+        self.column = {qid: i for i, qid in enumerate(self.question_ids)}
+        # Categories in first-appearance order, as in calculateCategoryScores()
+        self.categories = list(dict.fromkeys(q["cat"] for q in questions))
+        self.weights = np.array([q["weight"] for q in questions], dtype=np.float64)
+        self.masks = np.array(
+            [[q["cat"] == cat for q in questions] for cat in self.categories],
+            dtype=np.float64,
+        )
+        self.category_weights = self.masks @ self.weights
+
+    def score(self, answers):
+        """Score an (audits x questions) answer matrix; unanswered cells are 0.
+
+        Returns (category_scores, overall): an (audits x categories) matrix and
+        an (audits,) vector.
+        """
+        totals = (answers * self.weights) @ self.masks.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            category_scores = np.where(self.category_weights > 0, totals / self.category_weights, 0.0)
+        category_scores = round_half_up(category_scores)
+        # Left-to-right sum, as the reduce() in calculateOverallScore()
+        total = np.zeros(len(category_scores))
+        for j in range(category_scores.shape[1]):
+            total += category_scores[:, j]
+        overall = round_half_up(total / category_scores.shape[1])
+        return category_scores, overall
+
+
+def fetch_response_chunks(chunk_size, statuses):
+    """Yield lists of (audit_id, tier, {question_id: answer_value}) in audit id order."""
+    responses = with_archive("form_responses")
+    after_id = 0
+    while True:
+        res = run_sql(f"""
+            SELECT fr.audit_id, a.risk_audit_tier AS tier,
+                   json_object_agg(fr.question_id, fr.answer_value) as answers
+            FROM {responses} fr
+            JOIN audits a ON a.id = fr.audit_id
+            WHERE fr.audit_id > $1
+              AND ($3::jsonb IS NULL OR a.status IN (SELECT jsonb_array_elements_text($3::jsonb)))
+            GROUP BY fr.audit_id, a.risk_audit_tier
+            ORDER BY fr.audit_id
+            LIMIT $2
+        """, [after_id, chunk_size, json.dumps(statuses) if statuses else None])
+        rows = res["rows"]
+        if not rows:
+            return
+        yield [(int(r["audit_id"]), r["tier"], r["answers"]) for r in rows]
+        after_id = int(rows[-1]["audit_id"])
+        if len(rows) < chunk_size:
+            return
+
+
+def build_matrix(model, chunk):
+    """Fill an (audits x questions) matrix from one chunk; unknown question ids are ignored."""
+    rows, cols, values = [], [], []
+    for i, (_, answers) in enumerate(chunk):
+        for question_id, value in answers.items():
+            col = model.column.get(question_id)
+            if col is not None:
+                rows.append(i)
+                cols.append(col)
+                values.append(value)
+    matrix = np.zeros((len(chunk), len(model.question_ids)), dtype=np.float64)
+    matrix[np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)] = np.array(values, dtype=np.float64)
+    return matrix
+
+
+def score_rows(model, chunk, category_scores, overall):
+    """Flatten scored matrices into scores rows, skipping values the table cannot hold."""
+    audit_ids = [audit_id for audit_id, _ in chunk]
+    rows = []
+    for j, category in enumerate(model.categories):
+        for audit_id, score in zip(audit_ids, category_scores[:, j].tolist()):
+            if score >= MIN_SCORE:
+                rows.append({"a": audit_id, "c": category, "s": score})
+    for audit_id, score in zip(audit_ids, overall.tolist()):
+        if score >= MIN_SCORE:
+            rows.append({"a": audit_id, "c": OVERALL_CATEGORY, "s": score})
+    return rows
+
+
+def write_scores(rows):
+    res = run_sql("""
+        INSERT INTO scores (audit_id, scores_category, score, created_at)
+        SELECT (s->>'a')::int, s->>'c', (s->>'s')::numeric, NOW()
+        FROM jsonb_array_elements($1::jsonb) AS s
+        ON CONFLICT (audit_id, scores_category)
+        DO UPDATE SET score = EXCLUDED.score
+    """, [json.dumps(rows)])
+    return res.get("rowCount", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score historical audits from the question catalog.")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="audits scored per chunk (default: 2000)")
+    parser.add_argument("--status", nargs="+", choices=["pending", "submitted", "completed"],
+                        help="only re-score audits with these statuses (default: all)")
+    parser.add_argument("--dry-run", action="store_true", help="compute scores without writing them")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    # One model per tier, over the questions that apply to it
+    models = {}
+    for tier in ALL_TIERS:
+        questions = [q for q in QUESTIONS if tier in q["tiers"]]
+        if questions:
+            models[tier] = ScoringModel(questions)
+    print("=== Re-scoring audits: " + ", ".join(
+        f"{tier} {len(m.question_ids)} questions/{len(m.categories)} categories" for tier, m in models.items()
+    ) + " ===")
+
+    started = time.time()
+    audits = 0
+    skipped = 0
+    written = 0
+    for chunk in fetch_response_chunks(args.chunk_size, args.status):
+        by_tier = {}
+        for audit_id, tier, answers in chunk:
+            by_tier.setdefault(tier, []).append((audit_id, answers))
+        rows = []
+        for tier, tier_chunk in by_tier.items():
+            model = models.get(tier)
+            if model is None:
+                skipped += len(tier_chunk)
+                continue
+            category_scores, overall = model.score(build_matrix(model, tier_chunk))
+            rows += score_rows(model, tier_chunk, category_scores, overall)
+            audits += len(tier_chunk)
+        if not args.dry_run and rows:
+            written += write_scores(rows)
+        print(f"  Scored {audits} audits (through id {chunk[-1][0]})")
+
+    elapsed = time.time() - started
+    print(f"\n=== Results: {audits} audits re-scored, {written} score rows written in {elapsed:.1f}s ===")
+    if skipped:
+        print(f"Skipped {skipped} audits whose tier has no questions in the catalog.")
+    if args.dry_run:
+        print("Dry run: no changes written.")
+
+
+if __name__ == "__main__":
+    main()
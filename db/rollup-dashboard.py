@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Maintain the dashboard rollup tables incrementally.
+
+Keeps dashboard_audit_rollups (audit counts per auditor, tier and status) and
+dashboard_score_rollups (score count, sum and low/medium/high risk counts per
+auditor, tier, status and scores_category) up to date, so dashboard reads are
+lookups of a few rollup rows rather than counts over every audit.
+
+Each pass only visits audits that can have changed since the last one:
+
+  - audits created or submitted, or scored, after the high-water mark
+    (dashboard_rollup_state) and before NOW() - --lag, so rows committed by
+    transactions still in flight are picked up by the next pass
+  - audits not yet completed whose status, auditor, tier or scores no longer
+    match what the ledger recorded for them (the open working set)
+
+dashboard_rollup_ledger records what each audit contributes to the rollups.
+A changed audit subtracts its recorded row and adds its current one in the
+same statement that updates the ledger, so the rollups always equal the sum
+of the ledger, and replaying a batch changes nothing. The first pass, or
+--rebuild, clears the tables and counts every audit; run it after rewriting
+scores of completed audits (rescore-audits.py, scan-integrity.py --fix
+score-mismatch) or deleting completed audits, which leave no trace the
+incremental pass can see. Requires db/add-dashboard-rollups.sql.
+"""
+import argparse
+import json
+import time
+
+from neon_client import CONN_STR, run_sql, run_sql_batch
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+STATE_NAME = "audits"
+# Serialises passes; taken per batch transaction
+LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('dashboard_rollups'))"
+
+STATE_SQL = """
+    SELECT (SELECT high_water_mark::text FROM dashboard_rollup_state WHERE name = $1) AS high_water_mark,
+           (LOCALTIMESTAMP - make_interval(secs => $2))::text AS upper_bound
+"""
+
+SAVE_STATE_SQL = """
+    INSERT INTO dashboard_rollup_state (name, high_water_mark, updated_at)
+    VALUES ($1, $2::timestamp, NOW())
+    ON CONFLICT (name) DO UPDATE SET high_water_mark = EXCLUDED.high_water_mark, updated_at = NOW()
+"""
+
+RESET_SQL = [
+    "DELETE FROM dashboard_rollup_state WHERE name = 'audits'",
+    "TRUNCATE dashboard_audit_rollups, dashboard_score_rollups, dashboard_rollup_ledger",
+]
+
+ALL_AUDITS_SQL = "SELECT id FROM audits WHERE id > $1 ORDER BY id LIMIT $2"
+
+# $1/$2: (high-water mark, upper bound]; $3/$4: keyset page
+CHANGED_AUDITS_SQL = """
+    WITH changed AS (
+      SELECT id FROM audits WHERE created_at > $1::timestamp AND created_at <= $2::timestamp
+      UNION
+      SELECT id FROM audits WHERE submitted_at > $1::timestamp AND submitted_at <= $2::timestamp
+      UNION
+      SELECT audit_id FROM scores WHERE created_at > $1::timestamp AND created_at <= $2::timestamp
+      UNION
+      SELECT l.audit_id
+      FROM dashboard_rollup_ledger l
+      LEFT JOIN audits a ON a.id = l.audit_id
+      WHERE l.status <> 'completed'
+        AND (a.id IS NULL
+             OR (COALESCE(a.auditor_id, 0), a.risk_audit_tier, a.status) <> (l.auditor_id, l.risk_audit_tier, l.status)
+             OR l.scores <> COALESCE((SELECT jsonb_object_agg(s.scores_category, s.score)
+                                      FROM scores s WHERE s.audit_id = a.id), '{}'))
+    )
+    SELECT id FROM changed WHERE id > $3 ORDER BY id LIMIT $4
+"""
+
+# Applies one batch of audit ids ($1, a JSON array): each audit whose current row
+# differs from its ledger row contributes -1 x the ledger row and +1 x the current
+# one. Risk levels follow getRiskLevel in lib/scoring.ts.
+APPLY_BATCH_SQL = """
+    WITH ids AS (
+      SELECT jsonb_array_elements_text($1::jsonb)::int AS audit_id
+    ), cur AS (
+      SELECT a.id AS audit_id, COALESCE(a.auditor_id, 0) AS auditor_id, a.risk_audit_tier, a.status,
+             COALESCE((SELECT jsonb_object_agg(s.scores_category, s.score)
+                       FROM scores s WHERE s.audit_id = a.id), '{}') AS scores
+      FROM audits a JOIN ids ON ids.audit_id = a.id
+    ), old AS (
+      SELECT l.audit_id, l.auditor_id, l.risk_audit_tier, l.status, l.scores
+      FROM dashboard_rollup_ledger l JOIN ids ON ids.audit_id = l.audit_id
+    ), changes AS (
+      SELECT cur.*, 1 AS sign
+      FROM cur LEFT JOIN old ON old.audit_id = cur.audit_id
+      WHERE (cur.auditor_id, cur.risk_audit_tier, cur.status, cur.scores)
+            IS DISTINCT FROM (old.auditor_id, old.risk_audit_tier, old.status, old.scores)
+      UNION ALL
+      SELECT old.*, -1 AS sign
+      FROM old LEFT JOIN cur ON cur.audit_id = old.audit_id
+      WHERE (cur.auditor_id, cur.risk_audit_tier, cur.status, cur.scores)
+            IS DISTINCT FROM (old.auditor_id, old.risk_audit_tier, old.status, old.scores)
+    ), score_changes AS (
+      SELECT c.auditor_id, c.risk_audit_tier, c.status, s.key AS scores_category,
+             (s.value #>> '{}')::numeric AS score, c.sign
+      FROM changes c CROSS JOIN jsonb_each(c.scores) AS s
+    ), audit_deltas AS (
+      INSERT INTO dashboard_audit_rollups (auditor_id, risk_audit_tier, status, audit_count, updated_at)
+      SELECT auditor_id, risk_audit_tier, status, SUM(sign), NOW()
+      FROM changes
+      GROUP BY auditor_id, risk_audit_tier, status
+      HAVING SUM(sign) <> 0
+      ON CONFLICT (auditor_id, risk_audit_tier, status) DO UPDATE SET
+        audit_count = dashboard_audit_rollups.audit_count + EXCLUDED.audit_count,
+        updated_at = NOW()
+      RETURNING 1
+    ), score_deltas AS (
+      INSERT INTO dashboard_score_rollups (
+        auditor_id, risk_audit_tier, status, scores_category, score_count, score_sum,
+        low_risk_count, medium_risk_count, high_risk_count, updated_at
+      )
+      SELECT auditor_id, risk_audit_tier, status, scores_category, SUM(sign), SUM(sign * score),
+             COALESCE(SUM(sign) FILTER (WHERE score >= 7.5), 0),
+             COALESCE(SUM(sign) FILTER (WHERE score >= 4.0 AND score < 7.5), 0),
+             COALESCE(SUM(sign) FILTER (WHERE score < 4.0), 0),
+             NOW()
+      FROM score_changes
+      GROUP BY auditor_id, risk_audit_tier, status, scores_category
+      -- A group can net out in count and sum while audits move between risk levels
+      HAVING SUM(sign) <> 0 OR SUM(sign * score) <> 0
+          OR COALESCE(SUM(sign) FILTER (WHERE score >= 7.5), 0) <> 0
+          OR COALESCE(SUM(sign) FILTER (WHERE score >= 4.0 AND score < 7.5), 0) <> 0
+          OR COALESCE(SUM(sign) FILTER (WHERE score < 4.0), 0) <> 0
+      ON CONFLICT (auditor_id, risk_audit_tier, status, scores_category) DO UPDATE SET
+        score_count = dashboard_score_rollups.score_count + EXCLUDED.score_count,
+        score_sum = dashboard_score_rollups.score_sum + EXCLUDED.score_sum,
+        low_risk_count = dashboard_score_rollups.low_risk_count + EXCLUDED.low_risk_count,
+        medium_risk_count = dashboard_score_rollups.medium_risk_count + EXCLUDED.medium_risk_count,
+        high_risk_count = dashboard_score_rollups.high_risk_count + EXCLUDED.high_risk_count,
+        updated_at = NOW()
+      RETURNING 1
+    ), counted AS (
+      INSERT INTO dashboard_rollup_ledger (audit_id, auditor_id, risk_audit_tier, status, scores, counted_at)
+      SELECT audit_id, auditor_id, risk_audit_tier, status, scores, NOW()
+      FROM changes WHERE sign = 1
+      ON CONFLICT (audit_id) DO UPDATE SET
+        auditor_id = EXCLUDED.auditor_id,
+        risk_audit_tier = EXCLUDED.risk_audit_tier,
+        status = EXCLUDED.status,
+        scores = EXCLUDED.scores,
+        counted_at = NOW()
+      RETURNING 1
+    ), removed AS (
+      DELETE FROM dashboard_rollup_ledger l
+      USING old
+      WHERE l.audit_id = old.audit_id
+        AND NOT EXISTS (SELECT 1 FROM cur WHERE cur.audit_id = old.audit_id)
+      RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM counted) AS counted,
+           (SELECT COUNT(*) FROM removed) AS removed,
+           (SELECT COUNT(*) FROM audit_deltas) + (SELECT COUNT(*) FROM score_deltas) AS rollup_rows
+"""
+
+
+def apply_batch(ids):
+    """Fold one batch of audits into the rollups; returns (audits counted, audits removed, rollup rows written)."""
+    # Replaying a batch finds nothing left to change, so an ambiguous failure can be retried
+    results = run_sql_batch([(LOCK_SQL, None), (APPLY_BATCH_SQL, [json.dumps(ids)])], idempotent=True)
+    row = results[1]["rows"][0]
+    return int(row["counted"]), int(row["removed"]), int(row["rollup_rows"])
+
+
+def run_pass(batch_size, lag, rebuild):
+    """One pass over the audits that may have changed; returns (counted, removed, rollup rows, high-water mark)."""
+    state = run_sql(STATE_SQL, [STATE_NAME, lag])["rows"][0]
+    high_water_mark, upper_bound = state["high_water_mark"], state["upper_bound"]
+    if rebuild or high_water_mark is None:
+        run_sql_batch([(LOCK_SQL, None)] + [(statement, None) for statement in RESET_SQL])
+        high_water_mark = None
+    elif upper_bound <= high_water_mark:
+        return 0, 0, 0, high_water_mark
+
+    counted = removed = rollup_rows = 0
+    after = 0
+    while True:
+        if high_water_mark is None:
+            rows = run_sql(ALL_AUDITS_SQL, [after, batch_size])["rows"]
+        else:
+            rows = run_sql(CHANGED_AUDITS_SQL, [high_water_mark, upper_bound, after, batch_size])["rows"]
+        if not rows:
+            break
+        ids = [int(r["id"]) for r in rows]
+        batch_counted, batch_removed, batch_rollup_rows = apply_batch(ids)
+        counted += batch_counted
+        removed += batch_removed
+        rollup_rows += batch_rollup_rows
+        after = ids[-1]
+
+    run_sql(SAVE_STATE_SQL, [STATE_NAME, upper_bound])
+    return counted, removed, rollup_rows, upper_bound
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the dashboard rollup tables incrementally.")
+    parser.add_argument("--batch-size", type=int, default=500, help="audits per transaction (default: 500)")
+    parser.add_argument("--lag", type=float, default=60.0,
+                        help="seconds behind NOW() the high-water mark stays, for in-flight transactions (default: 60)")
+    parser.add_argument("--interval", type=float, default=60.0, help="seconds between passes (default: 60)")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    parser.add_argument("--rebuild", action="store_true", help="clear the rollups and recount every audit first")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+    if args.batch_size < 1 or args.lag < 0:
+        parser.error("--batch-size must be at least 1 and --lag not negative")
+
+    print(f"=== Dashboard rollups (batches of {args.batch_size}, lag {args.lag:g}s) ===")
+    rebuild = args.rebuild
+    while True:
+        started = time.time()
+        counted, removed, rollup_rows, high_water_mark = run_pass(args.batch_size, args.lag, rebuild)
+        if counted or removed or rebuild:
+            print(f"=== Pass: {counted} audits counted, {removed} removed, {rollup_rows} rollup rows "
+                  f"updated in {time.time() - started:.1f}s (up to {high_water_mark}) ===")
+        rebuild = False
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
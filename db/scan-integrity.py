@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""Scan the audit and catalog tables for integrity problems, chunk by chunk.
+
+Every check splits its table into id ranges of --chunk-size and scans the
+ranges in --workers parallel read-only transactions, so no statement touches
+more than one range. Checks:
+
+  duplicate-options    answer options repeated for a template (same text, value
+                       and example flag)
+  orphan-responses     form_responses (archived ones included) whose
+                       question_id has no template (unknown) or only
+                       inactive ones (inactive; submit accepts these, so
+                       they are reported as warnings)
+  score-mismatch       audits whose scores rows disagree with their responses
+                       under the lib/scoring.ts rules and the live catalog
+  orphan-notes         notes (archived ones included) whose question_id has
+                       no template
+
+Responses and notes are read through form_responses_all and notes_all when
+the archive exists (db/add-response-archive.sql).
+
+Findings are printed and, with --json, written as a machine-readable report.
+--fix applies the fixes for the named checks in transactions of at most
+--fix-batch-size rows, each statement addressing rows by primary key under a
+short lock_timeout, so no fix holds locks for long:
+
+  duplicate-options    delete the extra copies (keeping the lowest id),
+                       resequence option_order of the affected templates,
+                       bump their updated_at and clear the tier bundles
+  orphan-responses     delete responses to unknown questions (live or archived)
+  score-mismatch       rewrite the audit's scores rows
+
+Orphan notes are auditor content and are only reported.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from neon_client import CONN_STR, NeonError, get_pool, run_sql, run_sql_batch, with_archive
+from scoring import to_fixed
+from sql_trace import add_trace_arguments, install_from_args
+
+if not CONN_STR:
+    print("ERROR: POSTGRES_URL environment variable is not set.")
+    exit(1)
+
+OVERALL_CATEGORY = "Overall"
+MIN_SCORE = 1.0  # scores.score CHECK constraint
+SCORE_TOLERANCE = 0.011
+LOCK_TIMEOUT = "SET LOCAL lock_timeout = '2s'"
+
+DUPLICATE_OPTIONS_SQL = """
+    SELECT qao.question_template_id AS template_id, qt.question_number, qao.option_text,
+           qao.score_value, COALESCE(qao.is_example, FALSE) AS is_example,
+           json_agg(qao.id ORDER BY qao.id) AS ids
+    FROM question_answer_options qao
+    JOIN question_templates qt ON qt.id = qao.question_template_id
+    WHERE qao.question_template_id >= $1 AND qao.question_template_id < $2
+    GROUP BY qao.question_template_id, qt.question_number, qao.option_text, qao.score_value,
+             COALESCE(qao.is_example, FALSE)
+    HAVING COUNT(*) > 1
+"""
+
+# {form_responses} and {notes} are the *_all views once the archive exists, else the live tables
+ORPHAN_RESPONSES_SQL = """
+    SELECT fr.id, fr.audit_id, fr.question_id, COUNT(qt.id) AS templates
+    FROM {form_responses} fr
+    LEFT JOIN question_templates qt ON qt.question_number = fr.question_id
+    WHERE fr.id >= $1 AND fr.id < $2
+    GROUP BY fr.id
+    HAVING NOT COALESCE(bool_or(qt.is_active), FALSE)
+"""
+
+ORPHAN_NOTES_SQL = """
+    SELECT n.id, n.audit_id, n.question_id
+    FROM {notes} n
+    WHERE n.id >= $1 AND n.id < $2
+      AND NOT EXISTS (SELECT 1 FROM question_templates qt WHERE qt.question_number = n.question_id)
+"""
+
+AUDIT_SCORES_SQL = """
+    SELECT a.id, a.risk_audit_tier AS tier,
+           (SELECT json_object_agg(fr.question_id, fr.answer_value)
+            FROM {form_responses} fr WHERE fr.audit_id = a.id) AS answers,
+           (SELECT json_object_agg(s.scores_category, s.score)
+            FROM scores s WHERE s.audit_id = a.id) AS scores
+    FROM audits a
+    WHERE a.id >= $1 AND a.id < $2
+      AND EXISTS (SELECT 1 FROM scores s WHERE s.audit_id = a.id)
+"""
+
+TEMPLATES_SQL = """
+    SELECT question_number, category, weight, applicable_tiers
+    FROM question_templates WHERE is_active = TRUE
+"""
+
+ID_LIST = "(SELECT jsonb_array_elements_text($1::jsonb)::int)"
+
+RESEQUENCE_OPTIONS_SQL = f"""
+    WITH ranked AS (
+      SELECT id, ROW_NUMBER() OVER (PARTITION BY question_template_id ORDER BY option_order, id) AS new_order
+      FROM question_answer_options
+      WHERE question_template_id IN {ID_LIST}
+    )
+    UPDATE question_answer_options qao
+    SET option_order = ranked.new_order
+    FROM ranked
+    WHERE qao.id = ranked.id AND qao.option_order <> ranked.new_order
+"""
+
+# Catalog fingerprints (query_cache.py) follow updated_at; bundles are rebuilt by the next seed
+TOUCH_TEMPLATES_SQL = f"UPDATE question_templates SET updated_at = NOW() WHERE id IN {ID_LIST}"
+CLEAR_TIER_BUNDLES_SQL = "DELETE FROM question_tier_bundles"
+
+UPSERT_SCORES_SQL = """
+    INSERT INTO scores (audit_id, scores_category, score, created_at)
+    SELECT (s->>'a')::int, s->>'c', (s->>'s')::numeric, NOW()
+    FROM jsonb_array_elements($1::jsonb) AS s
+    ON CONFLICT (audit_id, scores_category)
+    DO UPDATE SET score = EXCLUDED.score
+"""
+
+DELETE_SCORES_SQL = """
+    DELETE FROM scores
+    WHERE (audit_id, scores_category) IN (
+      SELECT (s->>'a')::int, s->>'c' FROM jsonb_array_elements($1::jsonb) AS s
+    )
+"""
+
+
+class TierScorer:
+    """Expected category and Overall scores per tier, from the active templates."""
+
+    def __init__(self, templates):
+        self.tiers = {}
+        for t in templates:
+            weight = float(t["weight"])
+            for tier in t["applicable_tiers"] or []:
+                categories = self.tiers.setdefault(tier, {})
+                categories.setdefault(t["category"], {})[t["question_number"]] = weight
+
+    def expected(self, tier, answers):
+        categories = self.tiers.get(tier)
+        if not categories:
+            return None
+        scores = {}
+        for category, weights in categories.items():
+            total_weight = sum(weights.values())
+            total = sum(answers[qid] * w for qid, w in weights.items() if qid in answers)
+            scores[category] = to_fixed(total / total_weight) if total_weight > 0 else 0.0
+        scores[OVERALL_CATEGORY] = to_fixed(sum(scores.values()) / len(scores))
+        # Values below 1.0 cannot be stored (see rescore-audits.py)
+        return {c: s for c, s in scores.items() if s >= MIN_SCORE}
+
+
+def check_duplicate_options(lo, hi, context):
+    findings = []
+    for r in run_sql_batch([(DUPLICATE_OPTIONS_SQL, [lo, hi])], read_only=True)[0]["rows"]:
+        ids = [int(i) for i in r["ids"]]
+        findings.append({
+            "check": "duplicate-options", "severity": "error", "table": "question_answer_options",
+            "ids": ids[1:], "keep": ids[0], "template_id": int(r["template_id"]),
+            "detail": f"Q{r['question_number']} option {r['option_text'][:40]!r} "
+                      f"(value {r['score_value']}) appears {len(ids)} times",
+        })
+    return findings
+
+
+def check_orphan_responses(lo, hi, context):
+    findings = []
+    sql = ORPHAN_RESPONSES_SQL.format(**context["sources"])
+    for r in run_sql_batch([(sql, [lo, hi])], read_only=True)[0]["rows"]:
+        unknown = int(r["templates"]) == 0
+        findings.append({
+            "check": "orphan-responses", "severity": "error" if unknown else "warning",
+            "table": "form_responses", "ids": [int(r["id"])], "audit_id": int(r["audit_id"]),
+            "kind": "unknown" if unknown else "inactive",
+            "detail": f"audit {r['audit_id']} answers {'unknown' if unknown else 'deactivated'} "
+                      f"question {r['question_id']!r}",
+        })
+    return findings
+
+
+def check_orphan_notes(lo, hi, context):
+    sql = ORPHAN_NOTES_SQL.format(**context["sources"])
+    return [{
+        "check": "orphan-notes", "severity": "warning", "table": "notes",
+        "ids": [int(r["id"])], "audit_id": int(r["audit_id"]),
+        "detail": f"note on audit {r['audit_id']} refers to missing question {r['question_id']!r}",
+    } for r in run_sql_batch([(sql, [lo, hi])], read_only=True)[0]["rows"]]
+
+
+def check_score_mismatch(lo, hi, context):
+    findings = []
+    sql = AUDIT_SCORES_SQL.format(**context["sources"])
+    for r in run_sql_batch([(sql, [lo, hi])], read_only=True)[0]["rows"]:
+        stored = {c: float(s) for c, s in (r["scores"] or {}).items()}
+        expected = context["scorer"].expected(r["tier"], r["answers"] or {})
+        if expected is None:
+            continue
+        differs = sorted(
+            c for c in set(stored) | set(expected)
+            if c not in stored or c not in expected or abs(stored[c] - expected[c]) > SCORE_TOLERANCE
+        )
+        if differs:
+            findings.append({
+                "check": "score-mismatch", "severity": "error", "table": "scores",
+                "ids": [int(r["id"])], "audit_id": int(r["id"]),
+                "stored": stored, "expected": expected,
+                "detail": f"audit {r['id']}: " + ", ".join(
+                    f"{c} {stored.get(c, '-')} vs {expected.get(c, '-')}" for c in differs),
+            })
+    return findings
+
+
+# check name -> (function, table the ranges are taken from, column the ranges are on)
+CHECKS = {
+    "duplicate-options": (check_duplicate_options, "question_answer_options", "question_template_id"),
+    "orphan-responses": (check_orphan_responses, "form_responses", "id"),
+    "score-mismatch": (check_score_mismatch, "audits", "id"),
+    "orphan-notes": (check_orphan_notes, "notes", "id"),
+}
+
+
+def id_ranges(table, column, chunk_size):
+    row = run_sql(f"SELECT MIN({column}) AS lo, MAX({column}) AS hi, COUNT(*) AS n FROM {table}")["rows"][0]
+    if row["lo"] is None:
+        return [], 0
+    lo, hi = int(row["lo"]), int(row["hi"])
+    return [(start, min(start + chunk_size, hi + 1)) for start in range(lo, hi + 1, chunk_size)], int(row["n"])
+
+
+def scan(checks, context, chunk_size, workers):
+    """Run the checks over all their ranges in parallel; returns (findings, per-check summary)."""
+    tasks = []
+    summary = {}
+    for name in checks:
+        fn, table, column = CHECKS[name]
+        ranges, rows = id_ranges(context["sources"].get(table, table), column, chunk_size)
+        summary[name] = {"table": table, "rows": rows, "chunks": len(ranges), "findings": 0, "seconds": 0.0}
+        tasks += [(name, fn, lo, hi) for lo, hi in ranges]
+
+    def run_chunk(task):
+        name, fn, lo, hi = task
+        started = time.perf_counter()
+        return name, fn(lo, hi, context), time.perf_counter() - started
+
+    findings = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for name, chunk_findings, seconds in executor.map(run_chunk, tasks):
+            findings += chunk_findings
+            summary[name]["findings"] += len(chunk_findings)
+            summary[name]["seconds"] += seconds
+    return findings, summary
+
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fix_statements(check, group, context):
+    """Statements fixing one batch of findings of one check."""
+    if check == "duplicate-options":
+        ids = [i for f in group for i in f["ids"]]
+        templates = json.dumps(sorted({f["template_id"] for f in group}))
+        return [(f"DELETE FROM question_answer_options WHERE id IN {ID_LIST}", [json.dumps(ids)]),
+                (RESEQUENCE_OPTIONS_SQL, [templates]),
+                (TOUCH_TEMPLATES_SQL, [templates]),
+                (CLEAR_TIER_BUNDLES_SQL, None)]
+    if check == "orphan-responses":
+        ids = json.dumps([i for f in group for i in f["ids"]])
+        statements = [(f"DELETE FROM form_responses WHERE id IN {ID_LIST}", [ids])]
+        if context["sources"]["form_responses"] != "form_responses":
+            # Archived rows keep their ids, so an id is in exactly one of the two tables
+            statements.append((f"DELETE FROM form_responses_archive WHERE id IN {ID_LIST}", [ids]))
+        return statements
+    if check == "score-mismatch":
+        upserts = [{"a": f["audit_id"], "c": c, "s": s} for f in group for c, s in f["expected"].items()]
+        stale = [{"a": f["audit_id"], "c": c} for f in group for c in f["stored"] if c not in f["expected"]]
+        statements = [(UPSERT_SCORES_SQL, [json.dumps(upserts)])]
+        if stale:
+            statements.append((DELETE_SCORES_SQL, [json.dumps(stale)]))
+        return statements
+    return []
+
+
+def fixable(finding):
+    if finding["check"] == "orphan-responses":
+        return finding["kind"] == "unknown"
+    return finding["check"] in ("duplicate-options", "score-mismatch")
+
+
+def apply_fixes(findings, fix_checks, batch_size, pause, context):
+    """Apply fixes in short transactions; returns {check: (rows fixed, batches failed)}."""
+    results = {}
+    for check in fix_checks:
+        todo = [f for f in findings if f["check"] == check and fixable(f)]
+        if not todo:
+            continue
+        fixed = 0
+        failed = 0
+        # duplicate-options findings carry several ids each; keep batches near batch_size rows
+        per_batch = max(1, batch_size // max(1, max(len(f["ids"]) for f in todo)))
+        for group in batches(todo, per_batch):
+            try:
+                run_sql_batch([(LOCK_TIMEOUT, None)] + fix_statements(check, group, context))
+                fixed += len(group)
+            except NeonError as e:
+                failed += 1
+                print(f"  FAIL {check} batch of {len(group)}: {e}")
+            if pause:
+                time.sleep(pause)
+        print(f"  OK {check}: {fixed} findings fixed")
+        results[check] = (fixed, failed)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan audit and catalog tables for integrity problems.")
+    parser.add_argument("--checks", nargs="+", choices=list(CHECKS), default=list(CHECKS),
+                        help="checks to run (default: all)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="ids per scanned range (default: 5000)")
+    parser.add_argument("--workers", type=int, default=4, help="ranges scanned in parallel (default: 4)")
+    parser.add_argument("--json", metavar="PATH", help="write the findings report as JSON")
+    parser.add_argument("--fix", nargs="+", choices=["duplicate-options", "orphan-responses", "score-mismatch"],
+                        default=[], help="apply the fixes for these checks")
+    parser.add_argument("--fix-batch-size", type=int, default=100,
+                        help="rows changed per fix transaction (default: 100)")
+    parser.add_argument("--fix-pause", type=float, default=0.05,
+                        help="seconds to pause between fix transactions (default: 0.05)")
+    parser.add_argument("--limit", type=int, default=20, help="findings printed per check (default: 20)")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+    if args.chunk_size < 1 or args.workers < 1 or args.fix_batch_size < 1:
+        parser.error("--chunk-size, --workers and --fix-batch-size must be at least 1")
+    missing = [c for c in args.fix if c not in args.checks]
+    if missing:
+        parser.error(f"--fix {' '.join(missing)} needs the check to run")
+
+    context = {"sources": {table: with_archive(table) for table in ("form_responses", "notes")}}
+    if "score-mismatch" in args.checks:
+        context["scorer"] = TierScorer(run_sql(TEMPLATES_SQL)["rows"])
+
+    pool = get_pool()
+    pool.max_idle = max(pool.max_idle, args.workers)
+    print(f"=== Scanning {', '.join(args.checks)} ({args.workers} workers, ranges of {args.chunk_size}) ===")
+    started = time.time()
+    findings, summary = scan(args.checks, context, args.chunk_size, args.workers)
+    elapsed = time.time() - started
+
+    for name, s in summary.items():
+        status = "OK  " if not s["findings"] else "FAIL"
+        print(f"\n  {status} {name}: {s['findings']} findings in {s['rows']} {s['table']} rows "
+              f"({s['chunks']} chunks)")
+        shown = [f for f in findings if f["check"] == name][:args.limit]
+        for f in shown:
+            print(f"    [{f['severity']}] {f['detail']}")
+        if s["findings"] > len(shown):
+            print(f"    ... {s['findings'] - len(shown)} more")
+    print(f"\n=== Results: {len(findings)} findings in {elapsed:.1f}s ===")
+
+    fixes = {}
+    if args.fix and findings:
+        print(f"\n=== Applying fixes for {', '.join(args.fix)} (batches of {args.fix_batch_size}) ===")
+        fixes = apply_fixes(findings, args.fix, args.fix_batch_size, args.fix_pause, context)
+
+    if args.json:
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(elapsed, 3),
+            "checks": summary,
+            "fixes": {c: {"fixed": fixed, "failed_batches": failed} for c, (fixed, failed) in fixes.items()},
+            "findings": findings,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -51,3 +51,13 @@ CREATE INDEX IF NOT EXISTS idx_question_templates_tiers ON question_templates US
 CREATE INDEX IF NOT EXISTS idx_question_answer_options_template ON question_answer_options(question_template_id);
 CREATE INDEX IF NOT EXISTS idx_question_score_examples_template ON question_score_examples(question_template_id);
 
+
+-- Denormalized per-tier question lists, rebuilt by db/seed-neon.py after a successful seed
+-- and cleared by the admin question endpoints; read by getQuestionsForTier() by primary key
+CREATE TABLE IF NOT EXISTS question_tier_bundles (
+  tier VARCHAR(10) PRIMARY KEY CHECK (tier IN ('tier_0', 'tier_1', 'tier_2', 'tier_3', 'tier_4')),
+  questions JSONB NOT NULL,
+  question_count INTEGER NOT NULL,
+  version_hash VARCHAR(64) NOT NULL,
+  built_at TIMESTAMP DEFAULT NOW()
+);
@@ -64,3 +64,103 @@ CREATE INDEX IF NOT EXISTS idx_scores_category ON scores(scores_category);
 CREATE INDEX IF NOT EXISTS idx_notes_question_id ON notes(question_id);
 CREATE INDEX IF NOT EXISTS idx_notes_audit_question ON notes(audit_id, question_id);
 
+
+-- Archive of old completed audits' responses and notes (see db/add-response-archive.sql);
+-- filled by db/archive-audits.py, read through the *_all views
+ALTER TABLE form_responses ADD COLUMN IF NOT EXISTS comment TEXT;
+
+CREATE TABLE IF NOT EXISTS form_responses_archive (
+  id INTEGER NOT NULL,
+  audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+  question_id VARCHAR(50) NOT NULL,
+  answer_value INTEGER NOT NULL CHECK (answer_value IN (1, 5, 10)),
+  comment TEXT,
+  created_at TIMESTAMP
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS form_responses_archive_default PARTITION OF form_responses_archive DEFAULT;
+
+CREATE TABLE IF NOT EXISTS notes_archive (
+  id INTEGER NOT NULL,
+  audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+  auditor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  question_id VARCHAR(50) NOT NULL,
+  content TEXT NOT NULL,
+  created_at TIMESTAMP
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS notes_archive_default PARTITION OF notes_archive DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_form_responses_archive_audit ON form_responses_archive(audit_id);
+CREATE INDEX IF NOT EXISTS idx_notes_archive_audit ON notes_archive(audit_id);
+-- Keyset paging on id over the *_all views (db/export-analytics.py)
+CREATE INDEX IF NOT EXISTS idx_form_responses_archive_id ON form_responses_archive(id);
+CREATE INDEX IF NOT EXISTS idx_notes_archive_id ON notes_archive(id);
+
+CREATE OR REPLACE VIEW form_responses_all AS
+  SELECT id, audit_id, question_id, answer_value, comment, created_at FROM form_responses
+  UNION ALL
+  SELECT id, audit_id, question_id, answer_value, comment, created_at FROM form_responses_archive;
+
+CREATE OR REPLACE VIEW notes_all AS
+  SELECT id, audit_id, auditor_id, question_id, content, created_at FROM notes
+  UNION ALL
+  SELECT id, audit_id, auditor_id, question_id, content, created_at FROM notes_archive;
+
+-- Precomputed report payloads, written by db/report-worker.py; valid while catalog_version
+-- matches the version_hash of the audit tier's question_tier_bundles row
+CREATE TABLE IF NOT EXISTS audit_report_payloads (
+  audit_id INTEGER PRIMARY KEY REFERENCES audits(id) ON DELETE CASCADE,
+  tier VARCHAR(10) NOT NULL,
+  catalog_version VARCHAR(64) NOT NULL,
+  payload_version INTEGER NOT NULL,
+  payload JSONB NOT NULL,
+  computed_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Dashboard rollups, maintained incrementally by db/rollup-dashboard.py
+CREATE INDEX IF NOT EXISTS idx_audits_auditor_id ON audits(auditor_id);
+CREATE INDEX IF NOT EXISTS idx_audits_submitted_at ON audits(submitted_at);
+CREATE INDEX IF NOT EXISTS idx_scores_created_at ON scores(created_at);
+
+CREATE TABLE IF NOT EXISTS dashboard_audit_rollups (
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  audit_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (auditor_id, risk_audit_tier, status)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_score_rollups (
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  scores_category VARCHAR(100) NOT NULL,
+  score_count INTEGER NOT NULL DEFAULT 0,
+  score_sum DECIMAL(12, 2) NOT NULL DEFAULT 0,
+  low_risk_count INTEGER NOT NULL DEFAULT 0,
+  medium_risk_count INTEGER NOT NULL DEFAULT 0,
+  high_risk_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW(),
+  PRIMARY KEY (auditor_id, risk_audit_tier, status, scores_category)
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_ledger (
+  audit_id INTEGER PRIMARY KEY,
+  auditor_id INTEGER NOT NULL,
+  risk_audit_tier VARCHAR(10) NOT NULL,
+  status VARCHAR(50) NOT NULL,
+  scores JSONB NOT NULL DEFAULT '{}',
+  counted_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Audits that can still change state; re-checked on every run
+CREATE INDEX IF NOT EXISTS idx_dashboard_rollup_ledger_open ON dashboard_rollup_ledger(audit_id)
+  WHERE status <> 'completed';
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_state (
+  name VARCHAR(50) PRIMARY KEY,
+  high_water_mark TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP DEFAULT NOW()
+);
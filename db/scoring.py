@@ -0,0 +1,13 @@
+"""Rounding helpers shared by the scripts that reproduce lib/scoring.ts.
+
+The app rounds with Number(x.toFixed(n)), which rounds half up on the exact
+binary value of x. Python's round() and numpy.round() round half to even
+(7.125 gives 7.12 instead of the app's 7.13), so scores written with them
+disagree with the ones the review route computes.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def to_fixed(value, digits=2):
+    """Number(value.toFixed(digits)) for non-negative values."""
+    return float(Decimal(value).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
@@ -1,477 +1,189 @@
 #!/usr/bin/env python3
-"""Seed/update questions in Neon DB via SQL-over-HTTP API."""
+"""Seed/update questions in Neon DB via SQL-over-HTTP API.
+
+With --targets, the same seed runs against several databases (production,
+staging, preview branches) concurrently and ends with one consolidated
+report. The targets file is a JSON list of objects:
+
+    {"name": "staging", "postgres_url_env": "STAGING_POSTGRES_URL",
+     "neon_url": "https://<endpoint>-pooler.<region>.aws.neon.tech/sql"}
+
+where the connection string is given either directly as "postgres_url" or
+by the name of the environment variable holding it, and "neon_url" and
+"transport" default to NEON_URL and DB_TRANSPORT.
+"""
+import argparse
+import contextvars
+import hashlib
 import json
-import urllib.request
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-NEON_URL = "https://ep-icy-violet-abk4m75a-pooler.eu-west-2.aws.neon.tech/sql"
-CONN_STR = os.environ.get("POSTGRES_URL")
-
-if not CONN_STR:
-    print("ERROR: POSTGRES_URL environment variable is not set.")
-    exit(1)
-
-def run_sql(query, params=None):
-    body = {"query": query}
-    if params:
-        body["params"] = params
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(NEON_URL, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Neon-Connection-String", CONN_STR)
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, context=ctx) as resp:
-        return json.loads(resp.read())
-
-# All 26 questions
-QUESTIONS = [
-    {
-        "id": "1.1", "cat": "Documentation", "sec": "Certificates",
-        "text": "Do you have current copies of ALL of the following for this property: Landlord's Gas Safety Certificate, Landlord's Electrical Safety Certificate (EICR), and Energy Performance Certificate (EPC)?",
-        "critical": True, "weight": 2.0,
-        "comment": "This covers all mandatory safety and compliance certificates including Gas Safety Certificate (annually), Electrical Installation Condition Report (EICR - every 5 years), Portable Appliance Testing (PAT) for landlord-supplied appliances, and Energy Performance Certificate (EPC) with minimum E rating.",
-        "motivation": "These certificates are not administrative formalities — they are legal preconditions to lawful letting and, in some cases, to regaining possession.",
-        "options": [
-            {"value": 10, "label": "I hold current copies of all required certificates (Gas Safety, EICR, EPC) and have clear evidence they were properly served to the tenant."},
-            {"value": 5, "label": "I hold some certificates, but one or more may be expired, missing, or I do not have clear proof they were properly served."},
-            {"value": 1, "label": "I do not hold all required certificates or I am unsure of their status."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "I do not hold all required certificates or I am unsure of their status.", "action": "Immediately obtain valid and in-date Gas Safety, Electrical Safety (EICR), and EPC certificates."},
-            {"level": "medium", "reason": "I hold some certificates, but one or more may be expired, missing, or I do not have clear proof they were properly served.", "action": "Conduct an immediate compliance review to confirm all certificates are current and properly evidenced as served."},
-            {"level": "high", "reason": "I hold current copies of all required certificates.", "action": "Maintain strict renewal monitoring and retain clear evidence that all certificates have been properly served."},
-        ],
-    },
-    {
-        "id": "1.2", "cat": "Documentation", "sec": "Certificates",
-        "text": "Do you track renewal dates for these certificates?",
-        "critical": True, "weight": 2.0,
-        "comment": "Covers statutory safety and energy certification requirements necessary for lawful letting and possession protection.",
-        "motivation": "Compliance is continuous, not a one-time event. Allowing certificates to expire, even briefly, can create legal exposure.",
-        "options": [
-            {"value": 10, "label": "I actively track renewal dates using a structured system with reminders set in advance of expiry."},
-            {"value": 5, "label": "I am aware of renewal dates but rely on memory, ad-hoc reminders, or reactive action."},
-            {"value": 1, "label": "I do not formally track renewal dates and risk certificates expiring without notice."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "I do not formally track renewal dates.", "action": "Implement a formal compliance tracking system immediately."},
-            {"level": "medium", "reason": "I am aware of renewal dates but rely on memory.", "action": "Move from informal tracking to a documented, systemised renewal process."},
-            {"level": "high", "reason": "I actively track renewal dates using a structured system.", "action": "Continue maintaining structured renewal monitoring."},
-        ],
-    },
-    {
-        "id": "1.3", "cat": "Documentation", "sec": "Certificates",
-        "text": "Do you give all your new tenants a copy of the latest 'How To Rent' leaflet?",
-        "critical": True, "weight": 2.0,
-        "comment": "Evaluates procedural strength, evidential protection, and legal defensibility.",
-        "motivation": "Failure to provide the correct How To Rent guide can invalidate Section 21 proceedings. Proof of service is critical.",
-        "options": [
-            {"value": 10, "label": "Provided latest version with proof of service."},
-            {"value": 5, "label": "Provided but no proof retained."},
-            {"value": 1, "label": "Not provided or unsure."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Not provided or unsure.", "action": "Serve the latest How To Rent guide immediately and retain proof."},
-            {"level": "medium", "reason": "Provided but no proof retained.", "action": "Audit version control and service records."},
-            {"level": "high", "reason": "Provided latest version with proof of service.", "action": "Maintain version monitoring and service evidence."},
-        ],
-    },
-    {
-        "id": "2.1", "cat": "Documentation", "sec": "Tenant Manuals & Documents",
-        "text": "Do you provide tenants with a property manual that includes emergency numbers and troubleshooting guide?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates clarity and comprehensiveness of information provided to tenants at tenancy start.",
-        "motivation": "Clear written guidance reduces disputes and liability claims.",
-        "options": [
-            {"value": 10, "label": "Comprehensive written property manual issued."},
-            {"value": 5, "label": "Basic or informal guidance."},
-            {"value": 1, "label": "No manual."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No manual.", "action": "Issue a structured property manual immediately."},
-            {"level": "medium", "reason": "Basic or informal guidance.", "action": "Formalise informal guidance into written format."},
-            {"level": "high", "reason": "Comprehensive written property manual issued.", "action": "Maintain and update the manual regularly."},
-        ],
-    },
-    {
-        "id": "2.3", "cat": "Documentation", "sec": "Tenant Manuals & Documents",
-        "text": "Do you get all your new tenants to sign a Property Inventory and Condition Report?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates procedural strength, evidential protection, and legal defensibility.",
-        "motivation": "In deposit disputes and damage claims, the burden of proof sits with the landlord.",
-        "options": [
-            {"value": 10, "label": "Detailed signed photographic inventory."},
-            {"value": 5, "label": "Inventory lacks detail or signature."},
-            {"value": 1, "label": "No signed inventory."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No signed inventory.", "action": "Immediately implement a detailed, room-by-room photographic inventory process."},
-            {"level": "medium", "reason": "Inventory lacks detail or signature.", "action": "Upgrade your inventory documentation."},
-            {"level": "high", "reason": "Detailed signed photographic inventory.", "action": "Continue maintaining high-standard photographic inventories."},
-        ],
-    },
-    {
-        "id": "3.1", "cat": "Documentation", "sec": "Council Required Documents",
-        "text": "Have you formally reviewed and confirmed that this property complies with all applicable local HMO licensing and management regulations?",
-        "critical": True, "weight": 2.0,
-        "comment": "Assesses whether the property has the correct HMO licence for its size and location.",
-        "motivation": "HMO non-compliance can result in fines, rent repayment orders, or prosecution.",
-        "options": [
-            {"value": 10, "label": "Fully checked and compliant with local HMO rules."},
-            {"value": 5, "label": "Aware but not fully verified."},
-            {"value": 1, "label": "Not checked."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Not checked.", "action": "Confirm licensing requirements immediately."},
-            {"level": "medium", "reason": "Aware but not fully verified.", "action": "Conduct structured local authority compliance review."},
-            {"level": "high", "reason": "Fully checked and compliant.", "action": "Monitor regulatory updates regularly."},
-        ],
-    },
-    {
-        "id": "4.1", "cat": "Documentation", "sec": "Tenant Responsibilities",
-        "text": "Do you have documented cleaning rotas and tenant responsibilities for shared areas?",
-        "critical": False, "weight": 1.0,
-        "comment": "Covers documentation and communication of tenant responsibilities for shared areas.",
-        "motivation": "Shared space disputes escalate quickly and often trigger complaints to the local authority.",
-        "options": [
-            {"value": 10, "label": "Formal written cleaning rota clearly allocating responsibilities, acknowledged by tenants."},
-            {"value": 5, "label": "Informal or partially written rota without clear acknowledgment."},
-            {"value": 1, "label": "No structured or documented cleaning rota."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No structured cleaning rota.", "action": "Establish a written, enforceable cleaning rota immediately."},
-            {"level": "medium", "reason": "Informal rota without acknowledgment.", "action": "Formalise into a documented rota."},
-            {"level": "high", "reason": "Formal written cleaning rota acknowledged by tenants.", "action": "Maintain structured cleaning rotas."},
-        ],
-    },
-    {
-        "id": "5.1", "cat": "Documentation", "sec": "Tenant Critical Information",
-        "text": "Are fire escape routes clearly marked and emergency contact numbers prominently displayed?",
-        "critical": True, "weight": 2.0,
-        "comment": "Assesses provision and accessibility of critical safety information to tenants.",
-        "motivation": "Inadequate fire signage increases liability exposure and can result in enforcement action.",
-        "options": [
-            {"value": 10, "label": "Clearly marked fire escape routes with prominently displayed emergency contact details."},
-            {"value": 5, "label": "Basic signage but inconsistent visibility or placement."},
-            {"value": 1, "label": "No clear signage or emergency contact display."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No clear signage or emergency contact display.", "action": "Install compliant signage and display emergency contacts immediately."},
-            {"level": "medium", "reason": "Basic signage but inconsistent.", "action": "Review positioning and clarity of existing signage."},
-            {"level": "high", "reason": "Clearly marked fire escape routes.", "action": "Continue periodic checks of signage visibility."},
-        ],
-    },
-    {
-        "id": "6.1", "cat": "Documentation", "sec": "Fire Safety Documentation",
-        "text": "Do you have a current Fire Risk Assessment and records of regular alarm testing?",
-        "critical": True, "weight": 2.0,
-        "comment": "Covers comprehensive fire safety documentation including current FRA and alarm testing records.",
-        "motivation": "A missing or outdated Fire Risk Assessment can lead to prosecution, unlimited fines, or prohibition notices.",
-        "options": [
-            {"value": 10, "label": "Current Fire Risk Assessment with documented alarm testing records."},
-            {"value": 5, "label": "FRA exists but outdated or testing logs inconsistent."},
-            {"value": 1, "label": "No current FRA or documented alarm testing."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No current FRA.", "action": "Commission an updated Fire Risk Assessment immediately."},
-            {"level": "medium", "reason": "FRA outdated or testing logs inconsistent.", "action": "Review FRA validity and formalise alarm testing documentation."},
-            {"level": "high", "reason": "Current FRA with documented testing.", "action": "Maintain scheduled reviews and documented safety testing."},
-        ],
-    },
-    {
-        "id": "7.1", "cat": "Documentation", "sec": "Landlord Alert/Reminder System",
-        "text": "What system do you use to track critical compliance deadlines and certificate renewals?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates the robustness of the system used to track compliance deadlines.",
-        "motivation": "Missed compliance deadlines can invalidate certificates and undermine possession rights.",
-        "options": [
-            {"value": 10, "label": "Formal compliance tracking system with advance reminders."},
-            {"value": 5, "label": "Basic calendar reminders but no structured tracking."},
-            {"value": 1, "label": "No formal deadline tracking system."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No formal tracking.", "action": "Adopt a formal compliance tracking system immediately."},
-            {"level": "medium", "reason": "Basic calendar reminders.", "action": "Upgrade to a documented tracking system."},
-            {"level": "high", "reason": "Formal compliance tracking.", "action": "Maintain disciplined monitoring and review cycles."},
-        ],
-    },
-    {
-        "id": "8.1", "cat": "Documentation", "sec": "Tenant Information",
-        "text": "How do you store tenant personal information and ensure GDPR compliance?",
-        "critical": False, "weight": 1.0,
-        "comment": "Assesses secure storage and management of tenant personal information.",
-        "motivation": "Improper handling of tenant data can result in ICO penalties and fines.",
-        "options": [
-            {"value": 10, "label": "Secure, access-controlled storage with documented GDPR policy."},
-            {"value": 5, "label": "Basic storage but no formal GDPR framework."},
-            {"value": 1, "label": "Informal storage with no compliance controls."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Informal storage.", "action": "Implement secure storage protocols immediately."},
-            {"level": "medium", "reason": "Basic storage.", "action": "Formalise existing storage practices."},
-            {"level": "high", "reason": "Secure storage with GDPR policy.", "action": "Maintain ongoing GDPR compliance reviews."},
-        ],
-    },
-    {
-        "id": "9.1", "cat": "Landlord-Tenant Communication", "sec": "Day-to-day Communication System",
-        "text": "What is your primary method for routine communication with tenants?",
-        "critical": False, "weight": 1.0,
-        "comment": "Assesses the primary method for routine communication with tenants.",
-        "motivation": "In disputes, undocumented communication is effectively non-existent.",
-        "options": [
-            {"value": 10, "label": "Primary communication channel is written and fully retained."},
-            {"value": 5, "label": "Mixed written and verbal communication."},
-            {"value": 1, "label": "Primarily verbal with no records retained."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Primarily verbal.", "action": "Standardise all key communication to written channels."},
-            {"level": "medium", "reason": "Mixed written and verbal.", "action": "Reduce reliance on verbal communication."},
-            {"level": "high", "reason": "Written and fully retained.", "action": "Maintain disciplined written communication practices."},
-        ],
-    },
-    {
-        "id": "10.1", "cat": "Landlord-Tenant Communication", "sec": "Behaviour Reporting Procedure/System",
-        "text": "How do you handle sensitive issues between tenants while respecting privacy?",
-        "critical": False, "weight": 1.0,
-        "comment": "Assesses the sensitivity and appropriateness of dispute-handling procedures.",
-        "motivation": "Poorly managed disputes can escalate into harassment claims or enforcement scrutiny.",
-        "options": [
-            {"value": 10, "label": "Structured written dispute-handling procedure with documentation."},
-            {"value": 5, "label": "Informal mediation with limited documentation."},
-            {"value": 1, "label": "Reactive and undocumented handling."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Reactive and undocumented.", "action": "Formalise written dispute-handling procedures."},
-            {"level": "medium", "reason": "Informal mediation.", "action": "Document and standardise current practices."},
-            {"level": "high", "reason": "Structured written procedure.", "action": "Maintain structured dispute documentation."},
-        ],
-    },
-    {
-        "id": "10.2", "cat": "Landlord-Tenant Communication", "sec": "Behaviour Reporting Procedure/System",
-        "text": "Do you encourage tenants to record problems when they happen with evidence?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates whether tenants are encouraged to report and record problems.",
-        "motivation": "Early documented evidence prevents exaggerated retrospective claims.",
-        "options": [
-            {"value": 10, "label": "Tenants formally instructed to submit documented evidence."},
-            {"value": 5, "label": "Encouraged informally."},
-            {"value": 1, "label": "No structured evidence reporting process."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No structured reporting.", "action": "Introduce formal documented issue reporting."},
-            {"level": "medium", "reason": "Encouraged informally.", "action": "Standardise how tenants submit evidence."},
-            {"level": "high", "reason": "Formally instructed.", "action": "Maintain structured evidence retention."},
-        ],
-    },
-    {
-        "id": "11.1", "cat": "Landlord-Tenant Communication", "sec": "Cleanliness",
-        "text": "How do you communicate cleanliness expectations and standards to tenants?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates how effectively cleanliness expectations are communicated.",
-        "motivation": "Without clear written standards, landlords struggle to enforce standards fairly.",
-        "options": [
-            {"value": 10, "label": "Written cleanliness standards issued at tenancy start and acknowledged."},
-            {"value": 5, "label": "Verbal or informal written guidance only."},
-            {"value": 1, "label": "No clearly communicated standards."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No communicated standards.", "action": "Formalise cleanliness standards immediately."},
-            {"level": "medium", "reason": "Verbal or informal.", "action": "Introduce inspection logs and documented follow-up."},
-            {"level": "high", "reason": "Written standards acknowledged.", "action": "Maintain written standards with routine inspections."},
-        ],
-    },
-    {
-        "id": "12.1", "cat": "Landlord-Tenant Communication", "sec": "Cleaning Products",
-        "text": "Who is responsible for purchasing cleaning products and household supplies?",
-        "critical": False, "weight": 1.0,
-        "comment": "Covers clear communication of policies regarding who purchases cleaning products.",
-        "motivation": "Ambiguity around who buys supplies leads to deterioration and disputes.",
-        "options": [
-            {"value": 10, "label": "Cleaning supply responsibility clearly defined in tenancy documentation."},
-            {"value": 5, "label": "Informally agreed but not documented."},
-            {"value": 1, "label": "No defined responsibility."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No defined responsibility.", "action": "Implement a written cleaning-supply system."},
-            {"level": "medium", "reason": "Informally agreed.", "action": "Formalise your arrangement in writing."},
-            {"level": "high", "reason": "Clearly defined in documentation.", "action": "Maintain documented purchasing system."},
-        ],
-    },
-    {
-        "id": "13.1", "cat": "Landlord-Tenant Communication", "sec": "Rotas",
-        "text": "How do you manage cleaning rotas and bin collection schedules?",
-        "critical": False, "weight": 1.0,
-        "comment": "Assesses the effectiveness of communication regarding various rotas.",
-        "motivation": "Poorly managed rotas are a common trigger for neighbour complaints and authority scrutiny.",
-        "options": [
-            {"value": 10, "label": "Written rota and bin schedule acknowledged by tenants."},
-            {"value": 5, "label": "Informal system without documentation."},
-            {"value": 1, "label": "No structured management system."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No structured system.", "action": "Formalise cleaning rota and bin schedule."},
-            {"level": "medium", "reason": "Informal system.", "action": "Add documentation and scheduled reminders."},
-            {"level": "high", "reason": "Written rota acknowledged.", "action": "Maintain structured rota."},
-        ],
-    },
-    {
-        "id": "14.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Room Inspections Log",
-        "text": "How often do you inspect individual tenant rooms and what records do you keep?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates the system for conducting and recording regular inspections.",
-        "motivation": "Room inspections must be handled professionally and lawfully.",
-        "options": [
-            {"value": 10, "label": "Scheduled room inspections with detailed written and photographic records."},
-            {"value": 5, "label": "Inspections occur but limited documentation."},
-            {"value": 1, "label": "Rare or undocumented inspections."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Rare or undocumented.", "action": "Formalise a six-monthly room inspection process."},
-            {"level": "medium", "reason": "Limited documentation.", "action": "Strengthen current inspection approach."},
-            {"level": "high", "reason": "Scheduled inspections with records.", "action": "Continue scheduled inspections with proper notice."},
-        ],
-    },
-    {
-        "id": "15.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Room Inventory",
-        "text": "Do you create detailed inventory reports at check-in and check-out with photographic evidence?",
-        "critical": False, "weight": 1.5,
-        "comment": "Comprehensive documentation of room condition and contents.",
-        "motivation": "Without strong inventory evidence, deposit deductions are difficult to defend.",
-        "options": [
-            {"value": 10, "label": "Detailed photographic inventories at check-in and check-out, signed and dated."},
-            {"value": 5, "label": "Inventory exists but lacks sufficient detail or photos."},
-            {"value": 1, "label": "No formal inventory procedure."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No formal inventory.", "action": "Adopt detailed photographic inventories immediately."},
-            {"level": "medium", "reason": "Inventory lacks detail.", "action": "Enhance detail and photographic coverage."},
-            {"level": "high", "reason": "Detailed photographic inventories.", "action": "Maintain high-standard inventory documentation."},
-        ],
-    },
-    {
-        "id": "16.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Tenant's Property Repair Logging System",
-        "text": "How do tenants report maintenance issues and how do you track them?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates the system for tenants to report maintenance issues.",
-        "motivation": "Maintenance reporting must be structured, logged, and actively managed.",
-        "options": [
-            {"value": 10, "label": "Structured written reporting system with tracked maintenance log."},
-            {"value": 5, "label": "Reports accepted but no consistent tracking."},
-            {"value": 1, "label": "Informal verbal reporting only."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Informal verbal reporting.", "action": "Introduce a structured maintenance log."},
-            {"level": "medium", "reason": "No consistent tracking.", "action": "Standardise repair logs."},
-            {"level": "high", "reason": "Structured written system.", "action": "Continue maintaining detailed logs."},
-        ],
-    },
-    {
-        "id": "16.2", "cat": "Evidence Gathering Systems and Procedures", "sec": "Property Maintenance Log",
-        "text": "Do you maintain detailed records of maintenance work from start to completion?",
-        "critical": False, "weight": 1.0,
-        "comment": "Detailed tracking of maintenance work from report through to completion.",
-        "motivation": "Maintenance documentation must cover the full lifecycle of a repair.",
-        "options": [
-            {"value": 10, "label": "Full lifecycle documentation of maintenance from report to completion."},
-            {"value": 5, "label": "Partial documentation."},
-            {"value": 1, "label": "Minimal or no maintenance records."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Minimal or no records.", "action": "Introduce full repair lifecycle tracking."},
-            {"level": "medium", "reason": "Partial documentation.", "action": "Strengthen current documentation."},
-            {"level": "high", "reason": "Full lifecycle documentation.", "action": "Continue detailed repair lifecycle documentation."},
-        ],
-    },
-    {
-        "id": "17.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Shared Spaces Inspection Log",
-        "text": "How often do you inspect shared spaces like kitchens and bathrooms?",
-        "critical": False, "weight": 1.0,
-        "comment": "Regular inspection and documentation of shared spaces.",
-        "motivation": "Shared spaces present a higher management risk in HMOs.",
-        "options": [
-            {"value": 10, "label": "Scheduled shared-area inspections with written and photographic records."},
-            {"value": 5, "label": "Inspections occur but limited documentation."},
-            {"value": 1, "label": "Rare or reactive inspections."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Rare or reactive.", "action": "Implement a shared-space inspection schedule."},
-            {"level": "medium", "reason": "Limited documentation.", "action": "Define inspection intervals."},
-            {"level": "high", "reason": "Scheduled inspections with records.", "action": "Maintain consistent inspections."},
-        ],
-    },
-    {
-        "id": "18.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "External Property Inspection Log",
-        "text": "How often do you inspect the exterior of the property and grounds?",
-        "critical": False, "weight": 1.0,
-        "comment": "Regular inspection of property exterior.",
-        "motivation": "Exterior maintenance is a preventative risk-control function.",
-        "options": [
-            {"value": 10, "label": "Regular documented exterior inspections."},
-            {"value": 5, "label": "Occasional checks without formal records."},
-            {"value": 1, "label": "Rare or no exterior inspections."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "Rare or no inspections.", "action": "Introduce a documented seasonal exterior inspection programme."},
-            {"level": "medium", "reason": "Occasional checks.", "action": "Formalise exterior inspection timing."},
-            {"level": "high", "reason": "Regular documented inspections.", "action": "Maintain preventative exterior inspection programme."},
-        ],
-    },
-    {
-        "id": "19.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Tenant Behaviour Log",
-        "text": "How do you record and manage tenant behavior issues and complaints?",
-        "critical": False, "weight": 1.0,
-        "comment": "Evaluates the system for recording and managing tenant behavior issues.",
-        "motivation": "Managing tenant behaviour in HMOs is highly sensitive.",
-        "options": [
-            {"value": 10, "label": "Formal written behaviour and complaint log with documented actions."},
-            {"value": 5, "label": "Informal notes without structured logging."},
-            {"value": 1, "label": "No consistent documentation."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No consistent documentation.", "action": "Introduce a structured and confidential reporting channel."},
-            {"level": "medium", "reason": "Informal notes.", "action": "Formalise logging procedures."},
-            {"level": "high", "reason": "Formal written log.", "action": "Maintain disciplined complaint logging."},
-        ],
-    },
-    {
-        "id": "20.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Fire and Accident Log & Safety Action List",
-        "text": "Do you maintain logs of fire safety checks and any accidents that occur?",
-        "critical": True, "weight": 2.0,
-        "comment": "Comprehensive logging of fire safety checks, accidents, and preventive actions.",
-        "motivation": "Fire safety logging is not administrative paperwork — it is life-safety evidence.",
-        "options": [
-            {"value": 10, "label": "Comprehensive fire safety and accident log with dates and actions taken."},
-            {"value": 5, "label": "Some records kept but inconsistent."},
-            {"value": 1, "label": "No structured logging system."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No structured logging.", "action": "Introduce a formal fire safety and incident register."},
-            {"level": "medium", "reason": "Some records but inconsistent.", "action": "Ensure every test and incident is logged."},
-            {"level": "high", "reason": "Comprehensive log with dates and actions.", "action": "Maintain up-to-date fire safety logs."},
-        ],
-    },
-    {
-        "id": "21.1", "cat": "Evidence Gathering Systems and Procedures", "sec": "Condensation Prevention Procedures",
-        "text": "What guidance do you provide to tenants about preventing condensation and damp?",
-        "critical": False, "weight": 1.0,
-        "comment": "Proactive measures for managing condensation and damp.",
-        "motivation": "Condensation and mould management is one of the most contentious areas in residential letting.",
-        "options": [
-            {"value": 10, "label": "Written condensation prevention guidance issued and acknowledged."},
-            {"value": 5, "label": "Verbal or informal advice only."},
-            {"value": 1, "label": "No structured guidance provided."},
-        ],
-        "scores": [
-            {"level": "low", "reason": "No structured guidance.", "action": "Introduce a formal condensation management framework."},
-            {"level": "medium", "reason": "Verbal or informal advice.", "action": "Formalise inspection records."},
-            {"level": "high", "reason": "Written guidance issued and acknowledged.", "action": "Continue maintaining detailed historical records."},
-        ],
-    },
-]
+import neon_client
+from neon_client import CONN_STR, Target, get_pool, run_sql, run_sql_batch, use_target
+from question_catalog import ALL_TIERS, QUESTIONS
+from sql_trace import add_trace_arguments, install_from_args
 
-def main():
-    print("=== Starting DB seed ===")
+def seed_batched():
+    """Seed the whole catalog with a fixed number of set-based statements.
+
+    The question bank is shipped as a single JSONB payload per statement, so the
+    request count stays the same no matter how many questions there are.
+    """
+    valid_ids = sorted({q["id"] for q in QUESTIONS})
+    print(f"\nValid question IDs: {valid_ids}")
+
+    # 1. Deactivate questions no longer in our codebase
+    res = run_sql(
+        """UPDATE question_templates SET is_active = FALSE, updated_at = NOW()
+        WHERE question_number NOT IN (SELECT jsonb_array_elements_text($1::jsonb))
+        RETURNING question_number""",
+        [json.dumps(valid_ids)],
+        idempotent=True,
+    )
+    stale = sorted(r["question_number"] for r in res["rows"])
+    if stale:
+        print(f"Deactivated stale questions: {stale}")
+
+    # 2. Upsert all templates in one statement
+    templates = [
+        {
+            "cat": q["cat"], "sec": q["sec"], "id": q["id"], "text": q["text"],
+            "tiers": q["tiers"], "weight": q["weight"], "critical": q["critical"],
+            "comment": q["comment"], "motivation": q["motivation"],
+        }
+        for q in QUESTIONS
+    ]
+    print(f"\n=== Upserting {len(QUESTIONS)} questions (batched) ===")
+    res = run_sql(
+        """INSERT INTO question_templates (
+            category, sub_category, question_number, question_text, question_type,
+            applicable_tiers, weight, is_critical, comment, motivation_learning_point, is_active
+        )
+        SELECT q->>'cat', q->>'sec', q->>'id', q->>'text', 'multiple_choice',
+               q->'tiers', (q->>'weight')::numeric, (q->>'critical')::boolean,
+               q->>'comment', q->>'motivation', TRUE
+        FROM jsonb_array_elements($1::jsonb) AS q
+        ON CONFLICT (category, question_number)
+        DO UPDATE SET
+            sub_category = EXCLUDED.sub_category,
+            question_text = EXCLUDED.question_text,
+            applicable_tiers = EXCLUDED.applicable_tiers,
+            weight = EXCLUDED.weight,
+            is_critical = EXCLUDED.is_critical,
+            comment = EXCLUDED.comment,
+            motivation_learning_point = EXCLUDED.motivation_learning_point,
+            is_active = TRUE,
+            updated_at = NOW()
+        RETURNING id, category, question_number""",
+        [json.dumps(templates)],
+        idempotent=True,
+    )
+    template_ids = {(r["category"], r["question_number"]): r["id"] for r in res["rows"]}
+
+    # 3. Replace answer options for every upserted template in one statement
+    options = []
+    scores = []
+    fail = 0
+    for q in QUESTIONS:
+        template_id = template_ids.get((q["cat"], q["id"]))
+        if template_id is None:
+            print(f"  FAIL Q{q['id']}: template upsert returned no row")
+            fail += 1
+            continue
+        for i, opt in enumerate(q["options"]):
+            options.append({"tid": template_id, "label": opt["label"], "value": opt["value"], "ord": i + 1})
+        for sc in q["scores"]:
+            scores.append({"tid": template_id, "level": sc["level"], "reason": sc["reason"], "action": sc["action"]})
+
+    res = run_sql(
+        """WITH payload AS (
+            SELECT (o->>'tid')::int AS tid, o->>'label' AS label,
+                   (o->>'value')::int AS value, (o->>'ord')::int AS ord
+            FROM jsonb_array_elements($1::jsonb) AS o
+        ), removed AS (
+            DELETE FROM question_answer_options
+            WHERE question_template_id IN (SELECT DISTINCT tid FROM payload)
+        )
+        INSERT INTO question_answer_options (question_template_id, option_text, score_value, option_order, is_example)
+        SELECT tid, label, value, ord, FALSE FROM payload""",
+        [json.dumps(options)],
+        idempotent=True,
+    )
+    print(f"  Options written: {res.get('rowCount', 0)}")
+
+    # 4. Upsert all score examples in one statement
+    res = run_sql(
+        """INSERT INTO question_score_examples (question_template_id, score_level, reason_text, report_action)
+        SELECT (s->>'tid')::int, s->>'level', s->>'reason', s->>'action'
+        FROM jsonb_array_elements($1::jsonb) AS s
+        ON CONFLICT (question_template_id, score_level)
+        DO UPDATE SET reason_text = EXCLUDED.reason_text, report_action = EXCLUDED.report_action""",
+        [json.dumps(scores)],
+        idempotent=True,
+    )
+    print(f"  Score examples written: {res.get('rowCount', 0)}")
+
+    return len(QUESTIONS) - fail, fail
+
+# Resolves the template id inside a batch, where earlier RETURNING values are not visible
+TEMPLATE_ID_SQL = "(SELECT id FROM question_templates WHERE category = $1 AND question_number = $2)"
 
+def question_statements(q):
+    """Build the statements that upsert one question with its options and score examples.
+
+    They are sent as one transaction, so a question never has zero answer
+    options between the DELETE and the INSERTs.
+    """
+    statements = [(
+        """INSERT INTO question_templates (
+            category, sub_category, question_number, question_text, question_type,
+            applicable_tiers, weight, is_critical, comment, motivation_learning_point, is_active
+        ) VALUES ($1, $2, $3, $4, 'multiple_choice', $5, $6, $7, $8, $9, TRUE)
+        ON CONFLICT (category, question_number)
+        DO UPDATE SET
+            sub_category = EXCLUDED.sub_category,
+            question_text = EXCLUDED.question_text,
+            applicable_tiers = EXCLUDED.applicable_tiers,
+            weight = EXCLUDED.weight,
+            is_critical = EXCLUDED.is_critical,
+            comment = EXCLUDED.comment,
+            motivation_learning_point = EXCLUDED.motivation_learning_point,
+            is_active = TRUE,
+            updated_at = NOW()
+        RETURNING id""",
+        [q["cat"], q["sec"], q["id"], q["text"], json.dumps(q["tiers"]), q["weight"], q["critical"], q["comment"], q["motivation"]]
+    )]
+
+    # Delete old options and insert new
+    statements.append((
+        f"DELETE FROM question_answer_options WHERE question_template_id = {TEMPLATE_ID_SQL}",
+        [q["cat"], q["id"]]
+    ))
+    for i, opt in enumerate(q["options"]):
+        statements.append((
+            f"""INSERT INTO question_answer_options (question_template_id, option_text, score_value, option_order, is_example)
+            VALUES ({TEMPLATE_ID_SQL}, $3, $4, $5, FALSE)""",
+            [q["cat"], q["id"], opt["label"], opt["value"], i + 1]
+        ))
+
+    # Upsert score examples
+    for sc in q["scores"]:
+        statements.append((
+            f"""INSERT INTO question_score_examples (question_template_id, score_level, reason_text, report_action)
+            VALUES ({TEMPLATE_ID_SQL}, $3, $4, $5)
+            ON CONFLICT (question_template_id, score_level)
+            DO UPDATE SET reason_text = EXCLUDED.reason_text, report_action = EXCLUDED.report_action""",
+            [q["cat"], q["id"], sc["level"], sc["reason"], sc["action"]]
+        ))
+
+    return statements
+
+def seed_per_question(concurrency=1):
+    """Seed question by question, reporting failures per question."""
     # Step 1: Clean up stale/test questions not in our codebase
     valid_ids = {q["id"] for q in QUESTIONS}
     print(f"\nValid question IDs: {sorted(valid_ids)}")
@@ -485,64 +197,395 @@ def main():
     stale = set(existing.keys()) - valid_ids
     if stale:
         print(f"\nDeactivating stale questions: {sorted(stale)}")
-        for qn in stale:
-            r = run_sql("UPDATE question_templates SET is_active = FALSE, updated_at = NOW() WHERE question_number = $1", [qn])
+        stale = sorted(stale)
+        results = run_sql_batch([
+            ("UPDATE question_templates SET is_active = FALSE, updated_at = NOW() WHERE question_number = $1", [qn])
+            for qn in stale
+        ])
+        for qn, r in zip(stale, results):
             print(f"  Deactivated {qn}: {r.get('rowCount', 0)} row(s)")
 
     # Step 2: Upsert each question
     print(f"\n=== Upserting {len(QUESTIONS)} questions ===")
+    return upsert_questions(QUESTIONS, concurrency)
+
+def upsert_questions(questions, concurrency=1):
+    """Upsert questions, up to `concurrency` at a time, reporting failures per question.
+
+    Each question is a single transaction (see question_statements()), so
+    running independent questions in parallel keeps their internal ordering.
+    """
     ok = 0
     fail = 0
+    pool = get_pool()
+    pool.max_idle = max(pool.max_idle, concurrency)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        # copy_context() keeps the caller's target (see neon_client.use_target) in the workers
+        futures = {
+            executor.submit(contextvars.copy_context().run, run_sql_batch, question_statements(q), idempotent=True): q
+            for q in questions
+        }
+        for future in as_completed(futures):
+            q = futures[future]
+            try:
+                future.result()
+                print(f"  OK Q{q['id']}: {q['text'][:60]}...")
+                ok += 1
+            except Exception as e:
+                print(f"  FAIL Q{q['id']}: {e}")
+                fail += 1
+
+    return ok, fail
+
+def canonical_question(q):
+    """Reduce a QUESTIONS entry to the fields the database stores for it."""
+    return {
+        "cat": q["cat"], "sec": q["sec"], "id": q["id"], "text": q["text"],
+        "critical": bool(q["critical"]), "weight": float(q["weight"]),
+        "comment": q["comment"], "motivation": q["motivation"],
+        "tiers": sorted(q["tiers"]),
+        "options": [{"value": o["value"], "label": o["label"], "example": False} for o in q["options"]],
+        "scores": sorted(
+            ({"level": sc["level"], "reason": sc["reason"], "action": sc["action"]} for sc in q["scores"]),
+            key=lambda sc: sc["level"],
+        ),
+    }
+
+def canonical_row(r):
+    """Reduce a row from fetch_db_state() to the same shape as canonical_question()."""
+    return {
+        "cat": r["category"], "sec": r["sub_category"], "id": r["question_number"], "text": r["question_text"],
+        "critical": bool(r["is_critical"]), "weight": float(r["weight"]),
+        "comment": r["comment"], "motivation": r["motivation_learning_point"],
+        "tiers": sorted(r["applicable_tiers"] or []),
+        "options": [{"value": int(o["value"]), "label": o["label"], "example": bool(o["example"])} for o in r["options"]],
+        "scores": sorted(r["scores"], key=lambda sc: sc["level"]),
+    }
+
+def content_hash(canonical):
+    """Stable SHA-256 of a canonical question, independent of dict ordering."""
+    data = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def catalog_hash(canonicals):
+    """SHA-256 over the content hashes of a whole catalog, independent of order."""
+    digest = hashlib.sha256()
+    for h in sorted(content_hash(c) for c in canonicals):
+        digest.update(h.encode("ascii"))
+    return digest.hexdigest()
+
+def fetch_db_state():
+    """Fetch every template with its options and score examples in one query."""
+    res = run_sql("""
+        SELECT qt.category, qt.sub_category, qt.question_number, qt.question_text,
+               qt.applicable_tiers, qt.weight, qt.is_critical, qt.comment,
+               qt.motivation_learning_point, qt.is_active,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                       'value', qao.score_value, 'label', qao.option_text, 'example', qao.is_example
+                   ) ORDER BY qao.option_order, qao.id)
+                   FROM question_answer_options qao
+                   WHERE qao.question_template_id = qt.id
+               ), '[]') AS options,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                       'level', qse.score_level, 'reason', qse.reason_text, 'action', qse.report_action
+                   ))
+                   FROM question_score_examples qse
+                   WHERE qse.question_template_id = qt.id
+               ), '[]') AS scores
+        FROM question_templates qt
+    """)
+    return {(r["category"], r["question_number"]): r for r in res["rows"]}
+
+def plan_incremental(db_state):
+    """Compare the catalog against the database and classify every question.
+
+    Returns (new, changed, stale, unchanged): `changed` holds
+    (question, changed field names) pairs and `stale` holds the keys of active
+    rows that are no longer in the catalog.
+    """
+    new, changed, unchanged = [], [], []
     for q in QUESTIONS:
+        row = db_state.get((q["cat"], q["id"]))
+        if row is None:
+            new.append(q)
+            continue
+        want = canonical_question(q)
+        have = canonical_row(row)
+        if content_hash(want) == content_hash(have) and row["is_active"]:
+            unchanged.append(q)
+            continue
+        fields = [k for k in want if want[k] != have[k]]
+        if not row["is_active"]:
+            fields.append("is_active")
+        changed.append((q, fields))
+
+    catalog_keys = {(q["cat"], q["id"]) for q in QUESTIONS}
+    stale = sorted(k for k, r in db_state.items() if r["is_active"] and k not in catalog_keys)
+    return new, changed, stale, unchanged
+
+def seed_incremental(dry_run=False, concurrency=1):
+    """Write only the questions whose content hash differs from the database."""
+    db_state = fetch_db_state()
+    new, changed, stale, unchanged = plan_incremental(db_state)
+
+    print(f"\n=== Incremental plan: {len(new)} new, {len(changed)} changed, "
+          f"{len(stale)} stale, {len(unchanged)} unchanged ===")
+    for q in new:
+        print(f"  + Q{q['id']}: {q['text'][:60]}...")
+    for q, fields in changed:
+        print(f"  ~ Q{q['id']}: {', '.join(fields)}")
+    for cat, qn in stale:
+        print(f"  - Q{qn} ({cat})")
+
+    if dry_run:
+        print("\nDry run: no changes written.")
+        return 0, 0
+
+    if stale:
+        run_sql_batch([
+            ("UPDATE question_templates SET is_active = FALSE, updated_at = NOW() WHERE category = $1 AND question_number = $2",
+             [cat, qn])
+            for cat, qn in stale
+        ])
+        print(f"\nDeactivated {len(stale)} stale question(s)")
+
+    return upsert_questions(new + [q for q, _ in changed], concurrency)
+
+# Rebuilds every bundle of the $1 tiers from the live tables (see build_tier_bundles())
+TIER_BUNDLES_SQL = """
+    WITH tiers AS (
+        SELECT jsonb_array_elements_text($1::jsonb) AS tier
+    ), bundles AS (
+        SELECT t.tier,
+               COALESCE(jsonb_agg(jsonb_build_object(
+                   'id', qt.question_number,
+                   'category', qt.category,
+                   'section', qt.sub_category,
+                   'text', qt.question_text,
+                   'critical', qt.is_critical,
+                   'tiers', jsonb_build_array(t.tier),
+                   'weight', qt.weight::float8,
+                   'options', COALESCE((
+                       SELECT jsonb_agg(jsonb_build_object(
+                           'value', qao.score_value, 'label', qao.option_text
+                       ) ORDER BY qao.option_order)
+                       FROM question_answer_options qao
+                       WHERE qao.question_template_id = qt.id AND qao.is_example = FALSE
+                   ), '[]'),
+                   'motivation_learning_point', qt.motivation_learning_point,
+                   'comment', qt.comment,
+                   'score_examples', COALESCE((
+                       SELECT jsonb_agg(jsonb_build_object(
+                           'score_level', qse.score_level,
+                           'reason_text', qse.reason_text,
+                           'report_action', qse.report_action
+                       ) ORDER BY qse.score_level)
+                       FROM question_score_examples qse
+                       WHERE qse.question_template_id = qt.id
+                   ), '[]')
+               ) ORDER BY qt.category, qt.question_number) FILTER (WHERE qt.id IS NOT NULL), '[]') AS questions
+        FROM tiers t
+        LEFT JOIN question_templates qt
+          ON qt.is_active = TRUE AND qt.applicable_tiers @> jsonb_build_array(t.tier)
+        GROUP BY t.tier
+    )
+    INSERT INTO question_tier_bundles (tier, questions, question_count, version_hash, built_at)
+    SELECT tier, questions, jsonb_array_length(questions), md5(questions::text), NOW()
+    FROM bundles
+    ON CONFLICT (tier) DO UPDATE SET
+        questions = EXCLUDED.questions,
+        question_count = EXCLUDED.question_count,
+        version_hash = EXCLUDED.version_hash,
+        built_at = NOW()
+    WHERE question_tier_bundles.version_hash IS DISTINCT FROM EXCLUDED.version_hash
+    RETURNING tier, question_count, version_hash
+"""
+
+CLEAR_TIER_BUNDLES_SQL = "DELETE FROM question_tier_bundles"
+
+def build_tier_bundles():
+    """Rebuild question_tier_bundles from the live tables in one statement.
+
+    Each bundle is the tier's active question list in the shape returned by
+    getQuestionsForTier() (lib/questions-db.ts), with an md5 version hash.
+    Bundles whose content is unchanged are left untouched.
+    """
+    return run_sql(TIER_BUNDLES_SQL, [json.dumps(ALL_TIERS)])["rows"]
+
+def seed(args):
+    """Run the seed selected by args against the current target; returns (ok, fail) or None on a dry run."""
+    if args.incremental or args.dry_run:
+        ok, fail = seed_incremental(dry_run=args.dry_run, concurrency=args.concurrency)
+        if args.dry_run:
+            return None
+    elif args.batched:
+        ok, fail = seed_batched()
+    else:
+        ok, fail = seed_per_question(concurrency=args.concurrency)
+
+    print(f"\n=== Results: {ok} OK, {fail} failed ===")
+    if fail:
+        # The questions that did seed changed the live tables; drop the bundles so
+        # readers use the live query (as invalidateTierBundles() does) until a clean seed
+        run_sql(CLEAR_TIER_BUNDLES_SQL, idempotent=True)
+        print("Tier bundles cleared: some questions failed to seed; readers use the live query.")
+    else:
+        rebuilt = build_tier_bundles()
+        print(f"Tier bundles rebuilt: {len(rebuilt)}")
+        for r in rebuilt:
+            print(f"  {r['tier']}: {r['question_count']} questions, version {r['version_hash'][:12]}")
+    return ok, fail
+
+def load_targets(path):
+    """Read a targets file (see the module docstring) into a list of Targets."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    targets = []
+    for i, entry in enumerate(entries):
+        name = entry.get("name") or f"target-{i + 1}"
+        conn_str = entry.get("postgres_url")
+        if not conn_str and entry.get("postgres_url_env"):
+            conn_str = os.environ.get(entry["postgres_url_env"])
+            if not conn_str:
+                raise ValueError(f"{name}: environment variable {entry['postgres_url_env']} is not set")
+        if not conn_str:
+            raise ValueError(f"{name}: no postgres_url or postgres_url_env")
+        transport = entry.get("transport", neon_client.TRANSPORT)
+        try:
+            neon_client.check_transport(transport)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+        targets.append(Target(name, conn_str, entry.get("neon_url", neon_client.NEON_URL), transport))
+    if len({t.name for t in targets}) != len(targets):
+        raise ValueError("target names must be unique")
+    return targets
+
+_log_prefix = contextvars.ContextVar("log_prefix", default="")
+
+class PrefixedOutput:
+    """stdout wrapper that prefixes each line with the writing target's name."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        prefix = _log_prefix.get()
+        if prefix:
+            text = "".join(prefix + line if line.strip() else line for line in text.splitlines(True))
+        with self.lock:
+            self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def seed_target(target, args):
+    """Seed one target; returns its row for the consolidated report."""
+    _log_prefix.set(f"[{target.name}] ")
+    started = time.time()
+    report = {"target": target.name, "ok": 0, "failed": 0, "status": "ok", "catalog_hash": None, "error": None}
+    with use_target(target):
         try:
-            tiers = json.dumps(["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"])
-            res = run_sql(
-                """INSERT INTO question_templates (
-                    category, sub_category, question_number, question_text, question_type,
-                    applicable_tiers, weight, is_critical, comment, motivation_learning_point, is_active
-                ) VALUES ($1, $2, $3, $4, 'multiple_choice', $5, $6, $7, $8, $9, TRUE)
-                ON CONFLICT (category, question_number)
-                DO UPDATE SET
-                    sub_category = EXCLUDED.sub_category,
-                    question_text = EXCLUDED.question_text,
-                    applicable_tiers = EXCLUDED.applicable_tiers,
-                    weight = EXCLUDED.weight,
-                    is_critical = EXCLUDED.is_critical,
-                    comment = EXCLUDED.comment,
-                    motivation_learning_point = EXCLUDED.motivation_learning_point,
-                    is_active = TRUE,
-                    updated_at = NOW()
-                RETURNING id""",
-                [q["cat"], q["sec"], q["id"], q["text"], tiers, q["weight"], q["critical"], q["comment"], q["motivation"]]
-            )
-            template_id = res["rows"][0]["id"]
-
-            # Delete old options and insert new
-            run_sql("DELETE FROM question_answer_options WHERE question_template_id = $1", [template_id])
-            for i, opt in enumerate(q["options"]):
-                run_sql(
-                    "INSERT INTO question_answer_options (question_template_id, option_text, score_value, option_order, is_example) VALUES ($1, $2, $3, $4, FALSE)",
-                    [template_id, opt["label"], opt["value"], i + 1]
-                )
-
-            # Upsert score examples
-            for sc in q["scores"]:
-                run_sql(
-                    """INSERT INTO question_score_examples (question_template_id, score_level, reason_text, report_action)
-                    VALUES ($1, $2, $3, $4)
-                    ON CONFLICT (question_template_id, score_level)
-                    DO UPDATE SET reason_text = EXCLUDED.reason_text, report_action = EXCLUDED.report_action""",
-                    [template_id, sc["level"], sc["reason"], sc["action"]]
-                )
-
-            print(f"  OK Q{q['id']}: {q['text'][:60]}...")
-            ok += 1
+            result = seed(args)
+            if result is not None:
+                report["ok"], report["failed"] = result
+                if report["failed"]:
+                    report["status"] = "partial"
+            active = [canonical_row(r) for r in fetch_db_state().values() if r["is_active"]]
+            report["catalog_hash"] = catalog_hash(active)
         except Exception as e:
-            print(f"  FAIL Q{q['id']}: {e}")
-            fail += 1
+            print(f"  FAIL {e}")
+            report["status"] = "error"
+            report["error"] = str(e)
+    report["duration"] = time.time() - started
+    return report
+
+def seed_targets(targets, args):
+    """Seed all targets concurrently and print the consolidated report; returns False if any failed."""
+    expected = catalog_hash(canonical_question(q) for q in QUESTIONS)
+    workers = min(len(targets), args.parallel_targets or len(targets))
+    print(f"=== Seeding {len(targets)} targets ({workers} at a time, "
+          f"{args.concurrency} questions in parallel per target) ===")
+    started = time.time()
+    stdout = sys.stdout
+    sys.stdout = PrefixedOutput(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, seed_target, t, args) for t in targets]
+            reports = [f.result() for f in futures]
+    finally:
+        sys.stdout = stdout
+    elapsed = time.time() - started
+
+    print(f"\n=== Rollout report (catalog {expected[:12]}) ===")
+    width = max(len(t.name) for t in targets)
+    healthy = True
+    for r in reports:
+        if r["catalog_hash"] is None:
+            match = "-"
+        elif r["catalog_hash"] == expected:
+            match = "match"
+        else:
+            match = "DIFFERS"
+        if r["status"] != "ok" or (match != "match" and not args.dry_run):
+            healthy = False
+        line = (f"  {'OK  ' if r['status'] == 'ok' else 'FAIL'} {r['target']:<{width}}  "
+                f"{r['ok']:>3} ok  {r['failed']:>3} failed  {r['duration']:6.1f}s  "
+                f"{(r['catalog_hash'] or '-')[:12]:<12} {match}")
+        if r["error"]:
+            line += f"  ({r['error']})"
+        print(line)
+    slowest = max(r["duration"] for r in reports)
+    print(f"=== {sum(r['status'] == 'ok' for r in reports)}/{len(reports)} targets seeded in {elapsed:.1f}s "
+          f"(slowest target {slowest:.1f}s) ===")
+    return healthy
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed/update questions in Neon DB.")
+    parser.add_argument("--batched", action="store_true",
+                        help="ship the whole catalog as a few set-based statements")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only write questions whose content differs from the database")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the incremental diff without writing (implies --incremental)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="number of questions to upsert in parallel (default: 1)")
+    parser.add_argument("--targets", metavar="PATH",
+                        help="JSON file listing databases to seed concurrently instead of POSTGRES_URL")
+    parser.add_argument("--parallel-targets", type=int,
+                        help="number of targets seeded at the same time (default: all)")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.parallel_targets is not None and args.parallel_targets < 1:
+        parser.error("--parallel-targets must be at least 1")
+
+    if args.targets:
+        try:
+            targets = load_targets(args.targets)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: could not read targets from {args.targets}: {e}")
+            exit(1)
+        if not targets:
+            print(f"ERROR: no targets in {args.targets}")
+            exit(1)
+        if not seed_targets(targets, args):
+            exit(1)
+        return
+
+    if not CONN_STR:
+        print("ERROR: POSTGRES_URL environment variable is not set.")
+        exit(1)
+
+    print("=== Starting DB seed ===")
+    if seed(args) is None:
+        return
 
     # Final verification
-    print(f"\n=== Results: {ok} OK, {fail} failed ===")
     res = run_sql("SELECT COUNT(*) as cnt FROM question_templates WHERE is_active = TRUE")
     print(f"Active questions in DB: {res['rows'][0]['cnt']}")
 
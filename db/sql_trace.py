@@ -0,0 +1,151 @@
+"""Per-statement instrumentation for neon_client.
+
+Records, for every statement sent through run_sql/run_sql_batch, its
+normalized fingerprint, parameter count, client-observed time (request sent
+to response read), transfer time, response bytes and row count. Attempts
+that fail before a response arrives (refused or dropped connections,
+timeouts) are recorded too, with their error. Neon's /sql endpoint reports
+no server-side timing; server time is only recorded when the endpoint sends
+a Server-Timing header, as db/neon_standin.py does. Statements in one batch
+request share its timings, split evenly.
+"""
+import atexit
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+
+import neon_client
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(query):
+    """Collapse whitespace and replace literals with `?`, keeping $n placeholders."""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class Tracer:
+    """Collects statement records; optionally writes them as JSON lines and logs slow ones."""
+
+    def __init__(self, trace_path=None, slow_ms=None):
+        self.trace_file = open(trace_path, "w", encoding="utf-8") if trace_path else None
+        self.slow_ms = slow_ms
+        self.stats = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def record(self, statements, resp, results, error, elapsed):
+        share = 1 / max(1, len(statements))
+        total = resp.wait + resp.read if resp is not None else elapsed
+        server = resp.server_time if resp is not None else None
+        records = []
+        for i, (query, params) in enumerate(statements):
+            normalized = normalize(query)
+            result = results[i] if results else None
+            records.append({
+                "ts": time.time(),
+                "fingerprint": fingerprint(normalized),
+                "query": normalized,
+                "params": len(params or []),
+                "total_ms": round(total * share * 1000, 3),
+                "server_ms": round(server * share * 1000, 3) if server is not None else None,
+                "network_ms": round((total - server) * share * 1000, 3) if server is not None else None,
+                "transfer_ms": round(resp.read * share * 1000, 3) if resp is not None else None,
+                "bytes": round(len(resp.payload) * share) if resp is not None else 0,
+                "rows": int(result.get("rowCount") or 0) if result else 0,
+                "batch": len(statements),
+                "error": str(error) if error else None,
+            })
+
+        with self._lock:
+            self.requests += 1
+            for rec in records:
+                agg = self.stats.setdefault(rec["fingerprint"], {
+                    "query": rec["query"], "calls": 0, "total_ms": 0.0, "server_ms": 0.0, "server_timed": 0,
+                    "max_ms": 0.0, "rows": 0, "bytes": 0, "errors": 0,
+                })
+                agg["calls"] += 1
+                agg["total_ms"] += rec["total_ms"]
+                if rec["server_ms"] is not None:
+                    agg["server_ms"] += rec["server_ms"]
+                    agg["server_timed"] += 1
+                agg["max_ms"] = max(agg["max_ms"], rec["total_ms"])
+                agg["rows"] += rec["rows"]
+                agg["bytes"] += rec["bytes"]
+                agg["errors"] += 1 if rec["error"] else 0
+                if self.trace_file:
+                    self.trace_file.write(json.dumps(rec) + "\n")
+
+        if self.slow_ms is not None and total * 1000 >= self.slow_ms:
+            server_note = f", server {server * 1000:.1f} ms" if server is not None else ""
+            if error is not None and resp is None:
+                server_note += f", failed: {error}"
+            print(f"SLOW {total * 1000:.1f} ms ({len(statements)} stmt{server_note}): "
+                  f"{records[0]['query'][:100]}", file=sys.stderr)
+
+    def summary(self, limit=20, out=sys.stderr):
+        """Print per-fingerprint totals, slowest client-observed time first.
+
+        The server ms column is "-" for queries that never got a Server-Timing value.
+        """
+        with self._lock:
+            rows = sorted(self.stats.values(), key=lambda a: a["total_ms"], reverse=True)
+            requests = self.requests
+        if not rows:
+            return
+        print(f"\n=== SQL summary: {requests} request(s), {sum(a['calls'] for a in rows)} statement(s) ===", file=out)
+        print(f"  {'client ms':>10s} {'calls':>6s} {'mean ms':>8s} {'max ms':>8s} {'server ms':>9s} "
+              f"{'errors':>6s} {'rows':>7s} {'bytes':>9s}  query", file=out)
+        for a in rows[:limit]:
+            server = f"{a['server_ms']:9.1f}" if a["server_timed"] else f"{'-':>9s}"
+            print(f"  {a['total_ms']:10.1f} {a['calls']:6d} {a['total_ms'] / a['calls']:8.1f} {a['max_ms']:8.1f} "
+                  f"{server} {a['errors']:6d} {a['rows']:7d} {a['bytes']:9d}  {a['query'][:70]}", file=out)
+
+    def close(self):
+        if self.trace_file:
+            self.trace_file.close()
+            self.trace_file = None
+
+
+def print_client_metrics(out=sys.stderr):
+    """Adaptive limit and retry counters of every target the process talked to."""
+    for target, transport in list(neon_client._transports.items()):
+        m = transport.limiter.metrics()
+        if not m["requests"]:
+            continue
+        reasons = ", ".join(f"{k} {v}" for k, v in sorted(m["retry_reasons"].items()))
+        print(f"=== Client {target.name}: limit {m['limit']} (peak {m['peak_limit']}), "
+              f"{m['requests']} attempt(s), {m['errors']} failed, {m['retries']} retried"
+              f"{f' ({reasons})' if reasons else ''}, {m['gave_up']} gave up ===", file=out)
+
+
+def add_trace_arguments(parser):
+    parser.add_argument("--trace", metavar="PATH", help="write one JSON line per SQL statement to PATH")
+    parser.add_argument("--slow-ms", type=float, help="log requests slower than this many milliseconds")
+    parser.add_argument("--sql-summary", action="store_true", help="print per-query totals at exit")
+
+
+def install_from_args(args):
+    """Install a Tracer if any tracing flag was given; the summary is printed at exit."""
+    if not (args.trace or args.slow_ms is not None or args.sql_summary):
+        return None
+    tracer = Tracer(args.trace, args.slow_ms)
+    neon_client.set_tracer(tracer)
+
+    def finish():
+        tracer.summary()
+        print_client_metrics()
+        tracer.close()
+    atexit.register(finish)
+    return tracer
@@ -1,170 +1,153 @@
 #!/usr/bin/env python3
 """Full DB verification for questionnaire overhaul."""
-import json
-import urllib.request
-import os
+import argparse
 
-NEON_URL = "https://ep-icy-violet-abk4m75a-pooler.eu-west-2.aws.neon.tech/sql"
-CONN_STR = os.environ.get("POSTGRES_URL")
+from neon_client import CONN_STR, run_sql
+from query_cache import DEFAULT_TTL, QueryCache, catalog_fingerprint
+from sql_trace import add_trace_arguments, install_from_args
 
 if not CONN_STR:
     print("ERROR: POSTGRES_URL environment variable is not set.")
     exit(1)
 
-def run_sql(query, params=None):
-    body = {"query": query}
-    if params:
-        body["params"] = params
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(NEON_URL, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Neon-Connection-String", CONN_STR)
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, context=ctx) as resp:
-        return json.loads(resp.read())
-
-issues = []
-
-# 1. Check question count
-print("=" * 60)
-print("CHECK 1: Question count")
-print("=" * 60)
-res = run_sql("SELECT COUNT(*) as cnt FROM question_templates WHERE is_active = TRUE")
-active_count = int(res["rows"][0]["cnt"])
-res2 = run_sql("SELECT COUNT(*) as cnt FROM question_templates WHERE is_active = FALSE")
-inactive_count = int(res2["rows"][0]["cnt"])
-print(f"  Active: {active_count}")
-print(f"  Inactive: {inactive_count}")
-if active_count != 26:
-    issues.append(f"Expected 26 active questions, got {active_count}")
-    print(f"  [FAIL] Expected 26 active")
-else:
-    print(f"  [OK] 26 active questions")
-
-# 2. Check each question has required fields
-print()
-print("=" * 60)
-print("CHECK 2: Question fields (text, comment, motivation)")
-print("=" * 60)
-res = run_sql("""
-    SELECT question_number, sub_category, category,
-           LEFT(question_text, 80) as txt,
-           is_critical, weight,
-           comment IS NOT NULL AND comment != '' as has_comment,
-           motivation_learning_point IS NOT NULL AND motivation_learning_point != '' as has_motivation
-    FROM question_templates
-    WHERE is_active = TRUE
-    ORDER BY
-        CASE category
-            WHEN 'Documentation' THEN 1
-            WHEN 'Landlord-Tenant Communication' THEN 2
-            WHEN 'Evidence Gathering Systems and Procedures' THEN 3
-        END,
-        question_number
-""")
-for r in res["rows"]:
-    crit = "CRIT" if r["is_critical"] else "    "
-    c = "Y" if r["has_comment"] else "N"
-    m = "Y" if r["has_motivation"] else "N"
-    flags = ""
-    if not r["has_comment"]:
-        flags += " [NO COMMENT]"
-        issues.append(f"Q{r['question_number']} missing comment")
-    if not r["has_motivation"]:
-        flags += " [NO MOTIVATION]"
-        issues.append(f"Q{r['question_number']} missing motivation")
-    print(f"  Q{r['question_number']:5s} | {crit} | w={r['weight']} | c={c} m={m} | {r['sub_category'][:30]:30s} | {r['txt'][:60]}{flags}")
-
-# 3. Check answer options per question
-print()
-print("=" * 60)
-print("CHECK 3: Answer options per question (expect 3 each)")
-print("=" * 60)
-res = run_sql("""
-    SELECT qt.question_number, COUNT(qao.id) as opt_count
-    FROM question_templates qt
-    LEFT JOIN question_answer_options qao ON qt.id = qao.question_template_id
-    WHERE qt.is_active = TRUE
-    GROUP BY qt.question_number
-    ORDER BY qt.question_number
-""")
-for r in res["rows"]:
-    cnt = int(r["opt_count"])
-    flag = "" if cnt == 3 else f" [EXPECTED 3, GOT {cnt}]"
-    if flag:
-        issues.append(f"Q{r['question_number']} has {cnt} options (expected 3)")
-    print(f"  Q{r['question_number']:5s} | {cnt} options{flag}")
-
-# 4. Check score examples per question
-print()
-print("=" * 60)
-print("CHECK 4: Score examples per question (expect 3: low/medium/high)")
-print("=" * 60)
-res = run_sql("""
-    SELECT qt.question_number,
-           COUNT(qse.id) as se_count,
-           STRING_AGG(qse.score_level, ',' ORDER BY qse.score_level) as levels,
-           COUNT(CASE WHEN qse.report_action IS NOT NULL AND qse.report_action != '' THEN 1 END) as has_action
-    FROM question_templates qt
-    LEFT JOIN question_score_examples qse ON qt.id = qse.question_template_id
-    WHERE qt.is_active = TRUE
-    GROUP BY qt.question_number
-    ORDER BY qt.question_number
-""")
-for r in res["rows"]:
-    cnt = int(r["se_count"])
-    act = int(r["has_action"])
-    levels = r.get("levels", "")
-    flag = ""
-    if cnt != 3:
-        flag += f" [EXPECTED 3, GOT {cnt}]"
-        issues.append(f"Q{r['question_number']} has {cnt} score examples (expected 3)")
-    if levels and levels != "high,low,medium":
-        flag += f" [LEVELS: {levels}]"
-    if act != 3:
-        flag += f" [ONLY {act}/3 HAVE report_action]"
-        issues.append(f"Q{r['question_number']} only {act}/3 score examples have report_action")
-    print(f"  Q{r['question_number']:5s} | {cnt} examples | {act}/3 actions | levels={levels}{flag}")
-
-# 5. Check sub-category consistency
-print()
-print("=" * 60)
-print("CHECK 5: Sub-categories and question distribution")
-print("=" * 60)
-res = run_sql("""
-    SELECT category, sub_category, COUNT(*) as cnt
-    FROM question_templates
-    WHERE is_active = TRUE
-    GROUP BY category, sub_category
-    ORDER BY category, sub_category
-""")
-for r in res["rows"]:
-    print(f"  {r['category'][:40]:40s} | {r['sub_category'][:35]:35s} | {r['cnt']} Q(s)")
-
-# 6. Check deactivated questions
-print()
-print("=" * 60)
-print("CHECK 6: Deactivated (stale) questions")
-print("=" * 60)
-res = run_sql("""
-    SELECT question_number, sub_category, LEFT(question_text, 60) as txt
-    FROM question_templates
-    WHERE is_active = FALSE
-    ORDER BY question_number
-""")
-if res["rows"]:
-    for r in res["rows"]:
-        print(f"  Q{r['question_number']:5s} | {r['sub_category']} | {r['txt']}")
-else:
-    print("  None (all cleaned up)")
-
-# Summary
-print()
-print("=" * 60)
-if issues:
-    print(f"RESULT: {len(issues)} ISSUE(S) FOUND")
-    for i, issue in enumerate(issues, 1):
-        print(f"  {i}. {issue}")
-else:
-    print("RESULT: ALL CHECKS PASSED")
-print("=" * 60)
+CATEGORY_ORDER = {
+    "Documentation": 1,
+    "Landlord-Tenant Communication": 2,
+    "Evidence Gathering Systems and Procedures": 3,
+}
+
+
+def fetch_templates(cache=None):
+    """Fetch every template with its option count and score examples in one query."""
+    res = (cache.run_sql if cache else run_sql)("""
+        SELECT qt.question_number, qt.category, qt.sub_category, qt.question_text,
+               qt.is_critical, qt.weight, qt.is_active,
+               qt.comment IS NOT NULL AND qt.comment != '' as has_comment,
+               qt.motivation_learning_point IS NOT NULL AND qt.motivation_learning_point != '' as has_motivation,
+               (
+                   SELECT COUNT(*) FROM question_answer_options qao
+                   WHERE qao.question_template_id = qt.id
+               ) as opt_count,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                       'level', qse.score_level,
+                       'has_action', qse.report_action IS NOT NULL AND qse.report_action != ''
+                   ))
+                   FROM question_score_examples qse
+                   WHERE qse.question_template_id = qt.id
+               ), '[]') as score_examples
+        FROM question_templates qt
+    """)
+    return res["rows"]
+
+
+def header(title):
+    print()
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the question catalog in Neon DB.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always query the database instead of the local result cache")
+    parser.add_argument("--cache-ttl", type=int, default=DEFAULT_TTL,
+                        help=f"seconds a cached result stays valid (default: {DEFAULT_TTL})")
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    install_from_args(args)
+
+    cache = None if args.no_cache else QueryCache(catalog_fingerprint(), ttl=args.cache_ttl)
+    rows = fetch_templates(cache)
+    if cache and cache.hits:
+        print("(catalog unchanged: using cached query results)")
+    active = sorted((r for r in rows if r["is_active"]), key=lambda r: r["question_number"])
+    inactive = sorted((r for r in rows if not r["is_active"]), key=lambda r: r["question_number"])
+    issues = []
+
+    # 1. Check question count
+    print("=" * 60)
+    print("CHECK 1: Question count")
+    print("=" * 60)
+    print(f"  Active: {len(active)}")
+    print(f"  Inactive: {len(inactive)}")
+    if len(active) != 26:
+        issues.append(f"Expected 26 active questions, got {len(active)}")
+        print(f"  [FAIL] Expected 26 active")
+    else:
+        print(f"  [OK] 26 active questions")
+
+    # 2. Check each question has required fields
+    header("CHECK 2: Question fields (text, comment, motivation)")
+    for r in sorted(active, key=lambda r: (CATEGORY_ORDER.get(r["category"], len(CATEGORY_ORDER) + 1), r["question_number"])):
+        crit = "CRIT" if r["is_critical"] else "    "
+        c = "Y" if r["has_comment"] else "N"
+        m = "Y" if r["has_motivation"] else "N"
+        flags = ""
+        if not r["has_comment"]:
+            flags += " [NO COMMENT]"
+            issues.append(f"Q{r['question_number']} missing comment")
+        if not r["has_motivation"]:
+            flags += " [NO MOTIVATION]"
+            issues.append(f"Q{r['question_number']} missing motivation")
+        print(f"  Q{r['question_number']:5s} | {crit} | w={r['weight']} | c={c} m={m} | {r['sub_category'][:30]:30s} | {r['question_text'][:60]}{flags}")
+
+    # 3. Check answer options per question
+    header("CHECK 3: Answer options per question (expect 3 each)")
+    for r in active:
+        cnt = int(r["opt_count"])
+        flag = "" if cnt == 3 else f" [EXPECTED 3, GOT {cnt}]"
+        if flag:
+            issues.append(f"Q{r['question_number']} has {cnt} options (expected 3)")
+        print(f"  Q{r['question_number']:5s} | {cnt} options{flag}")
+
+    # 4. Check score examples per question
+    header("CHECK 4: Score examples per question (expect 3: low/medium/high)")
+    for r in active:
+        examples = r["score_examples"]
+        cnt = len(examples)
+        act = sum(1 for se in examples if se["has_action"])
+        levels = ",".join(sorted(se["level"] for se in examples))
+        flag = ""
+        if cnt != 3:
+            flag += f" [EXPECTED 3, GOT {cnt}]"
+            issues.append(f"Q{r['question_number']} has {cnt} score examples (expected 3)")
+        if levels and levels != "high,low,medium":
+            flag += f" [LEVELS: {levels}]"
+        if act != 3:
+            flag += f" [ONLY {act}/3 HAVE report_action]"
+            issues.append(f"Q{r['question_number']} only {act}/3 score examples have report_action")
+        print(f"  Q{r['question_number']:5s} | {cnt} examples | {act}/3 actions | levels={levels}{flag}")
+
+    # 5. Check sub-category consistency
+    header("CHECK 5: Sub-categories and question distribution")
+    distribution = {}
+    for r in active:
+        key = (r["category"], r["sub_category"])
+        distribution[key] = distribution.get(key, 0) + 1
+    for (category, sub_category), cnt in sorted(distribution.items()):
+        print(f"  {category[:40]:40s} | {sub_category[:35]:35s} | {cnt} Q(s)")
+
+    # 6. Check deactivated questions
+    header("CHECK 6: Deactivated (stale) questions")
+    if inactive:
+        for r in inactive:
+            print(f"  Q{r['question_number']:5s} | {r['sub_category']} | {r['question_text'][:60]}")
+    else:
+        print("  None (all cleaned up)")
+
+    # Summary
+    print()
+    print("=" * 60)
+    if issues:
+        print(f"RESULT: {len(issues)} ISSUE(S) FOUND")
+        for i, issue in enumerate(issues, 1):
+            print(f"  {i}. {issue}")
+    else:
+        print("RESULT: ALL CHECKS PASSED")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
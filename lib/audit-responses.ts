@@ -0,0 +1,67 @@
+import { sql } from "@vercel/postgres";
+
+// Postgres "undefined_table": the archive views have not been created yet
+function isMissingRelation(error: any): boolean {
+  return error?.code === "42P01";
+}
+
+/**
+ * Form responses of an audit, including those moved to form_responses_archive by
+ * db/archive-audits.py. Reads the live table when the form_responses_all view
+ * does not exist (archive migration not applied).
+ *
+ * @param auditId - The audit id
+ * @returns Responses ordered by question_id
+ */
+export async function getAuditResponses(auditId: number): Promise<any[]> {
+  try {
+    const result = await sql`
+      SELECT id, audit_id, question_id, answer_value, comment, created_at
+      FROM form_responses_all
+      WHERE audit_id = ${auditId}
+      ORDER BY question_id
+    `;
+    return result.rows;
+  } catch (error: any) {
+    if (!isMissingRelation(error)) {
+      throw error;
+    }
+    console.warn(`[getAuditResponses] form_responses_all missing, reading form_responses`);
+    const result = await sql`
+      SELECT id, audit_id, question_id, answer_value, comment, created_at
+      FROM form_responses
+      WHERE audit_id = ${auditId}
+      ORDER BY question_id
+    `;
+    return result.rows;
+  }
+}
+
+/**
+ * Notes of an audit, including archived ones; reads the live table when the
+ * notes_all view does not exist.
+ *
+ * @param auditId - The audit id
+ * @returns Notes, newest first
+ */
+export async function getAuditNotes(auditId: number): Promise<any[]> {
+  try {
+    const result = await sql`
+      SELECT * FROM notes_all
+      WHERE audit_id = ${auditId}
+      ORDER BY created_at DESC
+    `;
+    return result.rows;
+  } catch (error: any) {
+    if (!isMissingRelation(error)) {
+      throw error;
+    }
+    console.warn(`[getAuditNotes] notes_all missing, reading notes`);
+    const result = await sql`
+      SELECT * FROM notes
+      WHERE audit_id = ${auditId}
+      ORDER BY created_at DESC
+    `;
+    return result.rows;
+  }
+}
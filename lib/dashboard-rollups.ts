@@ -0,0 +1,132 @@
+import { sql } from "@vercel/postgres";
+
+export interface DashboardCategoryStats {
+  category: string;
+  count: number;
+  averageScore: number | null;
+  risk: { low: number; medium: number; high: number };
+}
+
+export interface DashboardStats {
+  total: number;
+  pending: number;
+  submitted: number;
+  completed: number;
+  byTier: Record<string, number>;
+  categories: DashboardCategoryStats[];
+  // High-water mark of the rollups; null when counted live
+  upToDateAt: string | null;
+}
+
+// Rollups whose high-water mark trails NOW() by more than this are not served; the
+// default allows for db/rollup-dashboard.py's --lag and --interval (60s each) with room to spare
+const MAX_ROLLUP_LAG_SECONDS = Number(process.env.DASHBOARD_ROLLUP_MAX_LAG_SECONDS) || 300;
+
+function buildStats(audits: any[], scores: any[], upToDateAt: string | null): DashboardStats {
+  const stats: DashboardStats = {
+    total: 0,
+    pending: 0,
+    submitted: 0,
+    completed: 0,
+    byTier: {},
+    categories: [],
+    upToDateAt,
+  };
+  for (const row of audits) {
+    const count = Number(row.count);
+    stats.total += count;
+    if (row.status === "pending" || row.status === "submitted" || row.status === "completed") {
+      stats[row.status as "pending" | "submitted" | "completed"] += count;
+    }
+    stats.byTier[row.tier] = (stats.byTier[row.tier] || 0) + count;
+  }
+  stats.categories = scores.map((row) => {
+    const count = Number(row.count);
+    return {
+      category: row.category,
+      count,
+      averageScore: count > 0 ? Number((Number(row.score_sum) / count).toFixed(2)) : null,
+      risk: { low: Number(row.low), medium: Number(row.medium), high: Number(row.high) },
+    };
+  });
+  return stats;
+}
+
+/**
+ * Dashboard summary from the rollup tables maintained by db/rollup-dashboard.py:
+ * audit counts by status and tier, and per scores_category the average score and
+ * risk-level distribution. Reads a few rollup rows however many audits exist.
+ * Rollups trail live data by up to the job's lag plus interval; rollups older than
+ * DASHBOARD_ROLLUP_MAX_LAG_SECONDS (default 300) are treated as stale, e.g. when the job
+ * has stopped, and callers count live instead.
+ *
+ * @param auditorId - The auditor's user id, or null for all audits (admins)
+ * @returns The stats, or null if the rollups are stale, have not been built (or the tables do not exist)
+ */
+export async function getDashboardRollups(auditorId: string | null): Promise<DashboardStats | null> {
+  try {
+    const result = await sql`
+      SELECT
+        to_json(st.high_water_mark::timestamptz) #>> '{}' AS up_to_date_at,
+        st.high_water_mark >= NOW() - make_interval(secs => ${MAX_ROLLUP_LAG_SECONDS}) AS fresh,
+        (SELECT COALESCE(json_agg(r), '[]') FROM (
+          SELECT risk_audit_tier AS tier, status, SUM(audit_count) AS count
+          FROM dashboard_audit_rollups
+          WHERE ${auditorId}::int IS NULL OR auditor_id = ${auditorId}::int
+          GROUP BY risk_audit_tier, status
+          HAVING SUM(audit_count) <> 0
+        ) r) AS audits,
+        (SELECT COALESCE(json_agg(r ORDER BY r.category), '[]') FROM (
+          SELECT scores_category AS category, SUM(score_count) AS count, SUM(score_sum) AS score_sum,
+                 SUM(low_risk_count) AS low, SUM(medium_risk_count) AS medium, SUM(high_risk_count) AS high
+          FROM dashboard_score_rollups
+          WHERE ${auditorId}::int IS NULL OR auditor_id = ${auditorId}::int
+          GROUP BY scores_category
+          HAVING SUM(score_count) <> 0
+        ) r) AS scores
+      FROM dashboard_rollup_state st
+      WHERE st.name = 'audits'
+    `;
+    if (result.rows.length === 0) {
+      return null;
+    }
+    const row = result.rows[0];
+    if (!row.fresh) {
+      console.warn(`[getDashboardRollups] Rollups last updated ${row.up_to_date_at}, counting live`);
+      return null;
+    }
+    return buildStats(row.audits, row.scores, row.up_to_date_at);
+  } catch (error: any) {
+    console.warn(`[getDashboardRollups] Rollup lookup failed, counting live:`, error?.message);
+    return null;
+  }
+}
+
+/**
+ * The same summary counted from audits and scores directly; used until the
+ * rollups exist.
+ *
+ * @param auditorId - The auditor's user id, or null for all audits (admins)
+ */
+export async function getLiveDashboardStats(auditorId: string | null): Promise<DashboardStats> {
+  const result = await sql`
+    SELECT
+      (SELECT COALESCE(json_agg(r), '[]') FROM (
+        SELECT risk_audit_tier AS tier, status, COUNT(*) AS count
+        FROM audits
+        WHERE ${auditorId}::int IS NULL OR auditor_id = ${auditorId}::int
+        GROUP BY risk_audit_tier, status
+      ) r) AS audits,
+      (SELECT COALESCE(json_agg(r ORDER BY r.category), '[]') FROM (
+        SELECT s.scores_category AS category, COUNT(*) AS count, SUM(s.score) AS score_sum,
+               COUNT(*) FILTER (WHERE s.score >= 7.5) AS low,
+               COUNT(*) FILTER (WHERE s.score >= 4.0 AND s.score < 7.5) AS medium,
+               COUNT(*) FILTER (WHERE s.score < 4.0) AS high
+        FROM scores s
+        JOIN audits a ON a.id = s.audit_id
+        WHERE ${auditorId}::int IS NULL OR a.auditor_id = ${auditorId}::int
+        GROUP BY s.scores_category
+      ) r) AS scores
+  `;
+  return buildStats(result.rows[0].audits, result.rows[0].scores, null);
+}
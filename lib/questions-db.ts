@@ -34,11 +34,32 @@ export interface QuestionFromDB {
  * @returns Array of questions formatted for the scoring system
  */
 export async function getQuestionsForTier(tier: string): Promise<QuestionFromDB[]> {
+  const questions = await loadQuestionsForTier(tier);
+  return questions.map((question) => ({
+    ...question,
+    section: normalizeSectionName(question.section),
+  }));
+}
+
+/**
+ * Fetch questions for a tier with section names as stored, as served to
+ * respondents by the public questionnaire endpoint. Reads the precomputed
+ * tier bundle when one exists, otherwise the live tables.
+ *
+ * @param tier - The audit tier (tier_0, tier_1, tier_2, tier_3, tier_4)
+ * @returns Array of questions in the public payload shape
+ */
+export async function loadQuestionsForTier(tier: string): Promise<QuestionFromDB[]> {
   const validTiers = ["tier_0", "tier_1", "tier_2", "tier_3", "tier_4"];
   if (!validTiers.includes(tier)) {
     throw new Error(`Invalid tier: ${tier}`);
   }
 
+  const bundled = await getTierBundle(tier);
+  if (bundled) {
+    return bundled;
+  }
+
   console.log(`[getQuestionsForTier] Fetching questions for ${tier}...`);
 
   const result = await sql`
@@ -87,7 +108,7 @@ export async function getQuestionsForTier(tier: string): Promise<QuestionFromDB[
   const questions: QuestionFromDB[] = result.rows.map((row) => ({
     id: row.question_number,
     category: row.category,
-    section: normalizeSectionName(row.sub_category),
+    section: row.sub_category,
     text: row.question_text,
     critical: row.is_critical,
     tiers: [tier],
@@ -100,3 +121,56 @@ export async function getQuestionsForTier(tier: string): Promise<QuestionFromDB[
 
   return questions;
 }
+
+/**
+ * Read the precomputed question list for a tier from question_tier_bundles.
+ * Bundles are rebuilt by db/seed-neon.py and cleared on admin edits, so a
+ * missing row (or a missing table) means the live query must be used.
+ *
+ * @param tier - The audit tier (already validated)
+ * @returns The bundled questions, or null if no bundle is available
+ */
+async function getTierBundle(tier: string): Promise<QuestionFromDB[] | null> {
+  try {
+    const result = await sql`
+      SELECT questions, version_hash
+      FROM question_tier_bundles
+      WHERE tier = ${tier}
+    `;
+    if (result.rows.length === 0) {
+      return null;
+    }
+
+    const { questions, version_hash } = result.rows[0];
+    console.log(`[getQuestionsForTier] Using bundle ${String(version_hash).slice(0, 12)} for ${tier}`);
+    // jsonb reorders object keys; rebuild each question in the live query's key order
+    return (questions as QuestionFromDB[]).map((question) => ({
+      id: question.id,
+      category: question.category,
+      section: question.section,
+      text: question.text,
+      critical: question.critical,
+      tiers: question.tiers,
+      weight: question.weight,
+      options: question.options,
+      motivation_learning_point: question.motivation_learning_point,
+      comment: question.comment,
+      score_examples: question.score_examples,
+    }));
+  } catch (error: any) {
+    console.warn(`[getQuestionsForTier] Bundle lookup failed, using live query:`, error?.message);
+    return null;
+  }
+}
+
+/**
+ * Drop all precomputed tier bundles after the question catalog is edited,
+ * so readers fall back to the live query until the next seed rebuilds them.
+ */
+export async function invalidateTierBundles(): Promise<void> {
+  try {
+    await sql`DELETE FROM question_tier_bundles`;
+  } catch (error: any) {
+    console.warn(`[invalidateTierBundles] Failed to clear tier bundles:`, error?.message);
+  }
+}
@@ -0,0 +1,34 @@
+import { sql } from "@vercel/postgres";
+import { calculateAuditScores } from "./scoring";
+
+export type AuditScores = ReturnType<typeof calculateAuditScores>;
+
+/**
+ * Read the scores precomputed by db/report-worker.py for an audit.
+ * A payload is only used while it was computed from the current tier bundle
+ * (catalog_version = question_tier_bundles.version_hash); after a catalog
+ * change, or if the table does not exist, callers compute scores live.
+ *
+ * @param auditId - The audit id
+ * @returns Category scores, overall score and recommended actions, or null
+ */
+export async function getPrecomputedScores(auditId: number): Promise<AuditScores | null> {
+  try {
+    const result = await sql`
+      SELECT p.payload->'scores' AS scores
+      FROM audit_report_payloads p
+      JOIN audits a ON a.id = p.audit_id
+      JOIN question_tier_bundles b
+        ON b.tier = a.risk_audit_tier AND b.version_hash = p.catalog_version
+      WHERE p.audit_id = ${auditId}
+    `;
+    if (result.rows.length === 0) {
+      return null;
+    }
+    console.log(`[getPrecomputedScores] Using precomputed scores for audit ${auditId}`);
+    return result.rows[0].scores as AuditScores;
+  } catch (error: any) {
+    console.warn(`[getPrecomputedScores] Payload lookup failed, computing live:`, error?.message);
+    return null;
+  }
+}